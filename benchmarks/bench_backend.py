@@ -0,0 +1,276 @@
+"""
+Backend benchmark suite: database build, list pages, point lookups, search,
+stats queries, similar Pokémon and the JSON fallback, on a synthetic dataset of any size.
+
+The dataset is the bundled dex.json scaled up: entry i is a copy of
+dex.json entry i % 1025 with a new id, a numbered name and jittered stats,
+written as NDJSON to a temp directory. Everything runs offline and never
+touches data/.
+
+Each case reports operations, throughput and latency percentiles, and the
+whole run is written as JSON. `--compare` checks a run against an earlier
+result file and exits non-zero when a case got slower by more than
+`--tolerance`, so it can gate commits.
+
+Usage: uv run benchmarks/bench_backend.py [--size N] [--ops N] [--seed N]
+           [--output results.json] [--compare baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import backend, database  # noqa: E402
+from src.cache import EntryCache  # noqa: E402
+from src.fallback import JsonFallbackStore  # noqa: E402
+from src.pokemon_list import PAGE_SIZE  # noqa: E402
+
+STAT_JITTER = 10
+SEARCH_TERM_LENGTH = 3
+
+# Filter bar queries for the stats_query case, cycled through.
+STATS_QUERIES = (
+    "speed>100 type:fire sort:total",
+    "bst>=500 sort:speed",
+    "type:water type:flying sort:-hp",
+    "attack>120 defense<80",
+)
+
+# A case regresses when its p50 latency grows, or its throughput drops, by
+# more than the tolerance.
+DEFAULT_TOLERANCE = 0.2
+
+
+def generate_dataset(path: str, size: int, seed: int) -> None:
+    """Writes `size` synthetic records, derived from dex.json, to an NDJSON file."""
+    with open(os.path.join(ROOT, "dex.json"), encoding="utf-8") as f:
+        base = json.load(f)
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            record = dict(base[i % len(base)])
+            copy = i // len(base)
+            record["id"] = i + 1
+            if copy:
+                record["name"] = f"{record['name']}-{copy}"
+                record["stats"] = {
+                    stat: max(1, value + rng.randint(-STAT_JITTER, STAT_JITTER))
+                    for stat, value in record["stats"].items()
+                }
+            f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+            f.write("\n")
+
+
+def summarize(latencies: list[float], seconds: float | None = None) -> dict:
+    """Throughput and latency percentiles (in ms) for one case."""
+    latencies = sorted(latencies)
+    seconds = seconds if seconds is not None else sum(latencies)
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "ops": len(latencies),
+        "seconds": seconds,
+        "ops_per_sec": len(latencies) / max(seconds, 1e-9),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def measure(operation, args_list: list) -> dict:
+    """Calls `operation(*args)` for each entry of `args_list` and summarizes the timings."""
+    latencies = []
+    for args in args_list:
+        started = time.perf_counter()
+        operation(*args)
+        latencies.append(time.perf_counter() - started)
+    return summarize(latencies)
+
+
+def bench_build(source_path: str, size: int) -> dict:
+    started = time.perf_counter()
+    database.create_tables()
+    timings = database.populate_db_from_json(source_path)
+    seconds = time.perf_counter() - started
+    if timings is None:
+        raise RuntimeError("populate_db_from_json failed")
+    return {
+        "ops": size,
+        "seconds": seconds,
+        "ops_per_sec": size / seconds,
+        "steps_ms": {step: value * 1000 for step, value in timings.items()},
+    }
+
+
+def reset_backend_caches() -> None:
+    """Drops the backend's in-memory caches and indexes so each case starts cold."""
+    backend._entry_cache = EntryCache()
+    backend._search_index = None
+    backend._stats_store = None
+    backend._similarity_index = None
+
+
+def run_suite(size: int, ops: int, seed: int, workdir: str) -> dict:
+    rng = random.Random(seed)
+    source_path = os.path.join(workdir, database.NDJSON_PATH)
+
+    started = time.perf_counter()
+    generate_dataset(source_path, size, seed)
+    print(f"generated {size:,} records in {time.perf_counter() - started:.1f}s")
+
+    results = {"build": bench_build(source_path, size)}
+    reset_backend_caches()
+
+    total = backend.count_pokemon()
+    offsets = [rng.randrange(0, max(total - PAGE_SIZE, 1)) for _ in range(ops)]
+    results["list_page"] = measure(backend.get_pokemon_page, [(offset, PAGE_SIZE) for offset in offsets])
+    results["list_all"] = measure(backend.get_all_pokemon, [()] * max(ops // 100, 1))
+
+    # Distinct ids, so every lookup misses the entry cache.
+    ids = rng.sample(range(1, size + 1), min(ops, size))
+    results["lookup_id"] = measure(backend.get_dex_entry, [(str(pokemon_id),) for pokemon_id in ids])
+    reset_backend_caches()
+    names = [row["name"] for row in backend.get_pokemon_page(0, size)]
+    sample = rng.sample(names, min(ops, size))
+    results["lookup_name"] = measure(backend.get_dex_entry, [(name,) for name in sample])
+    reset_backend_caches()
+
+    terms = []
+    for name in rng.choices(names, k=ops):
+        start = rng.randrange(0, max(len(name) - SEARCH_TERM_LENGTH, 0) + 1)
+        terms.append(name[start:start + SEARCH_TERM_LENGTH])
+    results["search_filter"] = measure(
+        lambda term: (backend.count_pokemon(term), backend.get_pokemon_page(0, PAGE_SIZE, term)),
+        [(term,) for term in terms],
+    )
+    results["search_ranked"] = measure(backend.search_pokemon, [(term,) for term in terms])
+
+    started = time.perf_counter()
+    backend.get_stats_store()
+    seconds = time.perf_counter() - started
+    results["stats_load"] = {"ops": size, "seconds": seconds, "ops_per_sec": size / seconds}
+    queries = [(STATS_QUERIES[i % len(STATS_QUERIES)],) for i in range(max(ops // 10, 1))]
+    results["stats_query"] = measure(lambda query: backend.query_stats(query).page(0, PAGE_SIZE), queries)
+
+    started = time.perf_counter()
+    backend.get_similarity_index()
+    seconds = time.perf_counter() - started
+    results["similar_build"] = {"ops": size, "seconds": seconds, "ops_per_sec": size / seconds}
+    results["similar"] = measure(backend.get_similar_pokemon, [(pokemon_id,) for pokemon_id in ids[:max(ops // 10, 1)]])
+
+    store = JsonFallbackStore(source_path)
+    started = time.perf_counter()
+    store.get_all_pokemon()
+    seconds = time.perf_counter() - started
+    results["fallback_load"] = {"ops": size, "seconds": seconds, "ops_per_sec": size / seconds}
+    results["fallback_lookup"] = measure(store.get_dex_entry, [(str(pokemon_id),) for pokemon_id in ids])
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def print_results(results: dict) -> None:
+    for case, result in results.items():
+        line = f"  {case:<16} {result['ops']:8,} ops {result['ops_per_sec']:12,.0f} ops/s"
+        if "p50_ms" in result:
+            line += f"  p50 {result['p50_ms']:8.3f} ms  p95 {result['p95_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms"
+        else:
+            line += f"  {result['seconds']:8.2f} s"
+        print(line)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Returns one line per case that regressed against `baseline`."""
+    regressions = []
+    for case, result in results.items():
+        before = baseline.get(case)
+        if before is None:
+            continue
+        if result["ops_per_sec"] < before["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{case}: {result['ops_per_sec']:,.0f} ops/s, was {before['ops_per_sec']:,.0f}"
+            )
+        elif "p50_ms" in result and "p50_ms" in before and result["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{case}: p50 {result['p50_ms']:.3f} ms, was {before['p50_ms']:.3f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backend benchmarks on a synthetic dataset.")
+    parser.add_argument("--size", type=int, default=10_000, help="records to generate (default 10000)")
+    parser.add_argument("--ops", type=int, default=2_000, help="operations per case (default 2000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="fail if slower than this earlier result file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = tempfile.mkdtemp(prefix="dex-bench-")
+    cwd = os.getcwd()
+    try:
+        os.makedirs(os.path.join(workdir, "data"))
+        os.chdir(workdir)
+        results = run_suite(args.size, args.ops, args.seed, workdir)
+    finally:
+        database.close_pool()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\nsize {args.size:,}, {args.ops:,} ops per case")
+    print_results(results)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.time(),
+            "size": args.size,
+            "ops": args.ops,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["size"] != args.size:
+            print(f"warning: baseline was run with size {baseline['meta']['size']:,}")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Microbenchmark: dex entry lookups per second with a fresh connection per
+query (the old backend behaviour) versus the pooled connection layer.
+
+Builds a throwaway database from the bundled dex.json in a temp directory,
+so it runs offline and never touches data/pokedex.db.
+
+Usage: uv run benchmarks/bench_connections.py [lookups]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import backend, database  # noqa: E402
+
+
+def lookup_unpooled(name_or_id) -> None:
+    """Mirrors the pre-pool backend: connect, query, close."""
+    conn = database.get_db_connection()
+    conn.execute(backend.ENTRY_VIEW_BY_ID_QUERY, (name_or_id,)).fetchone()
+    conn.close()
+
+
+def lookup_pooled(name_or_id) -> None:
+    with database.pooled_connection() as conn:
+        conn.execute(backend.ENTRY_VIEW_BY_ID_QUERY, (name_or_id,)).fetchone()
+
+
+def run(label: str, lookup, ids: list[int]) -> float:
+    start = time.perf_counter()
+    for pokemon_id in ids:
+        lookup(pokemon_id)
+    elapsed = time.perf_counter() - start
+    rate = len(ids) / elapsed
+    print(f"{label:<12} {len(ids)} lookups in {elapsed:.3f}s -> {rate:,.0f} lookups/s")
+    return rate
+
+
+def main() -> None:
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workdir = tempfile.mkdtemp(prefix="dex-bench-")
+    cwd = os.getcwd()
+    try:
+        os.makedirs(os.path.join(workdir, "data"))
+        shutil.copy(os.path.join(ROOT, "dex.json"), os.path.join(workdir, database.JSON_PATH))
+        os.chdir(workdir)
+        database.create_tables()
+        database.populate_db_from_json()
+
+        ids = [random.randint(1, 1025) for _ in range(lookups)]
+        before = run("unpooled", lookup_unpooled, ids)
+        after = run("pooled", lookup_pooled, ids)
+        print(f"speedup: {after / before:.1f}x")
+    finally:
+        database.close_pool()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
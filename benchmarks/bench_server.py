@@ -0,0 +1,176 @@
+"""
+Load test for the JSON API server (src/server.py): requests per second and
+latency percentiles against localhost.
+
+By default a server is started in a child process (`main.py --serve`) over
+a throwaway database built from the bundled dex.json, so it runs offline
+and never touches data/. `--url` targets a server that is already running
+instead.
+
+Each of `--connections` keep-alive connections sends requests back to back
+for `--seconds`, cycling through a mix of the list, entry, art and search
+endpoints. Every response is read in full and checked for a 200 or 304.
+
+Usage: uv run benchmarks/bench_server.py [--connections N] [--seconds S]
+           [--url http://127.0.0.1:8765] [--gzip] [--etag]
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import database  # noqa: E402
+
+SEARCH_TERMS = ("char", "pika", "mew", "saur", "drag", "eon", "bulbsaur", "gar")
+
+STARTUP_TIMEOUT = 15.0
+
+
+def request_paths(count: int, seed: int = 0) -> list[str]:
+    """A fixed mix of requests: mostly entries, some art, search and the full list."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        kind = i % 10
+        if kind < 6:
+            paths.append(f"/pokemon/{rng.randint(1, 1025)}")
+        elif kind < 8:
+            paths.append(f"/search?q={rng.choice(SEARCH_TERMS)}")
+        elif kind == 8:
+            paths.append(f"/pokemon/{rng.randint(1, 1025)}/art")
+        else:
+            paths.append("/pokemon")
+    return paths
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple[int, dict]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return int(status_line.split(" ")[1]), headers
+
+
+async def client(host: str, port: int, paths: list[str], deadline: float, options, latencies: list, statuses: Counter):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        i = 0
+        while time.monotonic() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            headers = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if options.gzip:
+                headers += "Accept-Encoding: gzip\r\n"
+            if options.etag and path in etags:
+                headers += f"If-None-Match: {etags[path]}\r\n"
+            started = time.perf_counter()
+            writer.write((headers + "\r\n").encode("latin-1"))
+            status, response_headers = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+            if "etag" in response_headers:
+                etags[path] = response_headers["etag"]
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, options) -> None:
+    latencies, statuses = [], Counter()
+    deadline = time.monotonic() + options.seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, request_paths(1000, seed), deadline, options, latencies, statuses)
+        for seed in range(options.connections)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"{len(latencies):,} requests over {options.connections} connections in {elapsed:.1f}s")
+    print(f"  {len(latencies) / elapsed:,.0f} requests/s")
+    print(
+        f"  latency: mean {statistics.mean(latencies) * 1000:.2f} ms, p50 {percentile(0.5):.2f} ms, "
+        f"p95 {percentile(0.95):.2f} ms, p99 {percentile(0.99):.2f} ms, max {latencies[-1] * 1000:.2f} ms"
+    )
+    print(f"  statuses: {dict(sorted(statuses.items()))}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_server(port: int, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The server exited during startup.")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("The server did not start in time.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the dex JSON API server.")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    parser.add_argument("--etag", action="store_true", help="revalidate with If-None-Match")
+    options = parser.parse_args()
+
+    if options.url:
+        url = urlsplit(options.url)
+        asyncio.run(load_test(url.hostname, url.port or 80, options))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="dex-bench-")
+    cwd = os.getcwd()
+    process = None
+    try:
+        os.makedirs(os.path.join(workdir, "data"))
+        shutil.copy(os.path.join(ROOT, "dex.json"), os.path.join(workdir, database.JSON_PATH))
+        os.chdir(workdir)
+        database.create_tables()
+        database.populate_db_from_json()
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "main.py"), "--serve", "--port", str(port)],
+            cwd=workdir, stdout=subprocess.DEVNULL,
+        )
+        wait_for_server(port, process)
+        print()
+        asyncio.run(load_test("127.0.0.1", port, options))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Cold-start benchmark: import cost of the app modules and time until the dex
+list first shows rows.
+
+Import times come from `python -X importtime` in a fresh interpreter. Paint
+times come from a headless child process that runs the app with
+`App.run_test` against a throwaway database built from the bundled dex.json,
+timed from the moment the parent spawns it (so interpreter start-up and
+imports are included). "first rows" is the snapshot page; "full list" is the
+backend source that replaces it.
+
+Usage: uv run benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import database  # noqa: E402
+from src.snapshot import LIST_SNAPSHOT_ROWS  # noqa: E402
+
+TOP_IMPORTS = 12
+
+# Runs in the child. Wraps PokemonList.set_source to timestamp the first
+# non-empty source and the full list, then prints them as one JSON line.
+CHILD = """
+import asyncio, json, sys, time
+sys.path.insert(0, {root!r})
+from src.dex_tui import DexTUI
+from src.pokemon_list import PokemonList
+
+marks = {{}}
+set_source = PokemonList.set_source
+
+def timed_set_source(self, total, *args, **kwargs):
+    set_source(self, total, *args, **kwargs)
+    if total:
+        marks.setdefault("first", time.monotonic())
+    if total > {snapshot_rows}:
+        marks.setdefault("full", time.monotonic())
+
+PokemonList.set_source = timed_set_source
+
+async def main():
+    app = DexTUI()
+    async with app.run_test(size=(120, 40)) as pilot:
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline and "full" not in marks:
+            await pilot.pause(0.01)
+    print(json.dumps(marks))
+
+asyncio.run(main())
+"""
+
+
+def import_times() -> None:
+    """Prints the slowest cumulative imports of the app entry point."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.dex_tui"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    total = max(cumulative for cumulative, _, _ in rows)
+    print(f"import src.dex_tui: {total / 1000:.1f} ms cumulative")
+    for cumulative, own, name in sorted(rows, reverse=True)[:TOP_IMPORTS]:
+        print(f"  {cumulative / 1000:8.1f} ms  (self {own / 1000:6.1f})  {name}")
+    app_modules = [name.strip() for _, _, name in rows if name.strip().startswith("src.")]
+    print(f"  app modules imported at startup: {', '.join(app_modules)}")
+
+
+def paint_times(runs: int, workdir: str) -> None:
+    """Prints median time-to-first-rows and time-to-full-list over `runs`."""
+    script = CHILD.format(root=ROOT, snapshot_rows=LIST_SNAPSHOT_ROWS)
+    first, full = [], []
+    for _ in range(runs):
+        spawned = time.monotonic()
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=workdir, capture_output=True, text=True, check=True,
+        )
+        marks = json.loads(result.stdout.strip().splitlines()[-1])
+        first.append((marks["first"] - spawned) * 1000)
+        full.append((marks["full"] - spawned) * 1000)
+    print(f"first rows: median {statistics.median(first):.0f} ms (min {min(first):.0f}) over {runs} runs")
+    print(f"full list:  median {statistics.median(full):.0f} ms (min {min(full):.0f}) over {runs} runs")
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    workdir = tempfile.mkdtemp(prefix="dex-bench-")
+    cwd = os.getcwd()
+    try:
+        os.makedirs(os.path.join(workdir, "data"))
+        shutil.copy(os.path.join(ROOT, "dex.json"), os.path.join(workdir, database.JSON_PATH))
+        os.chdir(workdir)
+        database.create_tables()
+        database.populate_db_from_json()
+        print()
+        import_times()
+        print()
+        paint_times(runs, workdir)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,16 @@
 A driver script to control the data pipeline for the Pokedex application.
 
 This script provides a step-by-step process to:
-1. Fetch all Pokémon data from the PokeAPI and save it to a local JSON file.
-2. Populate the SQLite database from the local JSON file.
-
-The user is prompted for confirmation before each major step.
+1. Fetch all Pokémon data from the PokeAPI and stream it to a local NDJSON file
+   (gzip compressed with --compress). Moves and evolution chains shared by
+   many Pokémon are fetched once each and written to their own files next to
+   it. ASCII art is rendered in a process pool sized by --art-workers N
+   (default: one worker per CPU).
+2. Populate the SQLite database from the local record file.
+
+The user is prompted for confirmation before each major step. With
+--progress-json, progress is written to stdout as JSON lines (see
+src/progress.py) for the setup screen to render.
 """
 
 import asyncio
@@ -14,11 +20,18 @@ import sqlite3
 from pathlib import Path
 import sys
 
-from src.pull_data import main as fetch_api_data
-from src.database import (
-    create_tables,
-    populate_db_from_json,
-)
+from src.pull_data import NDJSON_PATH
+from src.pipeline import run_pipeline
+from src.progress import Progress, json_sink
+
+
+def get_option(name: str) -> str | None:
+    """Returns the value following `name` on the command line, if any."""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return None
 
 
 def confirm_step(prompt: str) -> bool:
@@ -35,38 +48,36 @@ def confirm_step(prompt: str) -> bool:
         print("Invalid input. Please enter 'y' or 'n'.")
 
 
-def run_database_population():
-    """
-    Creates tables and populates the database using the data from dex.json.
-    """
-    print("--- Starting Database Population ---")
-    create_tables()
-    populate_db_from_json()
-    print("--- Database Population Complete! ---")
-
-
 async def main():
     """Main driver function."""
     print("--- Pokedex Data Pipeline Driver ---")
 
     # Phase 1: Fetch data from API
-    if confirm_step("Phase 1: Do you want to fetch all data from the PokeAPI?"):
-        print("Starting API data fetch. This may take a few moments...")
-        await fetch_api_data()
-        print("API data fetch complete. Data saved to dex.json.")
-    else:
+    fetch = confirm_step("Phase 1: Do you want to fetch all data from the PokeAPI?")
+    if not fetch:
         print("Skipping API data fetch.")
 
-    print("-" * 20)
-
     # Phase 2: Populate database
-    if confirm_step("Phase 2: Do you want to populate the database from dex.json?"):
-        run_database_population()
-    else:
+    populate = confirm_step("Phase 2: Do you want to populate the database from the fetched data?")
+    if not populate:
         print("Skipping database population.")
 
-    print("\nData pipeline finished.")
+    print("-" * 20)
+
+    progress = Progress(json_sink if "--progress-json" in sys.argv else None)
+    output_path = NDJSON_PATH + ".gz" if "--compress" in sys.argv else NDJSON_PATH
+    art_workers = get_option("--art-workers")
+    ok = await run_pipeline(
+        progress,
+        fetch=fetch,
+        populate=populate,
+        output_path=output_path,
+        art_workers=int(art_workers) if art_workers else None,
+    )
+
+    print("\nData pipeline finished." if ok else "\nData pipeline finished with errors.")
+    return ok
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(0 if asyncio.run(main()) else 1)
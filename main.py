@@ -1,18 +1,35 @@
-from src.dex_tui import DexTUI
-import tomllib
+import sys
+
+from src import __version__
+
+def get_option(name: str, default: str) -> str:
+    """Returns the value following `name` on the command line, or `default`."""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
 
 def main() -> None:
-    """Run the application."""
-    
-    # Read version from pyproject.toml
-    with open("pyproject.toml", "rb") as f:
-        data = tomllib.load(f)
-        version = data["project"]["version"]
+    """
+    Run the application. --refresh refetches all data from PokeAPI before
+    opening the dex (the first run seeds from the bundled dex.json instead);
+    --in-process-setup runs that fetch without a subprocess; --serve
+    [--host HOST] [--port PORT] runs the JSON API server (see src/server.py)
+    instead of the TUI.
+    """
+    if "--serve" in sys.argv:
+        from src.server import DEFAULT_HOST, DEFAULT_PORT, serve
+
+        serve(get_option("--host", DEFAULT_HOST), int(get_option("--port", str(DEFAULT_PORT))))
+        return
+
+    from src.dex_tui import DexTUI
 
-    app = DexTUI()
+    app = DexTUI(in_process_setup="--in-process-setup" in sys.argv, refresh="--refresh" in sys.argv)
     app.theme = "gruvbox"
-    app.title = f"DexTUI v{version}"
+    app.title = f"DexTUI v{__version__}"
     app.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,3 @@
+# Keep in sync with pyproject.toml. A constant avoids parsing the TOML file
+# at startup just to show the version.
+__version__ = "1.1.0"
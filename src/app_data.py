@@ -0,0 +1,193 @@
+"""
+Write-behind storage for favorites and view/search counters
+(the pokemon_app_data table).
+
+Changes are recorded in memory and coalesced: counters for the same Pokémon
+add up, and a favorite toggled several times keeps only its last value. One
+background thread writes whatever has accumulated in a single transaction,
+on its own connection, FLUSH_INTERVAL seconds after the first change (or
+as soon as FLUSH_BATCH Pokémon have changes waiting). Readers use the
+pooled WAL connections and never wait on it, so they see changes once
+they are written.
+"""
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from . import database
+
+FLUSH_INTERVAL = 1.0
+FLUSH_BATCH = 256
+
+# How long a flush waits for SQLite's write lock.
+WRITE_TIMEOUT = 5.0
+
+ADD_VIEWS = """
+    INSERT INTO pokemon_app_data (pokemon_id, view_count) VALUES (?, ?)
+    ON CONFLICT (pokemon_id) DO UPDATE SET view_count = view_count + excluded.view_count
+"""
+ADD_SEARCHES = """
+    INSERT INTO pokemon_app_data (pokemon_id, search_count) VALUES (?, ?)
+    ON CONFLICT (pokemon_id) DO UPDATE SET search_count = search_count + excluded.search_count
+"""
+SET_FAVORITES = """
+    INSERT INTO pokemon_app_data (pokemon_id, is_favorite) VALUES (?, ?)
+    ON CONFLICT (pokemon_id) DO UPDATE SET is_favorite = excluded.is_favorite
+"""
+
+
+class AppDataWriter:
+    """Coalesces app data changes and writes them from one background thread."""
+
+    def __init__(self, path: str | None = None, interval: float = FLUSH_INTERVAL, batch: int = FLUSH_BATCH):
+        # None follows database.DB_PATH, read when the writer connects.
+        self.path = path
+        self.interval = interval
+        self.batch = batch
+        self._cond = threading.Condition()
+        self._views = Counter()
+        self._searches = Counter()
+        self._favorites = {}
+        # flush() waits until the writer has attempted its request, and
+        # reports whether it was written.
+        self._requested = 0
+        self._attempted = 0
+        self._written = 0
+        self._thread = None
+        self._closed = False
+        self.flushes = 0
+        self.failed_flushes = 0
+
+    # --- Recording (any thread) ---
+
+    def add_view(self, pokemon_id: int) -> None:
+        self._record(self._views, pokemon_id)
+
+    def add_search(self, pokemon_id: int) -> None:
+        self._record(self._searches, pokemon_id)
+
+    def set_favorite(self, pokemon_id: int, favorite: bool) -> None:
+        with self._cond:
+            self._favorites[pokemon_id] = favorite
+            self._changed()
+
+    def _record(self, counter: Counter, pokemon_id: int) -> None:
+        with self._cond:
+            counter[pokemon_id] += 1
+            self._changed()
+
+    def _changed(self) -> None:
+        if self._closed:
+            # close() is writing; anything recorded now waits for the next start.
+            return
+        if self._thread is None:
+            self._start()
+        self._cond.notify_all()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="dex-app-data", daemon=True)
+        self._thread.start()
+
+    def _pending(self) -> int:
+        return len(self._views.keys() | self._searches.keys() | self._favorites.keys())
+
+    def flush(self, timeout: float | None = WRITE_TIMEOUT) -> bool:
+        """
+        Writes everything recorded so far now, waiting (up to `timeout`)
+        until it is. Returns whether it was written; after a failed write
+        the changes stay pending for the next flush.
+        """
+        with self._cond:
+            if not self._pending():
+                return True
+            if self._closed:
+                return False
+            if self._thread is None:
+                self._start()
+            thread = self._thread
+            self._requested += 1
+            ticket = self._requested
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._attempted >= ticket or not thread.is_alive(), timeout)
+            return self._written >= ticket
+
+    def close(self) -> None:
+        """
+        Writes what is pending and stops the writer thread. Changes recorded
+        afterwards start it again.
+        """
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        thread.join(WRITE_TIMEOUT)
+
+    # --- Writer thread ---
+
+    def _wait_for_work(self) -> None:
+        """Returns once a flush is due. Called with the lock held."""
+        deadline = None
+        while not (self._closed or self._requested > self._attempted):
+            pending = self._pending()
+            if pending >= self.batch:
+                return
+            if not pending:
+                self._cond.wait()
+                continue
+            if deadline is None:
+                deadline = time.monotonic() + self.interval
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._cond.wait(remaining)
+
+    def _run(self) -> None:
+        conn = None
+        while True:
+            with self._cond:
+                self._wait_for_work()
+                views, searches, favorites = self._views, self._searches, self._favorites
+                self._views, self._searches, self._favorites = Counter(), Counter(), {}
+                ticket = self._requested
+                closed = self._closed
+            written = True
+            if views or searches or favorites:
+                try:
+                    if conn is None:
+                        conn = sqlite3.connect(self.path or database.DB_PATH, timeout=WRITE_TIMEOUT)
+                    self._write(conn, views, searches, favorites)
+                    self.flushes += 1
+                except sqlite3.Error:
+                    self.failed_flushes += 1
+                    self._restore(views, searches, favorites)
+                    written = False
+            with self._cond:
+                self._attempted = max(self._attempted, ticket)
+                if written:
+                    self._written = max(self._written, ticket)
+                self._cond.notify_all()
+            if closed:
+                break
+        if conn is not None:
+            conn.close()
+        with self._cond:
+            self._thread = None
+            self._closed = False
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, views: Counter, searches: Counter, favorites: dict) -> None:
+        with conn:
+            conn.executemany(ADD_VIEWS, list(views.items()))
+            conn.executemany(ADD_SEARCHES, list(searches.items()))
+            conn.executemany(SET_FAVORITES, [(pokemon_id, int(value)) for pokemon_id, value in favorites.items()])
+
+    def _restore(self, views: Counter, searches: Counter, favorites: dict) -> None:
+        """Puts changes from a failed flush back for the next one; newer favorites win."""
+        with self._cond:
+            self._views.update(views)
+            self._searches.update(searches)
+            for pokemon_id, value in favorites.items():
+                self._favorites.setdefault(pokemon_id, value)
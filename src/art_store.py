@@ -0,0 +1,65 @@
+"""
+Content-addressed storage for sprites and rendered ASCII art.
+
+Sprite images are stored once per distinct content under `data/sprites`,
+named by the SHA-256 of their bytes. Rendered art lives in the `art` table
+keyed by `(sprite_hash, columns)`, so identical sprites share one rendering
+and other widths can be rendered later from the stored sprite without
+fetching it again.
+"""
+import hashlib
+import io
+import os
+
+SPRITE_DIR = os.path.join("data", "sprites")
+
+# Width the pipeline renders at, and the width the dex screen asks for.
+ART_COLUMNS = 30
+
+# Art that arrived without its sprite (e.g. older record files) is keyed by
+# a hash of the art text instead, under this prefix.
+TEXT_KEY_PREFIX = "text:"
+
+
+def sprite_hash(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def text_art_key(ascii_art: str) -> str:
+    return TEXT_KEY_PREFIX + hashlib.sha256(ascii_art.encode("utf-8")).hexdigest()
+
+
+def _sprite_path(key: str, directory: str) -> str:
+    return os.path.join(directory, key[:2], key)
+
+
+def save_sprite(image_bytes: bytes, directory: str = SPRITE_DIR) -> str:
+    """Stores a sprite by content and returns its hash. Duplicates are free."""
+    key = sprite_hash(image_bytes)
+    path = _sprite_path(key, directory)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(image_bytes)
+        os.replace(path + ".tmp", path)
+    return key
+
+
+def load_sprite(key: str, directory: str = SPRITE_DIR) -> bytes | None:
+    if key.startswith(TEXT_KEY_PREFIX):
+        return None
+    try:
+        with open(_sprite_path(key, directory), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def render_ascii_art(image_bytes: bytes, columns: int = ART_COLUMNS) -> str:
+    """Decodes a sprite and renders it as ASCII art. CPU-bound."""
+    # Imported here so the app only pays for Pillow when it re-renders.
+    import ascii_magic
+    from ascii_magic.constants import Front, Back
+
+    ascii_art_obj = ascii_magic.AsciiArt.from_image(io.BytesIO(image_bytes))
+    return ascii_art_obj.to_ascii(columns=columns, front=Front.WHITE, back=Back.BLACK)
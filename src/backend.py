@@ -1,35 +1,414 @@
 import sqlite3
 import json
 import random
-from .database import get_db_connection, JSON_PATH
+import threading
+from .app_data import AppDataWriter
+from .art_store import ART_COLUMNS, load_sprite, render_ascii_art
+from .cache import EntryCache, Prefetcher
+from .database import BUILD_ID_QUERY, pooled_connection, close_pool, name_key, data_generation, on_data_reload
+from .fallback import JsonFallbackStore
+from .search import SearchIndex
+from .seed import seed_database
+from .similarity import SIMILAR_COUNT, SimilarityIndex
+from .stats_store import StatsQuery, StatsStore, Selection, STAT_COLUMNS, parse_stats_query
 
 DB_ERROR_MESSAGE = (
     "Database error. Please run 'uv run src/manage_db.py rebuild' "
     "to create or rebuild the database."
 )
 
+ALL_POKEMON_QUERY = "SELECT id, name FROM pokemon ORDER BY id"
+
+# Pages for the list view. Filtered lists are resolved through the search
+# index (see SearchIndex.search) rather than a scan of the names.
+PAGE_QUERY = "SELECT id, name FROM pokemon ORDER BY id LIMIT ? OFFSET ?"
+COUNT_QUERY = "SELECT count(*) FROM pokemon"
+# Narrows the ordered pages below to the ids the search index matched,
+# passed as a JSON array.
+ID_SET_CLAUSE = "WHERE p.id IN (SELECT value FROM json_each(?))"
+
+# List orders other than by id, served by the pokemon_app_data indexes.
+ORDERS = {
+    "views": "a.view_count DESC, a.pokemon_id",
+    "favorites": "a.is_favorite DESC, a.pokemon_id",
+}
+ORDERED_PAGE_QUERY = """
+    SELECT p.id, p.name FROM pokemon_app_data a JOIN pokemon p ON p.id = a.pokemon_id
+    {where} ORDER BY {order} LIMIT ? OFFSET ?
+"""
+FAVORITES_QUERY = "SELECT pokemon_id FROM pokemon_app_data WHERE is_favorite = 1"
+
+# Entries are read from the materialized entry_view table: one primary-key
+# read plus one JSON decode. Ids and names use separate queries because an
+# OR across both would force a scan.
+ENTRY_VIEW_BY_ID_QUERY = "SELECT payload FROM entry_view WHERE pokemon_id = ?;"
+ENTRY_VIEW_BY_NAME_QUERY = """
+    SELECT e.payload
+    FROM pokemon p
+    JOIN entry_view e ON e.pokemon_id = p.id
+    WHERE p.name_key = ?;
+"""
+
+ART_QUERY = """
+    SELECT p.art_key, a.art
+    FROM pokemon p
+    LEFT JOIN art a ON a.art_key = p.art_key AND a.columns = ?
+    WHERE p.id = ?;
+"""
+
+NEAREST_ART_QUERY = "SELECT art FROM art WHERE art_key = ? ORDER BY abs(columns - ?) LIMIT 1"
+
+INSERT_ART_QUERY = "INSERT OR IGNORE INTO art (art_key, columns, art) VALUES (?, ?, ?)"
+
+# Served by the pokemon_moves primary key, which leads with pokemon_id.
+LEARNSET_QUERY = """
+    SELECT m.name, t.name AS type, m.power, m.pp, m.accuracy, m.effect, pm.learn_method, pm.level_learned
+    FROM pokemon_moves pm
+    JOIN moves m ON m.id = pm.move_id
+    LEFT JOIN types t ON t.id = m.type_id
+    WHERE pm.pokemon_id = ?
+    ORDER BY pm.learn_method, pm.level_learned, m.name;
+"""
+
+# Served by idx_pokemon_moves_move.
+MOVE_LEARNERS_QUERY = """
+    SELECT DISTINCT p.id, p.name
+    FROM moves m
+    JOIN pokemon_moves pm ON pm.move_id = m.id
+    JOIN pokemon p ON p.id = pm.pokemon_id
+    WHERE m.name = ?
+    ORDER BY p.id;
+"""
+
+# The chain is found through idx_evolutions_from / idx_evolutions_to, then
+# read through idx_evolutions_chain.
+EVOLUTION_CHAIN_QUERY = """
+    SELECT e.from_pokemon_id, f.name AS from_name, e.to_pokemon_id, t.name AS to_name, e.trigger, e.details
+    FROM evolutions e
+    LEFT JOIN pokemon f ON f.id = e.from_pokemon_id
+    LEFT JOIN pokemon t ON t.id = e.to_pokemon_id
+    WHERE e.chain_id = (
+        SELECT chain_id FROM (
+            SELECT chain_id FROM evolutions WHERE from_pokemon_id = ?
+            UNION ALL
+            SELECT chain_id FROM evolutions WHERE to_pokemon_id = ?
+        ) LIMIT 1
+    )
+    ORDER BY e.id;
+"""
+
+# Used whenever SQLite raises; parses the record file at most once per change.
+_fallback = JsonFallbackStore()
+
+_search_index = None
+_search_index_generation = None
+_search_index_lock = threading.Lock()
+
+# Both are rebuilt, like the search index, when populate_db_from_json
+# reloads the data (see database.data_generation).
+_stats_store = None
+_stats_store_generation = None
+_stats_store_lock = threading.Lock()
+
+_similarity_index = None
+_similarity_generation = None
+_similarity_lock = threading.Lock()
+
+# Similar Pokémon per id, stored as {"similar": [...]} so the cache can size it.
+_similar_cache = EntryCache()
+
+# Favorites and counters are written behind; the favorite ids are kept in
+# memory once loaded so the UI can show them without a query.
+_app_data = AppDataWriter()
+_favorites = None
+_favorites_lock = threading.Lock()
+
+# Successfully loaded entries, keyed by Pokémon id.
+_entry_cache = EntryCache()
+
+# Rendered art, keyed by "<id>:<columns>". Stored as {"ascii_art": ...} so
+# the cache can size it.
+_art_cache = EntryCache()
+
+def prepare_database() -> bool:
+    """
+    Brings a database built by an older version up to date, or seeds a new
+    one from the bundled snapshot (see src/seed.py). Returns whether it was
+    seeded. Errors are left to the lookups, which fall back to the JSON data.
+    """
+    try:
+        return seed_database()
+    except sqlite3.Error:
+        return False
+
+def get_build_id() -> str | None:
+    """
+    Returns the id of the current database build, which changes whenever
+    the data is loaded or updated. None without a database (or one built
+    before build ids were recorded).
+    """
+    try:
+        with pooled_connection() as conn:
+            row = conn.execute(BUILD_ID_QUERY).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
 def get_all_pokemon() -> list[dict]:
     """Fetches a list of all Pokémon from the database."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name FROM pokemon ORDER BY id LIMIT 1025")
-        pokemon_list = [{"id": row["id"], "name": row["name"]} for row in cursor.fetchall()]
-        conn.close()
-        return pokemon_list
+        with pooled_connection() as conn:
+            rows = conn.execute(ALL_POKEMON_QUERY).fetchall()
+        return [{"id": row["id"], "name": row["name"]} for row in rows]
     except sqlite3.Error:
         # Fallback to JSON
         try:
-            with open(JSON_PATH, "r") as f:
-                all_data = json.load(f)
-            return [{"id": p["id"], "name": p["name"]} for p in all_data]
+            return _fallback.get_all_pokemon()
         except (IOError, json.JSONDecodeError):
             return []
 
-def get_dex_entry(name_or_id: str) -> dict:
+def _fallback_rows() -> list[dict]:
+    try:
+        return _fallback.get_all_pokemon()
+    except (IOError, json.JSONDecodeError):
+        return []
+
+def _filter_matches(filter: str) -> list[dict]:
+    """The rows matching `filter`, in id order, from the search index."""
+    index = get_search_index()
+    with _search_index_lock:
+        return index.search(filter)
+
+def count_pokemon(filter: str = "") -> int:
+    """Returns how many Pokémon match `filter`, see get_pokemon_page."""
+    if name_key(filter):
+        return len(_filter_matches(filter))
+    try:
+        with pooled_connection() as conn:
+            return conn.execute(COUNT_QUERY).fetchone()[0]
+    except sqlite3.Error:
+        return len(_fallback_rows())
+
+def get_pokemon_page(offset: int, limit: int, filter: str = "", order: str = "id") -> list[dict]:
+    """
+    Returns up to `limit` Pokémon starting at `offset`, in id order, or
+    with `order` "views" (most viewed first) or "favorites" (favorites
+    first). With a `filter`, only Pokémon whose name contains it or whose
+    id equals it.
+
+    The orders read what the app data writer has stored, so they can lag
+    the latest views and favorites by up to app_data.FLUSH_INTERVAL.
+    """
+    matches = _filter_matches(filter) if name_key(filter) else None
+    try:
+        if order in ORDERS:
+            if matches is None:
+                query, params = ORDERED_PAGE_QUERY.format(where="", order=ORDERS[order]), (limit, offset)
+            else:
+                query = ORDERED_PAGE_QUERY.format(where=ID_SET_CLAUSE, order=ORDERS[order])
+                params = (json.dumps([row["id"] for row in matches]), limit, offset)
+            with pooled_connection() as conn:
+                rows = conn.execute(query, params).fetchall()
+            return [{"id": row["id"], "name": row["name"]} for row in rows]
+        if matches is not None:
+            return [dict(row) for row in matches[offset:offset + limit]]
+        with pooled_connection() as conn:
+            rows = conn.execute(PAGE_QUERY, (limit, offset)).fetchall()
+        return [{"id": row["id"], "name": row["name"]} for row in rows]
+    except sqlite3.Error:
+        rows = _fallback_rows() if matches is None else matches
+        return [dict(row) for row in rows[offset:offset + limit]]
+
+def get_favorites() -> set[int]:
+    """Returns the ids of the favorite Pokémon, loading them once."""
+    global _favorites
+    with _favorites_lock:
+        if _favorites is None:
+            try:
+                with pooled_connection() as conn:
+                    _favorites = {row[0] for row in conn.execute(FAVORITES_QUERY)}
+            except sqlite3.Error:
+                return set()
+        return set(_favorites)
+
+def is_favorite(pokemon_id: int) -> bool:
+    return int(pokemon_id) in get_favorites()
+
+def toggle_favorite(pokemon_id: int) -> bool:
+    """Flips whether a Pokémon is a favorite and returns the new state. Saved in the background."""
+    get_favorites()
+    with _favorites_lock:
+        favorites = _favorites if _favorites is not None else set()
+        favorite = int(pokemon_id) not in favorites
+        if favorite:
+            favorites.add(int(pokemon_id))
+        else:
+            favorites.discard(int(pokemon_id))
+    _app_data.set_favorite(int(pokemon_id), favorite)
+    return favorite
+
+def record_view(pokemon_id: int, searched: bool = False) -> None:
+    """Counts a view of an entry (and a search, if it was opened from one). Saved in the background."""
+    _app_data.add_view(int(pokemon_id))
+    if searched:
+        _app_data.add_search(int(pokemon_id))
+
+def get_learnset(pokemon_id: int) -> list[dict]:
+    """
+    Returns the moves a Pokémon learns, ordered by learn method, then level.
+    Empty if the moves were never fetched or the database is unavailable.
+    """
+    try:
+        with pooled_connection() as conn:
+            rows = conn.execute(LEARNSET_QUERY, (pokemon_id,)).fetchall()
+    except sqlite3.Error:
+        return []
+    return [
+        {
+            "name": row["name"], "type": row["type"], "power": row["power"], "pp": row["pp"],
+            "accuracy": row["accuracy"], "effect": row["effect"],
+            "method": row["learn_method"], "level": row["level_learned"],
+        }
+        for row in rows
+    ]
+
+def get_move_learners(move_name: str) -> list[dict]:
+    """Returns the Pokémon (`id`, `name`) that learn a move, in id order."""
+    try:
+        with pooled_connection() as conn:
+            rows = conn.execute(MOVE_LEARNERS_QUERY, (name_key(move_name),)).fetchall()
+    except sqlite3.Error:
+        return []
+    return [{"id": row["id"], "name": row["name"]} for row in rows]
+
+def get_evolution_chain(pokemon_id: int) -> list[dict]:
+    """
+    Returns every evolution in the chain the Pokémon belongs to, as links
+    with `from_id`, `from`, `to_id`, `to`, `trigger` and `details`. Empty for
+    Pokémon that neither evolve nor evolve from anything.
+    """
+    try:
+        with pooled_connection() as conn:
+            rows = conn.execute(EVOLUTION_CHAIN_QUERY, (pokemon_id, pokemon_id)).fetchall()
+    except sqlite3.Error:
+        return []
+    return [
+        {
+            "from_id": row["from_pokemon_id"], "from": row["from_name"],
+            "to_id": row["to_pokemon_id"], "to": row["to_name"],
+            "trigger": row["trigger"], "details": json.loads(row["details"] or "{}"),
+        }
+        for row in rows
+    ]
+
+def get_search_index() -> SearchIndex:
+    """Returns the shared search index over the Pokémon list, building it once per data load."""
+    global _search_index, _search_index_generation
+    with _search_index_lock:
+        generation = data_generation()
+        if _search_index is None or not len(_search_index) or _search_index_generation != generation:
+            _search_index_generation = generation
+            _search_index = SearchIndex(get_all_pokemon())
+        return _search_index
+
+STATS_COLUMNS_QUERY = f"""
+    SELECT p.id, p.name, {", ".join(f"s.{column}" for column in STAT_COLUMNS)}
+    FROM pokemon p LEFT JOIN stats s ON s.pokemon_id = p.id
+    ORDER BY p.id
+"""
+
+def get_stats_store() -> StatsStore:
+    """Returns the shared columnar stats store, loading it once."""
+    global _stats_store, _stats_store_generation
+    with _stats_store_lock:
+        generation = data_generation()
+        if _stats_store is None or not len(_stats_store) or _stats_store_generation != generation:
+            _stats_store_generation = generation
+            try:
+                with pooled_connection() as conn:
+                    _stats_store = StatsStore(
+                        conn.execute(STATS_COLUMNS_QUERY),
+                        conn.execute("SELECT pokemon_id, type_id FROM pokemon_types"),
+                        dict(conn.execute("SELECT id, name FROM types").fetchall()),
+                    )
+            except sqlite3.Error:
+                try:
+                    _stats_store = StatsStore.from_entries(_fallback.get_entries())
+                except (IOError, json.JSONDecodeError):
+                    _stats_store = StatsStore([], [], {})
+        return _stats_store
+
+def query_stats(query: StatsQuery | str, filter: str = "", limit: int | None = None) -> Selection:
+    """
+    Returns the Pokémon matching a stats query (a StatsQuery or filter bar
+    text, see parse_stats_query), narrowed to names containing `filter` or
+    the id equal to it, in the query's sort order. Raises ValueError on
+    text that does not parse.
+    """
+    if isinstance(query, str):
+        query = parse_stats_query(query) or StatsQuery()
+    return get_stats_store().select(query, name_key(filter), limit)
+
+def get_similarity_index() -> SimilarityIndex:
+    """Returns the shared similar-Pokémon index, building it once per data load."""
+    global _similarity_index, _similarity_generation, _similar_cache
+    with _similarity_lock:
+        generation = data_generation()
+        if _similarity_index is None or _similarity_generation != generation:
+            store = get_stats_store()
+            try:
+                with pooled_connection() as conn:
+                    links = conn.execute("SELECT pokemon_id, ability_id FROM pokemon_abilities").fetchall()
+            except sqlite3.Error:
+                try:
+                    links = [
+                        (entry["id"], ability)
+                        for entry in _fallback.get_entries()
+                        for ability in entry.get("abilities", [])
+                    ]
+                except (IOError, json.JSONDecodeError):
+                    links = []
+            _similarity_index = SimilarityIndex(store, links)
+            _similarity_generation = generation
+            _similar_cache = EntryCache()
+        return _similarity_index
+
+def get_similar_pokemon(pokemon_id: int, k: int = SIMILAR_COUNT) -> list[dict]:
+    """
+    Returns the `k` Pokémon most similar to `pokemon_id` by base stats, types
+    and abilities, nearest first, as dicts with `id`, `name` and `distance`.
+    """
+    index = get_similarity_index()
+    cached = _similar_cache.get(f"{pokemon_id}:{k}")
+    if cached is not None:
+        return cached["similar"]
+    similar = index.similar(int(pokemon_id), k)
+    _similar_cache.put(f"{pokemon_id}:{k}", {"similar": similar})
+    return similar
+
+def get_cached_similar(pokemon_id, k: int = SIMILAR_COUNT) -> list[dict] | None:
+    """Returns the similar Pokémon for `pokemon_id` if already computed for this data, else None."""
+    if _similarity_index is None or _similarity_generation != data_generation():
+        return None
+    cached = _similar_cache.get(f"{pokemon_id}:{k}")
+    return None if cached is None else cached["similar"]
+
+def search_pokemon(query: str, limit: int = 10) -> list[dict]:
+    """
+    Returns up to `limit` Pokémon ranked by how well they match `query`:
+    exact id or name first, then name prefixes, substrings and close typos.
+    Each result has `id`, `name` and `score` (lower is better).
+    """
+    index = get_search_index()
+    with _search_index_lock:
+        return index.rank(query, limit)
+
+def get_dex_entry(name_or_id: str, fuzzy: bool = True) -> dict:
     """
     Fetches a detailed Pokédex entry for a given Pokémon name or ID from the database.
-    Falls back to JSON file if the database query fails.
+    Falls back to JSON file if the database query fails. If nothing matches
+    exactly, the best ranked search match is returned instead, unless
+    `fuzzy` is off.
     """
     if str(name_or_id) == "1773":
         return {
@@ -43,55 +422,137 @@ def get_dex_entry(name_or_id: str) -> dict:
             "flavor_text": "sonned by all",
         }
 
+    # Entries are cached by id, so names are resolved to one first.
+    pokemon_id = get_search_index().resolve(str(name_or_id))
+    cached = _entry_cache.get(str(pokemon_id if pokemon_id is not None else name_or_id))
+    if cached is not None:
+        return cached
+
+    entry = _get_exact_entry(name_or_id)
+    if fuzzy and "error" in entry and entry["error"] != DB_ERROR_MESSAGE:
+        matches = search_pokemon(str(name_or_id), limit=1)
+        if matches:
+            entry = _get_exact_entry(matches[0]["id"])
+    if "error" not in entry:
+        _entry_cache.put(str(entry["id"]), entry)
+    return entry
+
+def get_cached_dex_entry(pokemon_id) -> dict | None:
+    """Returns the entry for `pokemon_id` if it is already in memory, else None."""
+    return _entry_cache.get(str(pokemon_id))
+
+def get_art(pokemon_id, columns: int = ART_COLUMNS, render: bool = True) -> str:
+    """
+    Returns the ASCII art for a Pokémon at the given width, loading it only
+    when asked for. Widths that were never rendered are rendered from the
+    stored sprite and saved; without a sprite, or with `render` off (which
+    keeps the call read-only), the nearest stored width is used.
+    """
+    cache_key = f"{pokemon_id}:{columns}"
+    cached = _art_cache.get(cache_key)
+    if cached is not None:
+        return cached["ascii_art"]
+
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        query = """
-                                                SELECT 
-                                                    p.id, p.name, p.height, p.weight, p.flavor_text, p.ascii_art,
-                                                    s.hp, s.attack, s.defense, s.special_attack, s.special_defense, s.speed, 
-                                                    (SELECT GROUP_CONCAT(t.name) FROM pokemon_types pt JOIN types t ON pt.type_id = t.id WHERE pt.pokemon_id = p.id) as types, 
-                                                    (SELECT GROUP_CONCAT(a.name) FROM pokemon_abilities pa JOIN abilities a ON pa.ability_id = a.id WHERE pa.pokemon_id = p.id)
-                                     as abilities                        FROM pokemon p
-            LEFT JOIN stats s ON p.id = s.pokemon_id
-            WHERE p.id = ? OR lower(p.name) = ?;
-        """
-        
-        param = str(name_or_id).lower()
-        cursor.execute(query, (param, param))
-        row = cursor.fetchone()
-        conn.close()
+        with pooled_connection() as conn:
+            row = conn.execute(ART_QUERY, (columns, pokemon_id)).fetchone()
+        art = ""
+        if row and row["art"] is not None:
+            art = row["art"]
+        elif row and row["art_key"]:
+            art = _render_art(row["art_key"], columns) if render else _nearest_art(row["art_key"], columns)
+    except sqlite3.Error:
+        try:
+            art = _fallback.get_art(pokemon_id)
+        except (IOError, json.JSONDecodeError):
+            art = ""
+
+    _art_cache.put(cache_key, {"ascii_art": art})
+    return art
+
+def forget_art(pokemon_id, columns: int = ART_COLUMNS) -> None:
+    """Drops cached art for `pokemon_id`, e.g. once missing art has been filled in."""
+    _art_cache.discard(f"{pokemon_id}:{columns}")
+
+def get_cached_art(pokemon_id, columns: int = ART_COLUMNS) -> str | None:
+    """Returns the art for `pokemon_id` if it is already in memory, else None."""
+    cached = _art_cache.get(f"{pokemon_id}:{columns}")
+    return None if cached is None else cached["ascii_art"]
+
+def _render_art(art_key: str, columns: int) -> str:
+    """Renders and stores art for a new width, or falls back to the nearest one."""
+    sprite = load_sprite(art_key)
+    if sprite is not None:
+        try:
+            art = render_ascii_art(sprite, columns)
+        except Exception:
+            pass
+        else:
+            with pooled_connection() as conn, conn:
+                conn.execute(INSERT_ART_QUERY, (art_key, columns, art))
+            return art
+    return _nearest_art(art_key, columns)
+
+def _nearest_art(art_key: str, columns: int) -> str:
+    with pooled_connection() as conn:
+        row = conn.execute(NEAREST_ART_QUERY, (art_key, columns)).fetchone()
+    return row["art"] if row else ""
+
+def _load_for_prefetch(key: str) -> dict | None:
+    entry = _get_exact_entry(key)
+    if "error" in entry:
+        return None
+    get_art(entry["id"])
+    return entry
+
+_prefetcher = Prefetcher(_entry_cache, _load_for_prefetch)
+
+def prefetch_dex_entries(pokemon_ids) -> None:
+    """Warms the entry cache for `pokemon_ids` in the background, in order."""
+    _prefetcher.prefetch([str(pokemon_id) for pokemon_id in pokemon_ids])
+
+def invalidate_caches() -> None:
+    """
+    Drops everything held in memory from the dex data: cached entries, art
+    and similar lists, and the search, stats and similarity stores, which
+    are rebuilt on next use. Called whenever this process reloads or
+    updates the data, and by the API server when another process does.
+    """
+    global _search_index, _stats_store, _similarity_index
+    with _search_index_lock:
+        _search_index = None
+    with _stats_store_lock:
+        _stats_store = None
+    with _similarity_lock:
+        _similarity_index = None
+        _similar_cache.clear()
+    _entry_cache.clear()
+    _art_cache.clear()
+
+on_data_reload(invalidate_caches)
+
+def shutdown_backend() -> None:
+    """Stops background prefetching, writes pending app data and closes pooled DB connections."""
+    _prefetcher.shutdown()
+    _app_data.close()
+    close_pool()
+
+def _get_exact_entry(name_or_id) -> dict:
+    """Looks up an entry by exact id or case-insensitive name."""
+    try:
+        param = name_key(str(name_or_id))
+        query = ENTRY_VIEW_BY_ID_QUERY if param.isdigit() else ENTRY_VIEW_BY_NAME_QUERY
+        with pooled_connection() as conn:
+            row = conn.execute(query, (param,)).fetchone()
 
         if not row:
             return {"error": f"Entry '{name_or_id}' not found."}
 
-        return {
-            "name": row["name"].capitalize(),
-            "id": row["id"],
-            "types": row["types"].split(',') if row["types"] else [],
-            "abilities": row["abilities"].split(',') if row["abilities"] else [],
-            "height": row["height"],
-            "weight": row["weight"],
-            "stats": {
-                "hp": row["hp"], "attack": row["attack"], "defense": row["defense"],
-                "special-attack": row["special_attack"], "special-defense": row["special_defense"],
-                "speed": row["speed"],
-            },
-            "flavor_text": row["flavor_text"],
-            "ascii_art": row["ascii_art"],
-        }
+        return json.loads(row["payload"])
 
     except sqlite3.Error:
         # Fallback to JSON
         try:
-            with open(JSON_PATH, "r") as f:
-                all_data = json.load(f)
-            
-            search_term = str(name_or_id).lower()
-            for p in all_data:
-                if str(p["id"]) == search_term or p["name"].lower() == search_term:
-                    return p
-            return {"error": f"Entry '{name_or_id}' not found in JSON fallback."}
+            return _fallback.get_dex_entry(name_or_id)
         except (IOError, json.JSONDecodeError):
             return {"error": DB_ERROR_MESSAGE}
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Caching for fully built dex entries.
+
+`EntryCache` is a thread-safe LRU bounded by an estimate of the bytes its
+entries hold, dominated by large text fields such as `ascii_art`. `Prefetcher` warms the
+cache from a single background thread; a newer request supersedes any
+older one that has not finished yet.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024
+
+# Rough per-entry cost of the dict, ints and short strings besides the
+# large text fields.
+ENTRY_OVERHEAD_BYTES = 1024
+
+
+def entry_size(entry: dict) -> int:
+    """Estimates how many bytes an entry keeps alive."""
+    size = ENTRY_OVERHEAD_BYTES
+    for field in ("ascii_art", "flavor_text"):
+        value = entry.get(field)
+        if value:
+            size += len(value)
+    return size
+
+
+class EntryCache:
+    """An LRU cache of dex entries bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+    def get(self, key):
+        """Returns the cached entry and marks it most recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry: dict) -> None:
+        size = entry_size(entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+
+    def discard(self, key) -> None:
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self._bytes -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+
+class Prefetcher:
+    """Loads entries into an `EntryCache` on one background thread."""
+
+    def __init__(self, cache: EntryCache, loader):
+        self.cache = cache
+        self.loader = loader
+        self._executor = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def prefetch(self, keys) -> None:
+        """Queues `keys` for loading, dropping whatever was queued before."""
+        keys = [key for key in keys if key not in self.cache]
+        with self._lock:
+            self._generation += 1
+            if not keys:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dex-prefetch")
+            self._executor.submit(self._run, keys, self._generation)
+
+    def _run(self, keys, generation: int) -> None:
+        for key in keys:
+            if generation != self._generation:
+                return
+            if key in self.cache:
+                continue
+            entry = self.loader(key)
+            if entry is not None:
+                self.cache.put(key, entry)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._generation += 1
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
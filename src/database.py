@@ -1,9 +1,63 @@
 import sqlite3
 import json
 import os
+import queue
+import threading
+import time
+import hashlib
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from .art_store import ART_COLUMNS, text_art_key
+from .records import EVOLUTION_CHAINS_NAME, MOVES_NAME, iter_records, resource_path_for
+from .snapshot import LIST_SNAPSHOT_ROWS, write_list_snapshot
 
 DB_PATH = os.path.join("data", "pokedex.db")
 JSON_PATH = os.path.join("data", "dex.json")
+NDJSON_PATH = os.path.join("data", "dex.ndjson")
+
+# The snapshot that ships with the repo, used when nothing has been fetched.
+BUNDLED_JSON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dex.json")
+
+# Records are loaded this many at a time, so memory use stays flat no matter
+# how large the source file grows.
+LOAD_BATCH_SIZE = 500
+
+# Per-connection statement cache. The backend keeps its queries as module
+# constants so repeated lookups reuse the already prepared statements.
+STATEMENT_CACHE_SIZE = 256
+POOL_SIZE = 4
+MMAP_SIZE = 64 * 1024 * 1024
+
+def get_source_path() -> str | None:
+    """
+    Returns the dex record file to load from: the streamed NDJSON output of
+    the fetcher if present (plain or gzipped), else the legacy dex.json,
+    else the snapshot bundled with the repo.
+    """
+    for path in (NDJSON_PATH, NDJSON_PATH + ".gz", JSON_PATH, BUNDLED_JSON_PATH):
+        if os.path.exists(path):
+            return path
+    return None
+
+def get_resource_path(source_path: str, name: str) -> str | None:
+    """
+    Returns the shared resource record file (moves, evolution chains) that
+    goes with `source_path`, if one was fetched.
+    """
+    for path in (resource_path_for(source_path, name), resource_path_for(source_path + ".gz", name)):
+        if os.path.exists(path):
+            return path
+    return None
+
+def has_pokemon() -> bool:
+    """Whether the database has been populated (see update_db_from_json)."""
+    conn = get_db_connection()
+    try:
+        return conn.execute("SELECT EXISTS (SELECT 1 FROM pokemon)").fetchone()[0] == 1
+    finally:
+        conn.close()
 
 def get_db_connection():
     """Establishes a connection to the SQLite database."""
@@ -11,10 +65,127 @@ def get_db_connection():
     conn.row_factory = sqlite3.Row
     return conn
 
+
+class ConnectionPool:
+    """
+    A small pool of long-lived SQLite connections shared between threads.
+
+    Textual thread workers are short-lived, so connections are checked out
+    per call rather than pinned to a thread. Pragmas are applied once, when a
+    connection is first opened.
+    """
+
+    def __init__(self, path: str = DB_PATH, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Checks out a connection for the duration of a `with` block."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed.")
+                if len(self._all) < self.size:
+                    conn = self._open()
+                    self._all.append(conn)
+                else:
+                    conn = None
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        """
+        Closes the pool. Idle connections are closed immediately, connections
+        still checked out are closed when they are returned.
+        """
+        with self._lock:
+            self._closed = True
+            self._all = []
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Bumped each time populate_db_from_json reloads the data in this process,
+# so in-memory structures built from it (see backend) know to rebuild.
+_data_generation = 0
+# Called after each bump, see on_data_reload.
+_reload_callbacks = []
+
+def get_pool() -> ConnectionPool:
+    """Returns the process-wide connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.path != DB_PATH:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+@contextmanager
+def pooled_connection():
+    """Checks out a pooled read connection."""
+    with get_pool().connection() as conn:
+        yield conn
+
+def close_pool() -> None:
+    """Closes the shared connection pool. Safe to call more than once."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+def _ensure_column(cursor: sqlite3.Cursor, table: str, column: str, declaration: str) -> None:
+    """Adds `column` to an existing table if it is missing."""
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
 def create_tables():
     """Creates all the necessary tables in the database based on the schema."""
     conn = get_db_connection()
     cursor = conn.cursor()
+    existing = cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pokemon'").fetchone()
 
     # Pokémon Table
     cursor.execute("""
@@ -24,7 +195,29 @@ def create_tables():
         height INTEGER,
         weight INTEGER,
         flavor_text TEXT,
-        ascii_art TEXT
+        art_key TEXT,
+        name_key TEXT,
+        content_hash TEXT
+    );
+    """)
+
+    # Rendered Art Table, content-addressed by sprite hash and width
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS art (
+        art_key TEXT NOT NULL,
+        columns INTEGER NOT NULL,
+        art TEXT NOT NULL,
+        PRIMARY KEY (art_key, columns)
+    ) WITHOUT ROWID;
+    """)
+
+    # Materialized Entry Table: one pre-serialized dex entry per Pokémon,
+    # rebuilt whenever the data is (re)loaded.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS entry_view (
+        pokemon_id INTEGER PRIMARY KEY,
+        payload TEXT NOT NULL,
+        FOREIGN KEY (pokemon_id) REFERENCES pokemon (id)
     );
     """)
 
@@ -34,6 +227,7 @@ def create_tables():
         pokemon_id INTEGER PRIMARY KEY,
         is_favorite INTEGER DEFAULT 0,
         search_count INTEGER DEFAULT 0,
+        view_count INTEGER DEFAULT 0,
         FOREIGN KEY (pokemon_id) REFERENCES pokemon (id)
     );
     """)
@@ -94,6 +288,7 @@ def create_tables():
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS evolutions (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
+        chain_id INTEGER,
         from_pokemon_id INTEGER,
         to_pokemon_id INTEGER,
         trigger TEXT,
@@ -130,91 +325,623 @@ def create_tables():
     );
     """)
 
+    # Build metadata: build_id changes whenever the dex data is (re)loaded,
+    # so caches of anything derived from it (see server) can tell.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS dex_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    """)
+
+    if existing:
+        migrate(cursor)
+    else:
+        # Fresh tables already have the latest schema.
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
     conn.commit()
     conn.close()
 
-def populate_db_from_json():
-    """Populates the database from the dex.json file."""
-    if not os.path.exists(JSON_PATH):
-        print(f"Error: {JSON_PATH} not found. Cannot populate database.")
+# --- Schema Migrations ---
+# The CREATE TABLE statements above describe the latest schema. Databases
+# created by older versions are brought up to date by the steps below,
+# tracked through PRAGMA user_version. Steps must be safe to run on a
+# database that already has the latest tables.
+
+def _migrate_art_key(cursor: sqlite3.Cursor) -> None:
+    """
+    v1: art moved to the art table, referenced by pokemon.art_key. Art kept
+    in the old pokemon.ascii_art column is carried over, keyed by its text.
+    """
+    _ensure_column(cursor, "pokemon", "art_key", "TEXT")
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(pokemon)")}
+    if "ascii_art" not in columns:
         return
+    rows = cursor.execute(
+        "SELECT id, ascii_art FROM pokemon WHERE art_key IS NULL AND ascii_art IS NOT NULL AND ascii_art != ''"
+    ).fetchall()
+    keyed = [(row[0], text_art_key(row[1]), row[1]) for row in rows]
+    cursor.executemany(
+        "INSERT OR IGNORE INTO art (art_key, columns, art) VALUES (?, ?, ?)",
+        [(art_key, ART_COLUMNS, art) for _, art_key, art in keyed],
+    )
+    cursor.executemany(
+        "UPDATE pokemon SET art_key = ? WHERE id = ?",
+        [(art_key, pokemon_id) for pokemon_id, art_key, _ in keyed],
+    )
+    cursor.execute("ALTER TABLE pokemon DROP COLUMN ascii_art")
 
-    conn = get_db_connection()
+def _migrate_name_key(cursor: sqlite3.Cursor) -> None:
+    """v2: stored lowercased name, so name lookups can use an index."""
+    _ensure_column(cursor, "pokemon", "name_key", "TEXT")
+    rows = cursor.execute("SELECT id, name FROM pokemon WHERE name_key IS NULL").fetchall()
+    cursor.executemany("UPDATE pokemon SET name_key = ? WHERE id = ?", [(name_key(row[1]), row[0]) for row in rows])
+
+def _migrate_entry_view(cursor: sqlite3.Cursor) -> None:
+    """v3: entries are served from the materialized entry_view table."""
+    rebuild_entry_view(cursor.connection)
+
+def _migrate_content_hash(cursor: sqlite3.Cursor) -> None:
+    """v4: per-record content hashes for incremental updates."""
+    # Rows loaded before this have no hash, so the next update rewrites them once.
+    _ensure_column(cursor, "pokemon", "content_hash", "TEXT")
+
+def _migrate_evolution_chains(cursor: sqlite3.Cursor) -> None:
+    """v5: evolutions grouped by chain, so a whole chain can be looked up."""
+    _ensure_column(cursor, "evolutions", "chain_id", "INTEGER")
+
+def _migrate_view_count(cursor: sqlite3.Cursor) -> None:
+    """v6: entry views are counted, for the "most viewed" list order."""
+    _ensure_column(cursor, "pokemon_app_data", "view_count", "INTEGER DEFAULT 0")
+
+MIGRATIONS = {
+    1: _migrate_art_key,
+    2: _migrate_name_key,
+    3: _migrate_entry_view,
+    4: _migrate_content_hash,
+    5: _migrate_evolution_chains,
+    6: _migrate_view_count,
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+def migrate(cursor: sqlite3.Cursor) -> None:
+    """Applies any migrations newer than the database's user_version."""
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        MIGRATIONS[target](cursor)
+    if version != SCHEMA_VERSION:
+        # Indexes are created once the columns they cover exist.
+        create_indexes(cursor.connection)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+def name_key(name: str) -> str:
+    """The normalized form names are stored and looked up by."""
+    return name.strip().lower()
+
+# Joins an entry back together from the normalized tables. Only used to
+# (re)build entry_view; lookups read the materialized payload.
+DEX_ENTRY_SELECT = """
+    SELECT
+        p.id, p.name, p.height, p.weight, p.flavor_text,
+        s.hp, s.attack, s.defense, s.special_attack, s.special_defense, s.speed,
+        (SELECT GROUP_CONCAT(t.name) FROM pokemon_types pt JOIN types t ON pt.type_id = t.id WHERE pt.pokemon_id = p.id) as types,
+        (SELECT GROUP_CONCAT(a.name) FROM pokemon_abilities pa JOIN abilities a ON pa.ability_id = a.id WHERE pa.pokemon_id = p.id) as abilities
+    FROM pokemon p
+    LEFT JOIN stats s ON p.id = s.pokemon_id
+"""
+
+def entry_from_row(row) -> dict:
+    """Builds a dex entry dict from a DEX_ENTRY_SELECT row."""
+    return {
+        "name": row["name"].capitalize(),
+        "id": row["id"],
+        "types": row["types"].split(',') if row["types"] else [],
+        "abilities": row["abilities"].split(',') if row["abilities"] else [],
+        "height": row["height"],
+        "weight": row["weight"],
+        "stats": {
+            "hp": row["hp"], "attack": row["attack"], "defense": row["defense"],
+            "special-attack": row["special_attack"], "special-defense": row["special_defense"],
+            "speed": row["speed"],
+        },
+        "flavor_text": row["flavor_text"],
+    }
+
+def rebuild_entry_view(conn: sqlite3.Connection, pokemon_ids: list[int] | None = None) -> None:
+    """
+    Re-materializes entry_view from the normalized tables, either fully or
+    only for `pokemon_ids`, LOAD_BATCH_SIZE entries at a time.
+    """
     cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    if pokemon_ids is None:
+        conn.execute("DELETE FROM entry_view")
+        cursor.execute(DEX_ENTRY_SELECT)
+        while rows := cursor.fetchmany(LOAD_BATCH_SIZE):
+            _write_entry_view(conn, rows)
+        return
+    for start in range(0, len(pokemon_ids), LOAD_BATCH_SIZE):
+        chunk = pokemon_ids[start:start + LOAD_BATCH_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        _write_entry_view(conn, cursor.execute(DEX_ENTRY_SELECT + f"WHERE p.id IN ({placeholders})", chunk).fetchall())
 
-    with open(JSON_PATH, "r") as f:
-        all_pokemon_data = json.load(f)
+def _write_entry_view(conn: sqlite3.Connection, rows) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO entry_view (pokemon_id, payload) VALUES (?, ?)",
+        (
+            (row["id"], json.dumps(entry_from_row(row), separators=(",", ":"), ensure_ascii=False))
+            for row in rows
+        ),
+    )
 
-    # Caches to avoid querying the DB repeatedly for IDs
-    type_id_cache = {}
-    ability_id_cache = {}
+def create_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Creates secondary indexes. Run after bulk loads, not before.
+
+    Lookups by pokemon_id on the link tables (including learnsets) are
+    served by their composite primary keys, which lead with pokemon_id.
+    """
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pokemon_name_key ON pokemon (name_key)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pokemon_types_type ON pokemon_types (type_id, pokemon_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pokemon_abilities_ability ON pokemon_abilities (ability_id, pokemon_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pokemon_moves_move ON pokemon_moves (move_id, pokemon_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_evolutions_chain ON evolutions (chain_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_evolutions_from ON evolutions (from_pokemon_id, chain_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_evolutions_to ON evolutions (to_pokemon_id, chain_id)")
+    # The "most viewed" and "favorites first" list orders walk these.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_app_data_views ON pokemon_app_data (view_count DESC, pokemon_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_app_data_favorites ON pokemon_app_data (is_favorite DESC, pokemon_id)")
+
+
+# Pragmas for the duration of a bulk load. The load runs in one transaction
+# and is repeatable from the record file, so durability can be relaxed.
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
 
-    # Pre-fill caches with existing data to be safe
-    cursor.execute("SELECT id, name FROM types")
-    for row in cursor.fetchall():
-        type_id_cache[row['name']] = row['id']
 
-    cursor.execute("SELECT id, name FROM abilities")
+def _upsert_names(cursor: sqlite3.Cursor, table: str, names: set[str], ids: dict[str, int]) -> None:
+    """Inserts names missing from `ids` into a lookup table and records their ids."""
+    new_names = sorted(names - ids.keys())
+    if not new_names:
+        return
+    cursor.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", [(name,) for name in new_names])
+    placeholders = ",".join("?" * len(new_names))
+    cursor.execute(f"SELECT id, name FROM {table} WHERE name IN ({placeholders})", new_names)
     for row in cursor.fetchall():
-        ability_id_cache[row['name']] = row['id']
+        ids[row["name"]] = row["id"]
+
+
+def _record_batches(path: str, size: int):
+    """Yields lists of up to `size` records streamed from `path`."""
+    batch = []
+    for record in iter_records(path):
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def record_hash(record: dict) -> str:
+    """A stable hash of a record's content, used to detect changed records."""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# Statements that differ between a fresh load, which never overwrites, and
+# an update, which replaces the record's rows but keeps pokemon_app_data.
+LOAD_STATEMENTS = {
+    "pokemon": "INSERT OR IGNORE INTO pokemon (id, name, name_key, height, weight, flavor_text, art_key, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "stats": """
+        INSERT OR IGNORE INTO stats (pokemon_id, hp, attack, defense, special_attack, special_defense, speed)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+UPSERT_STATEMENTS = {
+    "pokemon": """
+        INSERT INTO pokemon (id, name, name_key, height, weight, flavor_text, art_key, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            name = excluded.name, name_key = excluded.name_key, height = excluded.height,
+            weight = excluded.weight, flavor_text = excluded.flavor_text,
+            art_key = excluded.art_key, content_hash = excluded.content_hash
+    """,
+    "stats": """
+        INSERT OR REPLACE INTO stats (pokemon_id, hp, attack, defense, special_attack, special_defense, speed)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+
+
+MOVE_UPSERT = """
+    INSERT INTO moves (name, type_id, power, pp, accuracy, effect)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (name) DO UPDATE SET
+        type_id = excluded.type_id, power = excluded.power, pp = excluded.pp,
+        accuracy = excluded.accuracy, effect = excluded.effect
+"""
+EVOLUTION_INSERT = """
+    INSERT INTO evolutions (chain_id, from_pokemon_id, to_pokemon_id, trigger, details)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _load_shared_resources(
+    cursor: sqlite3.Cursor,
+    source_path: str,
+    type_ids: dict,
+    move_ids: dict,
+    timings: dict,
+) -> dict[str, int]:
+    """
+    Loads the move and evolution chain record files that go with
+    `source_path`, if present. Moves are upserted by name, since Pokémon
+    records refer to them by name; evolutions are replaced wholesale, as
+    they are few.
+    Returns how many of each were loaded.
+    """
+    counts = {MOVES_NAME: 0, EVOLUTION_CHAINS_NAME: 0}
+    moves_path = get_resource_path(source_path, MOVES_NAME)
+    if moves_path is not None:
+        step_started = time.perf_counter()
+        for batch in _record_batches(moves_path, LOAD_BATCH_SIZE):
+            _upsert_names(cursor, "types", {move["type"] for move in batch if move.get("type")}, type_ids)
+            cursor.executemany(MOVE_UPSERT, [
+                (move["name"], type_ids.get(move.get("type")), move.get("power"),
+                 move.get("pp"), move.get("accuracy"), move.get("effect", ""))
+                for move in batch
+            ])
+            counts[MOVES_NAME] += len(batch)
+        move_ids.update((row["name"], row["id"]) for row in cursor.execute("SELECT id, name FROM moves"))
+        timings["moves"] += time.perf_counter() - step_started
+
+    chains_path = get_resource_path(source_path, EVOLUTION_CHAINS_NAME)
+    if chains_path is not None:
+        step_started = time.perf_counter()
+        cursor.execute("DELETE FROM evolutions")
+        for batch in _record_batches(chains_path, LOAD_BATCH_SIZE):
+            cursor.executemany(EVOLUTION_INSERT, [
+                (chain["id"], link["from_id"], link["to_id"], link.get("trigger"),
+                 json.dumps(link.get("details", {}), separators=(",", ":")))
+                for chain in batch
+                for link in chain["links"]
+            ])
+            counts[EVOLUTION_CHAINS_NAME] += len(batch)
+        timings["evolutions"] += time.perf_counter() - step_started
+    return counts
+
+
+def _load_batch(
+    cursor: sqlite3.Cursor,
+    batch: list[dict],
+    type_ids: dict,
+    ability_ids: dict,
+    move_ids: dict,
+    timings: dict,
+    upsert: bool = False,
+) -> None:
+    """
+    Inserts one batch of records, table by table. With `upsert`, existing
+    records are overwritten and their type/ability/move links replaced.
+    """
+    statements = UPSERT_STATEMENTS if upsert else LOAD_STATEMENTS
+    pokemon_rows = []
+    art_rows = []
+    app_data_rows = []
+    stats_rows = []
+    type_links = []
+    ability_links = []
+    move_links = []
+    for pokemon in batch:
+        pokemon_id = pokemon['id']
+        ascii_art = pokemon.get('ascii_art')
+        art_key = pokemon.get('sprite_hash') or (text_art_key(ascii_art) if ascii_art else None)
+        if art_key and ascii_art:
+            art_rows.append((art_key, pokemon.get('art_columns', ART_COLUMNS), ascii_art))
+        pokemon_rows.append((
+            pokemon_id, pokemon['name'], name_key(pokemon['name']), pokemon['height'], pokemon['weight'],
+            pokemon.get('flavor_text', ''), art_key, record_hash(pokemon),
+        ))
+        app_data_rows.append((pokemon_id,))
+        stats = pokemon['stats']
+        stats_rows.append((
+            pokemon_id, stats.get('hp', 0), stats.get('attack', 0), stats.get('defense', 0),
+            stats.get('special-attack', 0), stats.get('special-defense', 0), stats.get('speed', 0),
+        ))
+        type_links.extend((pokemon_id, type_name) for type_name in pokemon['types'])
+        ability_links.extend((pokemon_id, ability_name) for ability_name in pokemon['abilities'])
+        move_links.extend(
+            (pokemon_id, move['move'], move['method'], move['level']) for move in pokemon.get('moves', [])
+        )
+
+    def timed(step: str, sql: str, rows: list) -> None:
+        step_started = time.perf_counter()
+        cursor.executemany(sql, rows)
+        timings[step] += time.perf_counter() - step_started
+
+    timed("pokemon", statements["pokemon"], pokemon_rows)
+    timed("art", "INSERT OR IGNORE INTO art (art_key, columns, art) VALUES (?, ?, ?)", art_rows)
+    timed("pokemon_app_data", "INSERT OR IGNORE INTO pokemon_app_data (pokemon_id) VALUES (?)", app_data_rows)
+    timed("stats", statements["stats"], stats_rows)
+
+    step_started = time.perf_counter()
+    _upsert_names(cursor, "types", {name for _, name in type_links}, type_ids)
+    _upsert_names(cursor, "abilities", {name for _, name in ability_links}, ability_ids)
+    # Moves missing from the move file are still linked, by name only.
+    _upsert_names(cursor, "moves", {name for _, name, _, _ in move_links}, move_ids)
+    timings["types/abilities"] += time.perf_counter() - step_started
+
+    if upsert:
+        batch_ids = [(pokemon_id,) for pokemon_id, *_ in pokemon_rows]
+        timed("pokemon_types", "DELETE FROM pokemon_types WHERE pokemon_id = ?", batch_ids)
+        timed("pokemon_abilities", "DELETE FROM pokemon_abilities WHERE pokemon_id = ?", batch_ids)
+        timed("pokemon_moves", "DELETE FROM pokemon_moves WHERE pokemon_id = ?", batch_ids)
+    timed(
+        "pokemon_types",
+        "INSERT OR IGNORE INTO pokemon_types (pokemon_id, type_id) VALUES (?, ?)",
+        [(pokemon_id, type_ids[name]) for pokemon_id, name in type_links],
+    )
+    timed(
+        "pokemon_abilities",
+        "INSERT OR IGNORE INTO pokemon_abilities (pokemon_id, ability_id) VALUES (?, ?)",
+        [(pokemon_id, ability_ids[name]) for pokemon_id, name in ability_links],
+    )
+    timed(
+        "pokemon_moves",
+        "INSERT OR IGNORE INTO pokemon_moves (pokemon_id, move_id, learn_method, level_learned) VALUES (?, ?, ?, ?)",
+        [(pokemon_id, move_ids[name], method, level) for pokemon_id, name, method, level in move_links],
+    )
+
+
+def _rollback(conn: sqlite3.Connection) -> None:
+    """Rolls back the open transaction, if the failure left one open."""
+    if conn.in_transaction:
+        conn.execute("ROLLBACK")
+
+
+def populate_db_from_json(source_path: str | None = None, progress=None) -> dict[str, float] | None:
+    """
+    Populates the database from the dex record file (see get_source_path).
+
+    Records are streamed in batches; each batch is inserted table by table
+    with executemany, all in one transaction, and secondary indexes are
+    created once the data is in. Returns the time spent per step in seconds.
+    The record count is reported to `progress` (see src.progress), if given,
+    under the "database" phase, and messages and timings go to its log
+    instead of stdout.
+    """
+    log = print if progress is None else progress.log
+    source_path = source_path or get_source_path()
+    if source_path is None or not os.path.exists(source_path):
+        log(f"Error: {source_path or JSON_PATH} not found. Cannot populate database.")
+        return None
+
+    timings = defaultdict(float)
+    started = time.perf_counter()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    for pragma in BULK_LOAD_PRAGMAS:
+        cursor.execute(pragma)
 
     try:
         cursor.execute("BEGIN")
 
-        for pokemon in all_pokemon_data:
-            # 1. Insert into pokemon table
-            cursor.execute(
-                "INSERT OR IGNORE INTO pokemon (id, name, height, weight, flavor_text, ascii_art) VALUES (?, ?, ?, ?, ?, ?)",
-                (pokemon['id'], pokemon['name'], pokemon['height'], pokemon['weight'], pokemon.get('flavor_text', ''), pokemon.get('ascii_art', ''))
-            )
-
-            # 2. Insert into pokemon_app_data
-            cursor.execute(
-                "INSERT OR IGNORE INTO pokemon_app_data (pokemon_id) VALUES (?)",
-                (pokemon['id'],)
-            )
-
-            # 3. Insert into stats
-            stats = pokemon['stats']
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO stats (pokemon_id, hp, attack, defense, special_attack, special_defense, speed)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (pokemon['id'], stats.get('hp', 0), stats.get('attack', 0), stats.get('defense', 0),
-                 stats.get('special-attack', 0), stats.get('special-defense', 0), stats.get('speed', 0))
-            )
-
-            # 4. Handle Types
-            for type_name in pokemon['types']:
-                if type_name not in type_id_cache:
-                    cursor.execute("INSERT INTO types (name) VALUES (?)", (type_name,))
-                    type_id_cache[type_name] = cursor.lastrowid
-                type_id = type_id_cache[type_name]
-                cursor.execute("INSERT OR IGNORE INTO pokemon_types (pokemon_id, type_id) VALUES (?, ?)", (pokemon['id'], type_id))
-
-            # 5. Handle Abilities
-            for ability_name in pokemon['abilities']:
-                if ability_name not in ability_id_cache:
-                    cursor.execute("INSERT INTO abilities (name) VALUES (?)", (ability_name,))
-                    ability_id_cache[ability_name] = cursor.lastrowid
-                ability_id = ability_id_cache[ability_name]
-                cursor.execute("INSERT OR IGNORE INTO pokemon_abilities (pokemon_id, ability_id) VALUES (?, ?)", (pokemon['id'], ability_id))
+        type_ids = {row["name"]: row["id"] for row in cursor.execute("SELECT id, name FROM types")}
+        ability_ids = {row["name"]: row["id"] for row in cursor.execute("SELECT id, name FROM abilities")}
+        move_ids = {}
+        shared = _load_shared_resources(cursor, source_path, type_ids, move_ids, timings)
 
+        count = 0
+        batches = _record_batches(source_path, LOAD_BATCH_SIZE)
+        while True:
+            step_started = time.perf_counter()
+            batch = next(batches, None)
+            timings["read"] += time.perf_counter() - step_started
+            if batch is None:
+                break
+            _load_batch(cursor, batch, type_ids, ability_ids, move_ids, timings)
+            count += len(batch)
+            if progress is not None:
+                progress.update("database", done=count)
+
+        step_started = time.perf_counter()
+        create_indexes(conn)
+        timings["indexes"] = time.perf_counter() - step_started
+
+        step_started = time.perf_counter()
+        rebuild_entry_view(conn)
+        timings["entry_view"] = time.perf_counter() - step_started
+
+        set_build_id(cursor)
         cursor.execute("COMMIT")
-        print("Database populated successfully.")
+    except Exception as e:
+        _rollback(conn)
+        conn.close()
+        log(f"An error occurred: {e}")
+        return None
+
+    # The data is committed from here on; what follows cannot undo it.
+    _bump_data_generation()
+    try:
+        # The pool's connections ask for WAL too, so this is not fatal.
+        cursor.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.Error as e:
+        log(f"Could not switch the database to WAL mode: {e}")
+    try:
+        refresh_list_snapshot(conn, log)
+    finally:
+        conn.close()
+    timings["total"] = time.perf_counter() - started
+    log(
+        f"Database populated successfully ({count} records from {source_path}, "
+        f"{shared[MOVES_NAME]} moves, {shared[EVOLUTION_CHAINS_NAME]} evolution chains)."
+    )
+    print_timings(timings, log)
+    return dict(timings)
+
+
+# The rows a record owns, besides its pokemon row, by table and id column.
+RECORD_TABLES = {
+    "entry_view": "pokemon_id",
+    "pokemon_app_data": "pokemon_id",
+    "stats": "pokemon_id",
+    "pokemon_types": "pokemon_id",
+    "pokemon_abilities": "pokemon_id",
+    "pokemon_moves": "pokemon_id",
+    "pokemon": "id",
+}
 
+
+def update_db_from_json(source_path: str | None = None, progress=None) -> dict[str, int] | None:
+    """
+    Brings an existing database in line with the record file, touching only
+    records whose content hash changed. Records missing from the file are
+    deleted, along with art no longer used by any record. Everything runs
+    in one transaction; pokemon_app_data (favorites, counters) is never
+    overwritten for records that remain. Returns counts of inserted,
+    updated, unchanged and removed records. Messages go to the log of
+    `progress` (see src.progress), if given, instead of stdout.
+    """
+    log = print if progress is None else progress.log
+    source_path = source_path or get_source_path()
+    if source_path is None or not os.path.exists(source_path):
+        log(f"Error: {source_path or JSON_PATH} not found. Cannot update database.")
+        return None
+
+    started = time.perf_counter()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    summary = {"inserted": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    try:
+        cursor.execute("BEGIN")
+        stored = {row["id"]: row for row in cursor.execute("SELECT id, content_hash, art_key FROM pokemon")}
+        type_ids = {row["name"]: row["id"] for row in cursor.execute("SELECT id, name FROM types")}
+        ability_ids = {row["name"]: row["id"] for row in cursor.execute("SELECT id, name FROM abilities")}
+        move_ids = {row["name"]: row["id"] for row in cursor.execute("SELECT id, name FROM moves")}
+
+        timings = defaultdict(float)
+        shared = _load_shared_resources(cursor, source_path, type_ids, move_ids, timings)
+        changed_ids = []
+        seen_ids = set()
+        for batch in _record_batches(source_path, LOAD_BATCH_SIZE):
+            changed = []
+            for record in batch:
+                pokemon_id = record['id']
+                seen_ids.add(pokemon_id)
+                if pokemon_id not in stored:
+                    summary["inserted"] += 1
+                elif stored[pokemon_id]["content_hash"] != record_hash(record):
+                    summary["updated"] += 1
+                else:
+                    summary["unchanged"] += 1
+                    continue
+                changed.append(record)
+                changed_ids.append(pokemon_id)
+            if changed:
+                _load_batch(cursor, changed, type_ids, ability_ids, move_ids, timings, upsert=True)
+
+        removed_ids = [(pokemon_id,) for pokemon_id in stored.keys() - seen_ids]
+        for table, column in RECORD_TABLES.items():
+            cursor.executemany(f"DELETE FROM {table} WHERE {column} = ?", removed_ids)
+        summary["removed"] = len(removed_ids)
+
+        if changed_ids or removed_ids:
+            _delete_unused_art(cursor, {
+                stored[pokemon_id]["art_key"]
+                for pokemon_id in [*changed_ids, *(pokemon_id for pokemon_id, in removed_ids)]
+                if pokemon_id in stored
+            })
+            rebuild_entry_view(conn, changed_ids)
+            set_build_id(cursor)
+        cursor.execute("COMMIT")
     except Exception as e:
-        cursor.execute("ROLLBACK")
-        print(f"An error occurred: {e}")
+        _rollback(conn)
+        conn.close()
+        log(f"An error occurred: {e}")
+        return None
+
+    try:
+        if changed_ids or removed_ids:
+            _bump_data_generation()
+            refresh_list_snapshot(conn, log)
     finally:
         conn.close()
 
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    log(
+        f"Update complete in {elapsed_ms:.1f} ms: {summary['inserted']} inserted, "
+        f"{summary['updated']} updated, {summary['unchanged']} unchanged, {summary['removed']} removed; "
+        f"{shared[MOVES_NAME]} moves and {shared[EVOLUTION_CHAINS_NAME]} evolution chains reloaded."
+    )
+    return summary
+
+
+def _delete_unused_art(cursor: sqlite3.Cursor, art_keys: set) -> None:
+    """Deletes the art stored under `art_keys` that no record refers to any more."""
+    art_keys.discard(None)
+    if not art_keys:
+        return
+    in_use = {row[0] for row in cursor.execute("SELECT DISTINCT art_key FROM pokemon WHERE art_key IS NOT NULL")}
+    cursor.executemany("DELETE FROM art WHERE art_key = ?", [(art_key,) for art_key in art_keys - in_use])
+
+
+BUILD_ID_QUERY = "SELECT value FROM dex_meta WHERE key = 'build_id'"
+
+def set_build_id(cursor: sqlite3.Cursor) -> None:
+    """Gives the database a new build id, in the cursor's transaction."""
+    cursor.execute(
+        "INSERT INTO dex_meta (key, value) VALUES ('build_id', ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (uuid.uuid4().hex,),
+    )
+
+
+def data_generation() -> int:
+    """How many times populate_db_from_json has reloaded the data in this process."""
+    return _data_generation
+
+
+def on_data_reload(callback) -> None:
+    """Registers `callback` to be called each time the data generation is bumped."""
+    _reload_callbacks.append(callback)
+
+
+def _bump_data_generation() -> None:
+    global _data_generation
+    _data_generation += 1
+    for callback in _reload_callbacks:
+        callback()
+
+
+def refresh_list_snapshot(conn: sqlite3.Connection, log=print) -> None:
+    """Rewrites the first-page list snapshot the dex screen paints at startup."""
+    rows = conn.execute(
+        "SELECT id, name FROM pokemon ORDER BY id LIMIT ?", (LIST_SNAPSHOT_ROWS,)
+    ).fetchall()
+    try:
+        write_list_snapshot(rows)
+    except OSError as e:
+        # Only startup latency depends on it; the full list still loads.
+        log(f"Could not write the list snapshot: {e}")
+
+
+def print_timings(timings: dict[str, float], log=print) -> None:
+    """Prints a per-step timing report, or passes its lines to `log`."""
+    for step, seconds in timings.items():
+        log(f"  {step:<20} {seconds * 1000:8.1f} ms")
+
 
 if __name__ == '__main__':
     print("Initializing database...")
     # Ensure data directory exists
     os.makedirs("data", exist_ok=True)
     create_tables()
-    populate_database()
+    populate_db_from_json()
     print("Database initialization complete.")
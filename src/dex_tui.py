@@ -1,9 +1,8 @@
 import os
+import sys
 from textual.app import App
-from .screens import DexScreen, SetupScreen
-from .database import DB_PATH
+from .seed import can_seed
 
-__version__ = "1.0.0"
 _current_dir = os.path.dirname(os.path.abspath(__file__))
 
 class DexTUI(App):
@@ -11,15 +10,44 @@ class DexTUI(App):
 
     CSS_PATH = os.path.join(_current_dir, "static", "dex.css")
     
+    # Screens are built on demand so each screen module is imported only when
+    # it is first shown. The dex screen migrates the database in its loader.
     SCREENS = {
-        "dex": DexScreen,
-        "setup": SetupScreen,
+        "dex": lambda: _screens().DexScreen(),
     }
 
+    def __init__(self, in_process_setup: bool = False, refresh: bool = False):
+        super().__init__()
+        # Run the data pipeline on a worker thread rather than as a `uv run`
+        # subprocess.
+        self.in_process_setup = in_process_setup
+        # Refetch everything from PokeAPI instead of opening the dex.
+        self.refresh_data = refresh
+
     def on_mount(self) -> None:
-        """Called when the app is first mounted."""
-        if os.path.exists(DB_PATH):
-            self.push_screen("dex")
+        """
+        Called when the app is first mounted. Without a database the dex
+        screen seeds one from the bundled snapshot (see src/seed.py); the
+        data pipeline only runs when asked to, or when there is nothing to
+        seed from.
+        """
+        if self.refresh_data or not can_seed():
+            self.push_screen(_screens().SetupScreen(in_process=self.in_process_setup))
         else:
-            self.push_screen("setup")
+            self.push_screen("dex")
+
+    def on_unmount(self) -> None:
+        """Called when the app shuts down. Stops background work and closes the DB."""
+        # Nothing to stop if these were never imported.
+        scheduler = sys.modules.get(f"{__package__}.scheduler")
+        if scheduler is not None:
+            scheduler.shutdown_executor()
+        backend = sys.modules.get(f"{__package__}.backend")
+        if backend is not None:
+            backend.shutdown_backend()
+
+
+def _screens():
+    from . import screens
+    return screens
 
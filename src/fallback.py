@@ -0,0 +1,72 @@
+"""
+In-memory fallback store used when the SQLite database is missing or broken.
+
+The record file is streamed in once and indexed by id and lowercased name.
+It is reloaded only when the file (or which file is in use) changes.
+"""
+import os
+import threading
+
+from .database import get_source_path, JSON_PATH
+from .records import iter_records
+
+# Record fields that belong to the art store rather than the entry.
+ART_FIELDS = ("ascii_art", "art_columns", "sprite_hash")
+
+# Record fields that the database keeps in their own tables.
+LINK_FIELDS = ("moves", "evolution_chain_id")
+
+
+class JsonFallbackStore:
+    """Lazily loaded, mtime-invalidated index over the dex record file."""
+
+    def __init__(self, path: str | None = None):
+        # None means whichever file get_source_path picks at load time.
+        self.path = path
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = []
+        self._by_id = {}
+        self._by_name = {}
+
+    def _ensure_loaded(self) -> None:
+        """(Re)loads the record file if it changed since the last load."""
+        path = self.path or get_source_path() or JSON_PATH
+        version = (path, os.stat(path).st_mtime_ns)
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            entries = sorted(iter_records(path), key=lambda p: p["id"])
+            self._by_id = {str(p["id"]): p for p in entries}
+            self._by_name = {p["name"].lower(): p for p in entries}
+            self._entries = entries
+            self._version = version
+
+    def get_all_pokemon(self) -> list[dict]:
+        """Same contract as backend.get_all_pokemon. Raises if the file is unreadable."""
+        self._ensure_loaded()
+        return [{"id": p["id"], "name": p["name"]} for p in self._entries]
+
+    def get_entries(self) -> list[dict]:
+        """Every record, in id order. Raises if the file is unreadable."""
+        self._ensure_loaded()
+        return self._entries
+
+    def get_dex_entry(self, name_or_id) -> dict:
+        """Same contract as backend.get_dex_entry. Raises if the file is unreadable."""
+        self._ensure_loaded()
+        search_term = str(name_or_id).lower()
+        entry = self._by_id.get(search_term) or self._by_name.get(search_term)
+        if entry is None:
+            return {"error": f"Entry '{name_or_id}' not found in JSON fallback."}
+        # Art is served separately through get_art, as with the database.
+        return {key: value for key, value in entry.items() if key not in ART_FIELDS + LINK_FIELDS}
+
+    def get_art(self, name_or_id) -> str:
+        """Returns the inline art of a record, or an empty string."""
+        self._ensure_loaded()
+        search_term = str(name_or_id).lower()
+        entry = self._by_id.get(search_term) or self._by_name.get(search_term)
+        return (entry or {}).get("ascii_art") or ""
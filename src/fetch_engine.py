@@ -0,0 +1,169 @@
+"""
+Connection setup, adaptive concurrency and per-stage statistics for the
+PokeAPI fetcher.
+
+`AdaptiveLimiter` bounds how many requests are in flight and adjusts that
+bound with AIMD: it grows by one request per window of fast responses and
+halves on a 429, a 503, a transport error or a response slower than the
+latency target. A Retry-After header pauses all new requests until it has
+passed. `FetchStats` records latency per stage ("pokemon", "species", ...)
+for the end-of-run report.
+"""
+import asyncio
+import importlib.util
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]").
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30.0
+REQUEST_TIMEOUT = 20.0
+
+INITIAL_CONCURRENCY = 16
+MIN_CONCURRENCY = 2
+MAX_CONCURRENCY = 50
+# Responses slower than this count as congestion.
+LATENCY_TARGET = 1.5
+DECREASE_FACTOR = 0.5
+# Longest Retry-After that is honoured, in seconds.
+MAX_RETRY_AFTER = 60.0
+
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+def make_http_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """An AsyncClient with explicit pool limits, on HTTP/2 when h2 is installed."""
+    return httpx.AsyncClient(
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        http2=HTTP2_AVAILABLE,
+        transport=transport,
+    )
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """The response's Retry-After delay in seconds, if it has a usable one."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class AdaptiveLimiter:
+    """An AIMD concurrency limit for requests on one event loop."""
+
+    def __init__(
+        self,
+        initial: int = INITIAL_CONCURRENCY,
+        minimum: int = MIN_CONCURRENCY,
+        maximum: int = MAX_CONCURRENCY,
+        latency_target: float = LATENCY_TARGET,
+    ):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.peak = initial
+        self.decreases = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            async with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                await self._cond.wait()
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
+    def record(self, latency: float, throttled: bool = False, retry_after: float | None = None) -> None:
+        """Adjusts the limit after a response (or failure) that took `latency` seconds."""
+        now = time.monotonic()
+        if throttled or latency > self.latency_target:
+            # Responses already in flight report the same congestion; only
+            # back off once per latency target.
+            if now - self._last_decrease > self.latency_target:
+                self.limit = max(float(self.minimum), self.limit * DECREASE_FACTOR)
+                self._last_decrease = now
+                self.decreases += 1
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self.peak = max(self.peak, int(self.limit))
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+
+class FetchStats:
+    """Request latencies and outcomes per stage."""
+
+    def __init__(self):
+        self._latencies = defaultdict(list)
+        self._started = {}
+        self._finished = {}
+        self.cache_hits = Counter()
+        self.throttled = Counter()
+
+    def record(self, stage: str, started: float, finished: float, throttled: bool = False) -> None:
+        self._latencies[stage].append(finished - started)
+        self._started[stage] = min(self._started.get(stage, started), started)
+        self._finished[stage] = max(self._finished.get(stage, finished), finished)
+        if throttled:
+            self.throttled[stage] += 1
+
+    def hit(self, stage: str) -> None:
+        self.cache_hits[stage] += 1
+
+    def report(self) -> list[str]:
+        """One line per stage: requests, requests/s, p50 and p95 latency."""
+        lines = []
+        for stage in sorted(set(self._latencies) | set(self.cache_hits)):
+            latencies = sorted(self._latencies.get(stage, []))
+            line = f"  {stage:<18} {len(latencies):6} requests"
+            if latencies:
+                elapsed = max(self._finished[stage] - self._started[stage], 1e-9)
+                p50 = latencies[len(latencies) // 2]
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                line += f" {len(latencies) / elapsed:8.1f} req/s  p50 {p50 * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms"
+            if self.throttled[stage]:
+                line += f"  {self.throttled[stage]} throttled"
+            if self.cache_hits[stage]:
+                line += f"  ({self.cache_hits[stage]} cache hits)"
+            lines.append(line)
+        return lines
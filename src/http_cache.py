@@ -0,0 +1,160 @@
+"""
+On-disk HTTP response cache and retrying client for the PokeAPI fetcher.
+
+Responses are stored per URL (keyed by a hash of the URL) together with
+their ETag and Last-Modified headers. Entries younger than `fresh_for`
+seconds are served without touching the network; older ones are
+revalidated with a conditional request, and a 304 reuses the cached body.
+Transport errors, 429s and 5xx responses are retried with exponential
+backoff, or after the server's Retry-After delay when it sends one.
+Network requests go through an AdaptiveLimiter and are timed per stage.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+import httpx
+
+from .fetch_engine import AdaptiveLimiter, FetchStats, THROTTLE_STATUS_CODES, retry_after_seconds
+
+CACHE_DIR = os.path.join("data", "http_cache")
+
+# PokeAPI data changes rarely; skip even revalidation for a week.
+DEFAULT_FRESH_FOR = 7 * 24 * 60 * 60
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 0.5
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ResponseCache:
+    """Stores response bodies and validators on disk, one file pair per URL."""
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def get(self, url: str) -> tuple[dict, bytes] | None:
+        """Returns `(meta, body)` for a cached URL, or None."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, json.JSONDecodeError):
+            return None
+        return meta, body
+
+    def put(self, url: str, body: bytes, headers: httpx.Headers) -> None:
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "stored_at": time.time(),
+        }
+        # Body first, so a meta file always points at a complete body.
+        with open(body_path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(body_path + ".tmp", body_path)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def touch(self, url: str, meta: dict) -> None:
+        """Marks a cached entry as freshly revalidated."""
+        meta_path, _ = self._paths(url)
+        meta["stored_at"] = time.time()
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+
+class CachedClient:
+    """Wraps an `httpx.AsyncClient` with the response cache and retries."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        cache: ResponseCache,
+        fresh_for: float = DEFAULT_FRESH_FOR,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        limiter: AdaptiveLimiter | None = None,
+        stats: FetchStats | None = None,
+    ):
+        self.client = client
+        self.cache = cache
+        self.fresh_for = fresh_for
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = limiter or AdaptiveLimiter()
+        self.stats = stats or FetchStats()
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+
+    async def get_bytes(self, url: str, stage: str = "other") -> bytes:
+        """Returns the body for `url`, from cache where possible. `stage` labels the request in the stats."""
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            meta, body = cached
+            if time.time() - meta.get("stored_at", 0) < self.fresh_for:
+                self.hits += 1
+                self.stats.hit(stage)
+                return body
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = await self._get_with_retries(url, headers, stage)
+        if response.status_code == 304 and cached is not None:
+            self.revalidated += 1
+            self.cache.touch(url, meta)
+            return body
+
+        response.raise_for_status()
+        self.fetched += 1
+        self.cache.put(url, response.content, response.headers)
+        return response.content
+
+    async def get_json(self, url: str, stage: str = "other"):
+        return json.loads(await self.get_bytes(url, stage))
+
+    async def _get_with_retries(self, url: str, headers: dict, stage: str) -> httpx.Response:
+        # Every attempt either returns, raises, or sleeps and tries again;
+        # the last one always returns or raises.
+        attempt = 0
+        while True:
+            last_attempt = attempt >= self.retries
+            retry_after = None
+            async with self.limiter.slot():
+                started = time.monotonic()
+                try:
+                    response = await self.client.get(url, headers=headers)
+                except httpx.TransportError:
+                    self.limiter.record(time.monotonic() - started, throttled=True)
+                    if last_attempt:
+                        raise
+                else:
+                    finished = time.monotonic()
+                    throttled = response.status_code in THROTTLE_STATUS_CODES
+                    if throttled:
+                        retry_after = retry_after_seconds(response)
+                    self.limiter.record(finished - started, throttled, retry_after)
+                    self.stats.record(stage, started, finished, throttled)
+                    if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                        return response
+            await asyncio.sleep(retry_after if retry_after is not None else self.backoff * 2 ** attempt)
+            attempt += 1
@@ -4,11 +4,51 @@ Database Management Script
 This script provides commands to initialize or update the application's database.
 - 'create': Creates the database tables and populates them from the JSON data.
 - 'rebuild': Drops all existing tables and completely rebuilds the database.
+  Both also (re)build the materialized entry_view table.
+- 'update': Applies only the records that changed since the last load, keeping
+  favorites and search counts.
+- 'check': Applies pending schema migrations and verifies that entry lookups
+  are served by indexes (via EXPLAIN QUERY PLAN).
 """
 import sys
-from database import create_tables, populate_db_from_json, DB_PATH
 import os
 
+# Allow running as `uv run src/manage_db.py` from the project root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database import (  # noqa: E402
+    create_tables,
+    populate_db_from_json,
+    update_db_from_json,
+    get_db_connection,
+    DB_PATH,
+)
+from src.backend import (  # noqa: E402
+    ENTRY_VIEW_BY_ID_QUERY,
+    ENTRY_VIEW_BY_NAME_QUERY,
+    EVOLUTION_CHAIN_QUERY,
+    FAVORITES_QUERY,
+    ID_SET_CLAUSE,
+    LEARNSET_QUERY,
+    MOVE_LEARNERS_QUERY,
+    ORDERED_PAGE_QUERY,
+    ORDERS,
+)
+
+# Lookups that must never fall back to a full table scan.
+INDEXED_LOOKUPS = {
+    "entry by id": (ENTRY_VIEW_BY_ID_QUERY, (25,)),
+    "entry by name": (ENTRY_VIEW_BY_NAME_QUERY, ("pikachu",)),
+    "learnset": (LEARNSET_QUERY, (25,)),
+    "move learners": (MOVE_LEARNERS_QUERY, ("thunderbolt",)),
+    "evolution chain": (EVOLUTION_CHAIN_QUERY, (25, 25)),
+    "most viewed": (ORDERED_PAGE_QUERY.format(where="", order=ORDERS["views"]), (50, 0)),
+    "favorites first": (ORDERED_PAGE_QUERY.format(where="", order=ORDERS["favorites"]), (50, 0)),
+    "most viewed, filtered": (
+        ORDERED_PAGE_QUERY.format(where=ID_SET_CLAUSE, order=ORDERS["views"]), ("[25, 26]", 50, 0),
+    ),
+    "favorites": (FAVORITES_QUERY, ()),
+}
+
 def rebuild_database():
     """Drops existing tables and rebuilds the database from scratch."""
     if os.path.exists(DB_PATH):
@@ -19,9 +59,35 @@ def rebuild_database():
     populate_db_from_json()
     print("Database rebuild complete.")
 
+def explain_query_plan(conn, query: str, params: tuple) -> list[str]:
+    """Returns the detail lines of EXPLAIN QUERY PLAN for a query."""
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+
+def full_scans(plan: list[str]) -> list[str]:
+    """The plan lines that scan a whole table."""
+    # Walking an index in order (the list orders) is fine, and so is reading
+    # the id list passed in through json_each.
+    return [line for line in plan if line.startswith("SCAN") and " USING " not in line and "VIRTUAL TABLE" not in line]
+
+def check_query_plans() -> bool:
+    """Prints the plan of each indexed lookup and reports any full table scans."""
+    conn = get_db_connection()
+    ok = True
+    try:
+        for label, (query, params) in INDEXED_LOOKUPS.items():
+            plan = explain_query_plan(conn, query, params)
+            scans = full_scans(plan)
+            print(f"{label}: {'FAIL' if scans else 'ok'}")
+            for line in plan:
+                print(f"  {line}")
+            ok = ok and not scans
+    finally:
+        conn.close()
+    return ok
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: uv run src/manage_db.py [create|rebuild]")
+        print("Usage: uv run src/manage_db.py [create|rebuild|update|check]")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -34,9 +100,20 @@ def main():
             populate_db_from_json()
     elif command == "rebuild":
         rebuild_database()
+    elif command == "update":
+        if not os.path.exists(DB_PATH):
+            print("Database does not exist. Use 'create' first.")
+            sys.exit(1)
+        create_tables()
+        if update_db_from_json() is None:
+            sys.exit(1)
+    elif command == "check":
+        create_tables()
+        if not check_query_plans():
+            sys.exit(1)
     else:
         print(f"Unknown command: {command}")
-        print("Usage: uv run src/manage_db.py [create|rebuild]")
+        print("Usage: uv run src/manage_db.py [create|rebuild|update|check]")
         sys.exit(1)
 
 if __name__ == "__main__":
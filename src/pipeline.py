@@ -0,0 +1,53 @@
+"""
+The data pipeline as one coroutine: fetch from the PokeAPI, then populate the
+database, or update it in place if it already has data (e.g. seeded from the
+bundled snapshot, see src/seed.py). Used by data_pipeline.py and, in-process,
+by the setup screen.
+"""
+import os
+
+from .database import create_tables, has_pokemon, populate_db_from_json, update_db_from_json
+from .progress import Progress
+from .pull_data import main as fetch_api_data, NDJSON_PATH
+
+
+async def run_pipeline(
+    progress: Progress,
+    fetch: bool = True,
+    populate: bool = True,
+    output_path: str = NDJSON_PATH,
+    art_workers: int | None = None,
+) -> bool:
+    """
+    Runs the selected steps, reporting to `progress`. Returns whether all of
+    them succeeded; the database is populated even after an incomplete
+    fetch, from whatever record file is there: `output_path` if it exists,
+    else the usual source (see database.get_source_path).
+    """
+    ok = True
+    if fetch:
+        progress.log("Starting API data fetch. This may take a few moments...")
+        if await fetch_api_data(output_path, art_workers=art_workers, progress=progress):
+            progress.log(f"API data fetch complete. Data saved to {output_path}.")
+        else:
+            progress.log("API data fetch incomplete. Run the pipeline again to resume.")
+            ok = False
+
+    if populate:
+        progress.log("--- Starting Database Population ---")
+        progress.start("database")
+        create_tables()
+        source_path = output_path if os.path.exists(output_path) else None
+        if has_pokemon():
+            summary = update_db_from_json(source_path, progress=progress)
+            if summary is not None:
+                progress.update("database", done=sum(summary.values()))
+            result = summary
+        else:
+            result = populate_db_from_json(source_path, progress=progress)
+        progress.finish("database")
+        if result is None:
+            ok = False
+        else:
+            progress.log("--- Database Population Complete! ---")
+    return ok
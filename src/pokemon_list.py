@@ -0,0 +1,257 @@
+from typing import Callable
+
+from rich.segment import Segment
+from textual import events
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from .scheduler import RequestScheduler
+
+# Rows are fetched and kept in pages of this many rows.
+PAGE_SIZE = 50
+
+# Pages kept around the visible window, on each side.
+BUFFER_PAGES = 1
+
+ID_WIDTH = 6
+
+PageLoader = Callable[[int, int], list[dict]]
+
+
+class PokemonList(ScrollView, can_focus=True):
+    """
+    A scrolling list of Pokémon that only holds the rows around the visible
+    window. Rows come from a page loader, `load_page(offset, limit)`, which
+    runs on the request executor as pages scroll into view; pages that
+    scroll far out of view are dropped again.
+    """
+
+    BINDINGS = [
+        Binding("enter", "select_cursor", "Select", show=False),
+        Binding("up", "cursor_up", "Cursor up", show=False),
+        Binding("down", "cursor_down", "Cursor down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "scroll_home", "Home", show=False),
+        Binding("end", "scroll_end", "End", show=False),
+    ]
+
+    COMPONENT_CLASSES = {
+        "pokemon-list--header",
+        "pokemon-list--cursor",
+        "pokemon-list--placeholder",
+    }
+
+    DEFAULT_CSS = """
+    PokemonList {
+        background: $surface;
+        overflow-x: hidden;
+        & > .pokemon-list--header {
+            text-style: bold;
+            background: $panel;
+        }
+        & > .pokemon-list--cursor {
+            background: $block-cursor-blurred-background;
+        }
+        &:focus > .pokemon-list--cursor {
+            background: $block-cursor-background;
+            color: $block-cursor-foreground;
+            text-style: $block-cursor-text-style;
+        }
+        & > .pokemon-list--placeholder {
+            color: $text-muted;
+        }
+    }
+    """
+
+    cursor = reactive(0, always_update=True)
+
+    class Highlighted(Message):
+        """Posted when the row under the cursor changes and is loaded."""
+        def __init__(self, index: int, pokemon: dict) -> None:
+            super().__init__()
+            self.index = index
+            self.pokemon = pokemon
+
+    class Selected(Message):
+        """Posted when the row under the cursor is chosen."""
+        def __init__(self, index: int, pokemon: dict) -> None:
+            super().__init__()
+            self.index = index
+            self.pokemon = pokemon
+
+    def __init__(self, *, id: str | None = None, classes: str | None = None) -> None:
+        super().__init__(id=id, classes=classes)
+        self.total = 0
+        self._load_page = None
+        self._pages: dict[int, list[dict]] = {}
+        self._pending: set[int] = set()
+        self._announced = None
+        self.requests = RequestScheduler(self)
+
+    # --- Source ---
+
+    def set_source(self, total: int, load_page: PageLoader, first_page: list[dict] | None = None) -> None:
+        """
+        Shows `total` rows served by `load_page`. `first_page`, if given, is
+        used as page 0 so the top of the list paints without a fetch.
+        """
+        # Pages still loading for the old source are never delivered.
+        self.requests.cancel_all()
+        self.total = total
+        self._load_page = load_page
+        self._pages = {0: first_page} if first_page is not None else {}
+        self._pending = set()
+        self._announced = None
+        self.virtual_size = Size(0, total + 1)
+        self.scroll_to(y=0, animate=False)
+        self.cursor = 0
+        self.refresh()
+
+    def show_rows(self, rows: list[dict]) -> None:
+        """Shows a list that is already in memory."""
+        self.set_source(len(rows), lambda offset, limit: rows[offset:offset + limit], rows[:PAGE_SIZE])
+
+    def row_at(self, index: int) -> dict | None:
+        """Returns the row at `index` if its page is loaded, else None."""
+        if not 0 <= index < self.total:
+            return None
+        page = self._pages.get(index // PAGE_SIZE)
+        if page is None or index % PAGE_SIZE >= len(page):
+            return None
+        return page[index % PAGE_SIZE]
+
+    @property
+    def highlighted(self) -> dict | None:
+        return self.row_at(self.cursor)
+
+    @property
+    def loaded_rows(self) -> int:
+        return sum(len(page) for page in self._pages.values())
+
+    # --- Paging ---
+
+    def _window_pages(self) -> range:
+        first = int(self.scroll_y) // PAGE_SIZE
+        last = (int(self.scroll_y) + max(self.size.height, 1)) // PAGE_SIZE
+        return range(max(first - BUFFER_PAGES, 0), last + BUFFER_PAGES + 1)
+
+    def _ensure_window(self) -> None:
+        """Requests missing pages around the visible window and drops the rest."""
+        if self._load_page is None:
+            return
+        wanted = [page for page in self._window_pages() if page * PAGE_SIZE < self.total]
+        for page in list(self._pages):
+            if page not in wanted:
+                del self._pages[page]
+        for page in wanted:
+            if page not in self._pages and page not in self._pending:
+                self._pending.add(page)
+                self._request_page(self._load_page, page)
+
+    def _request_page(self, load_page: PageLoader, page: int) -> None:
+        self.requests.submit(
+            f"page:{page}",
+            lambda: load_page(page * PAGE_SIZE, PAGE_SIZE),
+            lambda rows: self._page_loaded(page, rows),
+        )
+
+    def _page_loaded(self, page: int, rows: list[dict]) -> None:
+        self._pending.discard(page)
+        if page not in self._window_pages():
+            return
+        self._pages[page] = rows
+        self.refresh()
+        self._announce()
+
+    def _announce(self) -> None:
+        """Posts Highlighted for the cursor row once it is loaded."""
+        pokemon = self.highlighted
+        if pokemon is not None and self._announced != self.cursor:
+            self._announced = self.cursor
+            self.post_message(self.Highlighted(self.cursor, pokemon))
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        self._ensure_window()
+
+    def on_resize(self, event: events.Resize) -> None:
+        self._ensure_window()
+
+    # --- Cursor ---
+
+    def validate_cursor(self, cursor: int) -> int:
+        return max(0, min(cursor, self.total - 1))
+
+    def watch_cursor(self, cursor: int) -> None:
+        visible = max(self.size.height - 1, 1)
+        if cursor < self.scroll_y:
+            self.scroll_to(y=cursor, animate=False)
+        elif cursor >= self.scroll_y + visible:
+            self.scroll_to(y=cursor - visible + 1, animate=False)
+        self._ensure_window()
+        self.refresh()
+        self._announce()
+
+    def action_cursor_up(self) -> None:
+        self.cursor -= 1
+
+    def action_cursor_down(self) -> None:
+        self.cursor += 1
+
+    def action_page_up(self) -> None:
+        self.cursor -= max(self.size.height - 1, 1)
+
+    def action_page_down(self) -> None:
+        self.cursor += max(self.size.height - 1, 1)
+
+    def action_scroll_home(self) -> None:
+        self.cursor = 0
+
+    def action_scroll_end(self) -> None:
+        self.cursor = self.total - 1
+
+    def action_select_cursor(self) -> None:
+        pokemon = self.highlighted
+        if pokemon is not None:
+            self.post_message(self.Selected(self.cursor, pokemon))
+
+    def on_click(self, event: events.Click) -> None:
+        if event.y == 0:
+            return
+        index = int(self.scroll_y) + event.y - 1
+        if index == self.cursor:
+            self.action_select_cursor()
+        elif index < self.total:
+            self.cursor = index
+
+    # --- Rendering ---
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        if y == 0:
+            style = self.get_component_rich_style("pokemon-list--header")
+            return Strip([Segment(self._format("ID", "Name", width), style)], width)
+
+        index = int(self.scroll_y) + y - 1
+        if index >= self.total:
+            return Strip.blank(width, self.rich_style)
+
+        pokemon = self.row_at(index)
+        if pokemon is None:
+            style = self.get_component_rich_style("pokemon-list--placeholder")
+            text = self._format("", "…", width)
+        else:
+            style = self.rich_style
+            text = self._format(str(pokemon["id"]), pokemon["name"].capitalize(), width)
+        if index == self.cursor:
+            style += self.get_component_rich_style("pokemon-list--cursor")
+        return Strip([Segment(text, style)], width)
+
+    @staticmethod
+    def _format(pokemon_id: str, name: str, width: int) -> str:
+        return f"{pokemon_id:>{ID_WIDTH - 2}}  {name}"[:width].ljust(width)
@@ -0,0 +1,121 @@
+"""
+Structured progress events for the data pipeline.
+
+The pipeline reports through a `Progress` object, which turns phase starts,
+counter updates, phase ends and log lines into event dicts and hands them to
+a sink: the console (`print_sink`), JSON lines on stdout for a parent
+process (`json_sink`), or any callable for in-process use. Counter updates
+are rate-limited, so a sink sees at most one per phase per
+PROGRESS_INTERVAL.
+
+Events all have "event" and "time"; the rest depends on the kind:
+- phase_start: phase, total
+- progress:    phase, done, total, rate (items/s), eta (seconds or None)
+- phase_end:   phase, done, total, seconds, rate
+- log:         message
+"""
+import json
+import sys
+import time
+
+PROGRESS_INTERVAL = 0.1
+
+# The pipeline's phases, in the order they run (see src/pipeline.py).
+PHASES = ("pokemon", "moves", "evolution_chains", "database")
+
+EVENT_PREFIX = '{"event":'
+
+
+class Progress:
+    """Tracks pipeline phases and emits their events to `sink`."""
+
+    def __init__(self, sink=None):
+        self.sink = sink or print_sink
+        self._phases = {}
+
+    def _emit(self, kind: str, **fields) -> None:
+        self.sink({"event": kind, "time": time.time(), **fields})
+
+    def start(self, phase: str, total: int | None = None) -> None:
+        self._phases[phase] = {"started": time.monotonic(), "done": 0, "total": total, "emitted": 0.0}
+        self._emit("phase_start", phase=phase, total=total)
+
+    def update(self, phase: str, done: int | None = None, advance: int = 0, total: int | None = None) -> None:
+        """Sets (or advances) a phase's counter, emitting at most every PROGRESS_INTERVAL."""
+        state = self._phases.get(phase)
+        if state is None:
+            self.start(phase, total)
+            state = self._phases[phase]
+        state["done"] = (done if done is not None else state["done"]) + advance
+        if total is not None:
+            state["total"] = total
+        now = time.monotonic()
+        finished = state["total"] is not None and state["done"] >= state["total"]
+        if now - state["emitted"] < PROGRESS_INTERVAL and not finished:
+            return
+        state["emitted"] = now
+        rate = state["done"] / max(now - state["started"], 1e-9)
+        eta = None
+        if state["total"] is not None and rate > 0:
+            eta = max(state["total"] - state["done"], 0) / rate
+        self._emit("progress", phase=phase, done=state["done"], total=state["total"], rate=rate, eta=eta)
+
+    def finish(self, phase: str) -> None:
+        state = self._phases.pop(phase, None)
+        if state is None:
+            return
+        seconds = time.monotonic() - state["started"]
+        self._emit(
+            "phase_end", phase=phase, done=state["done"], total=state["total"],
+            seconds=seconds, rate=state["done"] / max(seconds, 1e-9),
+        )
+
+    def log(self, message: str) -> None:
+        self._emit("log", message=message)
+
+
+def format_status(event: dict) -> str:
+    """A phase event's counters, rate and ETA or duration, without the phase name."""
+    kind = event["event"]
+    if kind == "phase_start":
+        return "started"
+    if kind == "progress":
+        total = f"/{event['total']}" if event.get("total") is not None else ""
+        eta = f", ETA {event['eta']:.0f}s" if event.get("eta") is not None else ""
+        return f"{event['done']}{total} ({event['rate']:.1f}/s{eta})"
+    if kind == "phase_end":
+        return f"{event['done']} done in {event['seconds']:.1f}s ({event['rate']:.1f}/s)"
+    return ""
+
+
+def format_event(event: dict) -> str:
+    """A one-line, human readable form of an event."""
+    if event["event"] == "log":
+        return event.get("message", "")
+    return f"{event['phase']}: {format_status(event)}"
+
+
+def print_sink(event: dict) -> None:
+    """Console output: progress rewrites one line, everything else is printed."""
+    if event["event"] == "progress":
+        print("\r" + format_event(event), end="", flush=True)
+    elif event["event"] == "phase_end":
+        print("\r" + format_event(event))
+    elif event["event"] == "log":
+        print(event["message"])
+
+
+def json_sink(event: dict) -> None:
+    """One JSON object per line on stdout, for a parent process to parse."""
+    sys.stdout.write(json.dumps(event, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def parse_event(line: str) -> dict | None:
+    """The event on a line written by json_sink, or None for other output."""
+    if not line.startswith(EVENT_PREFIX):
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
@@ -1,31 +1,222 @@
 """
 This module is responsible for fetching all Pokémon data directly from the PokeAPI.
 
-It is a self-contained script that should not depend on the application's
-internal backend, as it is used to generate the initial data source.
+It generates the initial data source, so it does not depend on the
+application's backend, only on the fetch, cache, art and record helpers
+next to it. It is normally run by data_pipeline.py; as it is part of the
+src package, run it on its own with `python -m src.pull_data`, not as a
+file path.
 """
 import asyncio
-import json
 import os
 import httpx
-import io
-import ascii_magic
-from ascii_magic.constants import Front, Back
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from .art_store import ART_COLUMNS, render_ascii_art, save_sprite
+from .fetch_engine import HTTP2_AVAILABLE, AdaptiveLimiter, FetchStats, make_http_client
+from .http_cache import CachedClient, ResponseCache, CACHE_DIR
+from .progress import Progress
+from .records import (
+    EVOLUTION_CHAINS_NAME,
+    MOVES_NAME,
+    RecordWriter,
+    iter_records,
+    resource_path_for,
+)
 
 BASE_URL = "https://pokeapi.co/api/v2"
-JSON_PATH = os.path.join("data", "dex.json")
+NDJSON_PATH = os.path.join("data", "dex.ndjson")
+
+# Passes over entries that still failed after the client's own retries.
+RETRY_ROUNDS = 2
+RETRY_ROUND_DELAY = 5.0
+
+# Pokémon being fetched at once. How many requests are actually in flight
+# is up to the client's AdaptiveLimiter.
+MAX_POKEMON_IN_PROGRESS = 100
+
+
+def resource_key_from_url(url: str) -> str:
+    """The last path segment of a PokeAPI resource URL: an id or a name."""
+    return url.rstrip("/").rsplit("/", 1)[1]
+
+
+def move_url(name: str) -> str:
+    return f"{BASE_URL}/move/{name}/"
+
+
+def evolution_chain_url(chain_id: int) -> str:
+    return f"{BASE_URL}/evolution-chain/{chain_id}/"
+
+
+def parse_learnset(data: dict) -> list[dict]:
+    """
+    The moves a Pokémon learns, one entry per learn method, as of the most
+    recent version group that lists the move.
+    """
+    moves = []
+    for entry in data.get("moves", []):
+        latest = {}
+        for detail in entry["version_group_details"]:
+            method = detail["move_learn_method"]["name"]
+            version = int(resource_key_from_url(detail["version_group"]["url"]))
+            if method not in latest or version > latest[method][0]:
+                latest[method] = (version, detail["level_learned_at"])
+        for method, (_, level) in sorted(latest.items()):
+            moves.append({"move": entry["move"]["name"], "method": method, "level": level})
+    return moves
+
+
+def parse_move(data: dict) -> dict:
+    """A move record from a PokeAPI /move response."""
+    effect = ""
+    for entry in data.get("effect_entries", []):
+        if entry["language"]["name"] == "en":
+            effect = entry["short_effect"].replace("$effect_chance", str(data.get("effect_chance")))
+            break
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "type": data["type"]["name"],
+        "power": data["power"],
+        "pp": data["pp"],
+        "accuracy": data["accuracy"],
+        "effect": effect,
+    }
+
+
+def parse_evolution_chain(data: dict) -> dict:
+    """
+    An evolution chain record from a PokeAPI /evolution-chain response: one
+    link per evolution, with the trigger and its non-empty conditions.
+    """
+    links = []
+
+    def walk(node: dict) -> None:
+        for child in node["evolves_to"]:
+            details = child["evolution_details"][0] if child["evolution_details"] else {}
+            links.append({
+                "from_id": int(resource_key_from_url(node["species"]["url"])),
+                "to_id": int(resource_key_from_url(child["species"]["url"])),
+                "trigger": (details.get("trigger") or {}).get("name"),
+                "details": {
+                    key: value["name"] if isinstance(value, dict) else value
+                    for key, value in details.items()
+                    if key != "trigger" and value not in (None, False, "")
+                },
+            })
+            walk(child)
+
+    walk(data["chain"])
+    return {"id": data["id"], "links": links}
+
+
+class ResourcePlanner:
+    """
+    Fetches a kind of shared resource (moves, evolution chains) that many
+    Pokémon reference. Each resource is requested once however many Pokémon
+    want it, through the same client and limiter as the Pokémon requests,
+    and written to `writer` as soon as it arrives. `done` holds the keys
+    (see resource_key_from_url) already written by an interrupted run.
+    Counts are reported to `progress` under `phase`.
+    """
+
+    def __init__(
+        self,
+        client: CachedClient,
+        stage: str,
+        parse,
+        writer: RecordWriter,
+        done: set[str],
+        progress: Progress,
+        phase: str,
+    ):
+        self.client = client
+        self.stage = stage
+        self.parse = parse
+        self.writer = writer
+        self.progress = progress
+        self.phase = phase
+        self._already_done = len(done)
+        self.wanted = 0
+        self.failed = []
+        self._seen = set(done)
+        self._tasks = []
+
+    def want(self, url: str) -> None:
+        """Schedules `url` unless it was already fetched or scheduled."""
+        self.wanted += 1
+        key = resource_key_from_url(url)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self._tasks.append(asyncio.create_task(self._fetch(url)))
+        self.progress.update(self.phase, total=self.unique)
+
+    async def _fetch(self, url: str) -> None:
+        try:
+            data = await self.client.get_json(url, self.stage)
+            self.writer.write(self.parse(data))
+            self.progress.update(self.phase, done=self._already_done + self.writer.count, total=self.unique)
+        except Exception as e:
+            self.progress.log(f"Could not fetch {url}: {type(e).__name__} - {e}")
+            self._seen.discard(resource_key_from_url(url))
+            self.failed.append(url)
+
+    async def drain(self) -> None:
+        """Waits for everything scheduled so far."""
+        while self._tasks:
+            tasks, self._tasks = self._tasks, []
+            await asyncio.gather(*tasks)
+
+    def retry_failed(self) -> None:
+        failed, self.failed = self.failed, []
+        for url in failed:
+            self.want(url)
+
+    @property
+    def unique(self) -> int:
+        return len(self._seen)
 
-async def get_pokemon_details(client: httpx.AsyncClient, pokemon_url: str) -> dict | None:
-    """Fetches detailed information for a single Pokémon, including ASCII art."""
+
+def want_shared_resources(record: dict, planners: dict[str, ResourcePlanner]) -> None:
+    """Hands the moves and evolution chain a Pokémon record references to the planners."""
+    for name in sorted({move["move"] for move in record.get("moves", [])}):
+        planners[MOVES_NAME].want(move_url(name))
+    if record.get("evolution_chain_id"):
+        planners[EVOLUTION_CHAINS_NAME].want(evolution_chain_url(record["evolution_chain_id"]))
+
+async def get_pokemon_details(
+    client: CachedClient,
+    pokemon_url: str,
+    sem: asyncio.Semaphore,
+    art_pool: Executor,
+    planners: dict[str, ResourcePlanner] | None = None,
+    progress: Progress | None = None,
+) -> dict | None:
+    """
+    Fetches detailed information for a single Pokémon, including ASCII art
+    and its learnset. The moves and evolution chain it references are handed
+    to `planners`, which fetch each of them once. Errors are logged to
+    `progress` (printed without one).
+
+    Only the network requests hold the semaphore; the art is rendered in
+    `art_pool` afterwards, so downloads keep flowing while art renders. The
+    species and sprite requests both only need the /pokemon response, so
+    they are made concurrently.
+    """
+    log = print if progress is None else progress.log
     try:
-        response = await client.get(pokemon_url)
-        response.raise_for_status()
-        data = response.json()
+        async with sem:
+            data = await client.get_json(pokemon_url, "pokemon")
 
-        species_url = data["species"]["url"]
-        species_response = await client.get(species_url)
-        species_response.raise_for_status()
-        species_data = species_response.json()
+            sprite_url = data.get("sprites", {}).get("other", {}).get("official-artwork", {}).get("front_default")
+            if not sprite_url:
+                sprite_url = data.get("sprites", {}).get("front_default")
+            species_data, sprite_bytes = await asyncio.gather(
+                client.get_json(data["species"]["url"], "species"),
+                get_sprite(client, sprite_url, data["name"], progress),
+            )
 
         flavor_text = ""
         for entry in species_data["flavor_text_entries"]:
@@ -34,26 +225,21 @@ async def get_pokemon_details(client: httpx.AsyncClient, pokemon_url: str) -> di
                 break
         
         # --- ASCII Art Generation ---
+        # render_ascii_art is CPU-bound, so it runs in the art process pool
+        # rather than on the event loop.
         ascii_art = "Art not available."
-        sprite_url = data.get("sprites", {}).get("other", {}).get("official-artwork", {}).get("front_default")
-        if not sprite_url:
-            sprite_url = data.get("sprites", {}).get("front_default")
-
-        if sprite_url:
+        sprite_key = None
+        if sprite_bytes:
+            sprite_key = save_sprite(sprite_bytes)
             try:
-                sprite_response = await client.get(sprite_url)
-                sprite_response.raise_for_status()
-                
-                # Generate ASCII art
-                image_data = io.BytesIO(sprite_response.content)
-                ascii_art_obj = ascii_magic.AsciiArt.from_image(image_data)
-                ascii_art = ascii_art_obj.to_ascii(columns=30, front=Front.WHITE, back=Back.BLACK)
-
+                loop = asyncio.get_running_loop()
+                ascii_art = await loop.run_in_executor(art_pool, render_ascii_art, sprite_bytes, ART_COLUMNS)
             except Exception as art_exc:
-                print(f"\nCould not generate art for {data['name']}: {type(art_exc).__name__} - {art_exc}")
+                log(f"Could not generate art for {data['name']}: {type(art_exc).__name__} - {art_exc}")
         # --- End ASCII Art Generation ---
 
-        return {
+        chain_url = (species_data.get("evolution_chain") or {}).get("url")
+        record = {
             "name": data["name"],
             "id": data["id"],
             "types": [t["type"]["name"] for t in data["types"]],
@@ -63,55 +249,211 @@ async def get_pokemon_details(client: httpx.AsyncClient, pokemon_url: str) -> di
             "stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
             "flavor_text": flavor_text,
             "ascii_art": ascii_art,
+            "art_columns": ART_COLUMNS,
+            "sprite_hash": sprite_key,
+            "moves": parse_learnset(data),
+            "evolution_chain_id": int(resource_key_from_url(chain_url)) if chain_url else None,
         }
+        if planners is not None:
+            want_shared_resources(record, planners)
+        return record
     except httpx.HTTPStatusError as e:
-        print(f"Error fetching {pokemon_url}: {e.response.status_code}")
+        log(f"Error fetching {pokemon_url}: {e.response.status_code}")
         return None
     except Exception as e:
-        print(f"An unexpected error for {pokemon_url}: {type(e).__name__} - {e}")
+        log(f"An unexpected error for {pokemon_url}: {type(e).__name__} - {e}")
         return None
 
-async def main():
+async def get_sprite(
+    client: CachedClient, sprite_url: str | None, name: str, progress: Progress | None = None
+) -> bytes | None:
+    """The sprite image, or None if there is none or it could not be fetched (logged to `progress`)."""
+    if not sprite_url:
+        return None
+    try:
+        return await client.get_bytes(sprite_url, "sprite")
+    except httpx.HTTPError as sprite_exc:
+        log = print if progress is None else progress.log
+        log(f"Could not fetch sprite for {name}: {type(sprite_exc).__name__} - {sprite_exc}")
+        return None
+
+def pokemon_id_from_url(url: str) -> int:
+    """Extracts the id from a PokeAPI resource URL such as .../pokemon/25/."""
+    return int(url.rstrip("/").rsplit("/", 1)[1])
+
+def checkpoint_path_for(output_path: str) -> str:
+    """The in-progress file for `output_path`, keeping a `.gz` suffix last."""
+    if output_path.endswith(".gz"):
+        return output_path[:-3] + ".partial.gz"
+    return output_path + ".partial"
+
+def iter_intact_records(path: str):
+    """Yields records from `path`, stopping quietly at the first unreadable one."""
+    try:
+        yield from iter_records(path)
+    except (ValueError, EOFError, OSError):
+        return
+
+def read_checkpoint(checkpoint_path: str, key: str = "id") -> set:
+    """Returns the `key` of every record already written by an interrupted run."""
+    if not os.path.exists(checkpoint_path):
+        return set()
+    try:
+        return {record[key] for record in iter_records(checkpoint_path)}
+    except (ValueError, EOFError, OSError):
+        pass
+
+    # A run killed mid-write can leave a torn tail. Rewrite the file with
+    # the intact records only; anything after the tear is fetched again.
+    intact = list(iter_intact_records(checkpoint_path))
+    with RecordWriter(checkpoint_path) as writer:
+        for record in intact:
+            writer.write(record)
+    return {record[key] for record in intact}
+
+async def main(
+    output_path: str = NDJSON_PATH,
+    cache_dir: str = CACHE_DIR,
+    transport: httpx.AsyncBaseTransport | None = None,
+    art_workers: int | None = None,
+    progress: Progress | None = None,
+) -> bool:
     """
-    Main function to fetch all data, process it, and save to a JSON file.
+    Main function to fetch all data, process it, and stream it to an NDJSON
+    file as results arrive. A `.gz` output path writes it gzip compressed.
+    Moves and evolution chains go to their own record files next to it (see
+    resource_path_for), each fetched once however many Pokémon share it.
+
+    Records are appended to `.partial` files next to the outputs, which
+    double as the checkpoint: an interrupted run picks up where it stopped. Responses are
+    cached on disk, so re-runs barely touch the network. The partial files
+    replace the outputs once everything has been fetched. Returns whether
+    that happened.
+
+    Requests go through one pooled client (HTTP/2 when h2 is installed)
+    whose concurrency adapts to latency and 429s (see fetch_engine).
+    Requests per second and latency percentiles per stage are printed at
+    the end.
+
+    Art is rendered in a process pool of `art_workers` processes (default:
+    one per CPU). `transport` lets tests run against a mocked or local
+    transport. Progress is reported as events to `progress` (by default,
+    printed to the console).
     """
-    print("Fetching master Pokémon list...")
-    sem = asyncio.Semaphore(50)  # Limit to 50 concurrent requests
+    progress = progress or Progress()
+    progress.log("Fetching master Pokémon list...")
+    sem = asyncio.Semaphore(MAX_POKEMON_IN_PROGRESS)
 
-    async def fetch_with_semaphore(client: httpx.AsyncClient, url: str):
-        async with sem:
-            return await get_pokemon_details(client, url)
+    async def fetch(client: CachedClient, url: str, art_pool: Executor, planners: dict):
+        return url, await get_pokemon_details(client, url, sem, art_pool, planners, progress)
 
+    checkpoint_path = checkpoint_path_for(output_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    done = read_checkpoint(checkpoint_path)
+    if done:
+        progress.log(f"Resuming: {len(done)} entries already fetched.")
+
+    resource_paths = {name: resource_path_for(output_path, name) for name in (MOVES_NAME, EVOLUTION_CHAINS_NAME)}
+    resource_done = {
+        MOVES_NAME: read_checkpoint(checkpoint_path_for(resource_paths[MOVES_NAME]), key="name"),
+        EVOLUTION_CHAINS_NAME: {
+            str(chain_id) for chain_id in read_checkpoint(checkpoint_path_for(resource_paths[EVOLUTION_CHAINS_NAME]))
+        },
+    }
+    parsers = {MOVES_NAME: parse_move, EVOLUTION_CHAINS_NAME: parse_evolution_chain}
+    stages = {MOVES_NAME: "move", EVOLUTION_CHAINS_NAME: "evolution_chain"}
+
+    art_pool = ProcessPoolExecutor(max_workers=art_workers)
+    resource_writers = {}
+    planners = {}
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            response = await client.get(f"{BASE_URL}/pokemon?limit=1025")
-            response.raise_for_status()
-            pokemon_list = response.json()["results"]
-
-            tasks = [fetch_with_semaphore(client, p["url"]) for p in pokemon_list]
-            
-            all_pokemon_data = []
-            for i, task in enumerate(asyncio.as_completed(tasks)):
-                result = await task
-                if result:
-                    all_pokemon_data.append(result)
-                print(f"Processed Pokémon ({len(all_pokemon_data)}/{len(pokemon_list)})...", end="\r")
+        async with make_http_client(transport) as http_client:
+            limiter = AdaptiveLimiter()
+            stats = FetchStats()
+            client = CachedClient(http_client, ResponseCache(cache_dir), limiter=limiter, stats=stats)
+            for name, path in resource_paths.items():
+                resource_writers[name] = RecordWriter(checkpoint_path_for(path), append=True)
+                planners[name] = ResourcePlanner(
+                    client, stages[name], parsers[name], resource_writers[name], resource_done[name], progress, name,
+                )
+            # Entries fetched by an interrupted run still need their moves
+            # and chains; the planners skip whatever was already written.
+            if done:
+                for record in iter_intact_records(checkpoint_path):
+                    want_shared_resources(record, planners)
+
+            pokemon_list = (await client.get_json(f"{BASE_URL}/pokemon?limit=1025", "list"))["results"]
+            pending = [p["url"] for p in pokemon_list if pokemon_id_from_url(p["url"]) not in done]
+            progress.start("pokemon", total=len(pokemon_list))
+            progress.update("pokemon", done=len(done))
+
+            # Records are written as they complete, in completion order; the
+            # DB loader does not depend on ordering.
+            with RecordWriter(checkpoint_path, append=True) as writer:
+                for round_number in range(RETRY_ROUNDS + 1):
+                    if round_number:
+                        failed_resources = sum(len(planner.failed) for planner in planners.values())
+                        progress.log(
+                            f"Retrying {len(pending)} failed entries and {failed_resources} shared "
+                            f"resources (round {round_number}/{RETRY_ROUNDS})..."
+                        )
+                        await asyncio.sleep(RETRY_ROUND_DELAY * round_number)
+                        for planner in planners.values():
+                            planner.retry_failed()
+                    failed = []
+                    tasks = [fetch(client, url, art_pool, planners) for url in pending]
+                    for task in asyncio.as_completed(tasks):
+                        url, result = await task
+                        if result:
+                            writer.write(result)
+                        else:
+                            failed.append(url)
+                        progress.update("pokemon", done=len(done) + writer.count)
+                    for planner in planners.values():
+                        await planner.drain()
+                    pending = failed
+                    if not pending and not any(planner.failed for planner in planners.values()):
+                        break
+
+            for phase in ("pokemon", *planners):
+                progress.finish(phase)
+            progress.log(
+                f"HTTP cache: {client.hits} hits, {client.revalidated} revalidated, "
+                f"{client.fetched} downloaded."
+            )
+            for name, planner in planners.items():
+                progress.log(f"Shared {name}: {planner.unique} unique of {planner.wanted} references.")
+            progress.log(
+                f"Requests ({'HTTP/2' if HTTP2_AVAILABLE else 'HTTP/1.1'}): concurrency peaked at "
+                f"{limiter.peak}, ended at {int(limiter.limit)}, backed off {limiter.decreases} times."
+            )
+            for line in stats.report():
+                progress.log(line)
 
     except httpx.HTTPStatusError as e:
-        print(f"Failed to fetch master list: {e}")
-        return
+        progress.log(f"Failed to fetch master list: {e}")
+        return False
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return
+        progress.log(f"An unexpected error occurred: {e}")
+        return False
+    finally:
+        art_pool.shutdown(cancel_futures=True)
+        for resource_writer in resource_writers.values():
+            resource_writer.close()
 
-    # Sort data by ID before saving
-    all_pokemon_data.sort(key=lambda p: p["id"])
+    failed_resources = [url for planner in planners.values() for url in planner.failed]
+    if pending or failed_resources:
+        progress.log(f"{len(pending) + len(failed_resources)} requests still failing; re-run to resume:")
+        for url in pending + failed_resources:
+            progress.log(f"  {url}")
+        return False
 
-    os.makedirs(os.path.dirname(JSON_PATH), exist_ok=True)
-    print(f"\nSaving {len(all_pokemon_data)} entries to {JSON_PATH}...")
-    with open(JSON_PATH, "w") as f:
-        json.dump(all_pokemon_data, f, indent=2)
-    print("Done.")
+    os.replace(checkpoint_path, output_path)
+    for path in resource_paths.values():
+        os.replace(checkpoint_path_for(path), path)
+    progress.log(f"Saved {len(done) + writer.count} entries to {output_path}.")
+    progress.log("Done.")
+    return True
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
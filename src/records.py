@@ -0,0 +1,132 @@
+"""
+Streaming reader/writer for dex record files.
+
+Records are stored one JSON object per line (NDJSON), optionally gzip
+compressed when the file name ends in `.gz`. Writers append and flush as
+records arrive; readers yield one record at a time, so neither side holds
+the whole dataset in memory. The original `dex.json` array format can still
+be read, and is parsed incrementally as well.
+"""
+import gzip
+import json
+import os
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Shared resources (moves, evolution chains) are written to their own record
+# files next to the Pokémon records, under these names.
+MOVES_NAME = "moves"
+EVOLUTION_CHAINS_NAME = "evolution_chains"
+
+
+def resource_path_for(path: str, name: str) -> str:
+    """
+    The record file for the shared resource `name` next to the Pokémon
+    record file `path`, compressed if `path` is: data/dex.ndjson.gz gives
+    data/moves.ndjson.gz.
+    """
+    suffix = ".ndjson.gz" if path.endswith(".gz") else ".ndjson"
+    return os.path.join(os.path.dirname(path), name + suffix)
+
+
+def _open_text(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _iter_json_array(f):
+    """Yields the elements of a top-level JSON array without loading it whole."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+    while True:
+        # Skip whitespace and separators between elements.
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != "[":
+                raise json.JSONDecodeError("Expected a JSON array", buffer, position)
+            started = True
+            position += 1
+            continue
+        if started and position < len(buffer) and buffer[position] == "]":
+            return
+        if position < len(buffer):
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Only a delimiter after it shows the element is whole: a
+                # number cut off by the chunk ("12" of "123") still parses.
+                if eof or (end < len(buffer) and buffer[end] in " \t\r\n,]"):
+                    yield record
+                    position = end
+                    continue
+        if eof:
+            if not started or position >= len(buffer):
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, position)
+        chunk = f.read(READ_CHUNK_SIZE)
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+
+
+def iter_records(path: str):
+    """Yields records from an NDJSON(.gz) file or a JSON array file."""
+    with _open_text(path, "r") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        if not first:
+            return
+        if first == "[":
+            yield from _iter_json_array(_Prefixed(first, f))
+            return
+        line = first + f.readline()
+        while line:
+            if line.strip():
+                yield json.loads(line)
+            line = f.readline()
+
+
+class _Prefixed:
+    """A read()-able that replays already consumed text before the file."""
+
+    def __init__(self, prefix: str, f):
+        self._prefix = prefix
+        self._f = f
+
+    def read(self, size: int) -> str:
+        if self._prefix:
+            text, self._prefix = self._prefix, ""
+            return text + self._f.read(max(size - len(text), 0))
+        return self._f.read(size)
+
+
+class RecordWriter:
+    """Appends records to an NDJSON(.gz) file, one compact line per record."""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.count = 0
+        self._f = _open_text(path, "a" if append else "w")
+
+    def write(self, record: dict) -> None:
+        self._f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+        self._f.write("\n")
+        self._f.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,120 @@
+"""
+Background requests for screens: debounced, run on one shared executor, and
+dropped once a newer request on the same channel has been made.
+"""
+import asyncio
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEDULER_WORKERS = 2
+
+# One executor for every scheduler in the process, created on first use.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=SCHEDULER_WORKERS, thread_name_prefix="dex-request")
+        return _executor
+
+
+def shutdown_executor() -> None:
+    """Stops the shared executor, dropping queued work. Called on app exit."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RequestScheduler:
+    """
+    Runs blocking work off the UI thread for a Textual screen or widget
+    (`owner`), on the shared executor.
+
+    Requests are made per channel ("list", "entry", ...). Each new request on
+    a channel supersedes the previous one: a pending debounce is cancelled,
+    queued work that has not started is skipped, and results that arrive
+    late are never delivered. Create it, `submit` to it and receive `done`
+    callbacks on the UI thread; `work` runs on the executor. If `work`
+    raises, the error goes to `failed` instead, or is logged and shown as a
+    notification.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        # Results are handed back without blocking the executor thread.
+        self._loop = asyncio.get_running_loop()
+        self._generations: dict[str, int] = {}
+        self._timers = {}
+        self.stale_dropped = 0
+
+    def submit(self, channel: str, work, done, delay: float = 0.0, failed=None) -> None:
+        """
+        Runs `work()` after `delay` seconds, then `done(result)` if still
+        current, or `failed(error)` if `work` raised.
+        """
+        generation = self._generations.get(channel, 0) + 1
+        self._generations[channel] = generation
+        timer = self._timers.pop(channel, None)
+        if timer is not None:
+            timer.stop()
+        if failed is None:
+            failed = lambda error: self._report(channel, error)
+        if delay > 0:
+            self._timers[channel] = self.owner.set_timer(
+                delay, lambda: self._start(channel, generation, work, done, failed)
+            )
+        else:
+            self._start(channel, generation, work, done, failed)
+
+    def cancel(self, channel: str) -> None:
+        """Drops whatever is pending or running on `channel`."""
+        self._generations[channel] = self._generations.get(channel, 0) + 1
+        timer = self._timers.pop(channel, None)
+        if timer is not None:
+            timer.stop()
+
+    def is_current(self, channel: str, generation: int) -> bool:
+        return self._generations.get(channel) == generation
+
+    def _start(self, channel: str, generation: int, work, done, failed) -> None:
+        self._timers.pop(channel, None)
+        if not self.is_current(channel, generation):
+            return
+        get_executor().submit(self._run, channel, generation, work, done, failed)
+
+    def _run(self, channel: str, generation: int, work, done, failed) -> None:
+        if not self.is_current(channel, generation):
+            self.stale_dropped += 1
+            return
+        try:
+            result = work()
+        except Exception as e:
+            done, result = failed, e
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, channel, generation, done, result)
+        except RuntimeError:
+            # The app has already stopped.
+            pass
+
+    def _deliver(self, channel: str, generation: int, done, result) -> None:
+        if not self.is_current(channel, generation):
+            self.stale_dropped += 1
+            return
+        done(result)
+
+    def _report(self, channel: str, error: Exception) -> None:
+        """The default `failed` callback: logs the traceback and notifies the user."""
+        self.owner.log.error("".join(traceback.format_exception(error)))
+        self.owner.notify(
+            f"{type(error).__name__}: {error}", title=f"Loading {channel} failed", severity="error"
+        )
+
+    def cancel_all(self) -> None:
+        for channel in list(self._generations):
+            self.cancel(channel)
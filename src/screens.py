@@ -1,19 +1,47 @@
 from textual.app import ComposeResult
 from textual.screen import Screen
-from textual.widgets import Header, Footer, DataTable, Static, Input, Log
+from textual.widgets import Header, Footer, Static, Input, Label, Log, ProgressBar
 from textual.containers import Horizontal, Vertical
 from textual.binding import Binding
 from textual.widget import Widget
 from rich.text import Text
+from collections import deque
 import os
 
-from .backend import get_dex_entry, get_all_pokemon
+from .pokemon_list import PAGE_SIZE, PokemonList
+from .database import DB_PATH
+from .progress import PHASES, Progress, format_event, format_status, parse_event
+from .scheduler import RequestScheduler
+from .snapshot import read_list_snapshot
+from .stats_store import StatsQuery, parse_stats_query
+
+
+def _backend():
+    """
+    Imports the backend on first use. It is first needed by the list loader
+    worker, so its imports stay off the path to the first frame.
+    """
+    from . import backend
+    return backend
+
+# How many rows above and below the cursor to warm the entry cache for.
+PREFETCH_RADIUS = 8
+
+# Seconds to wait for typing or cursor movement to settle before loading.
+SEARCH_DEBOUNCE = 0.05
+HIGHLIGHT_DEBOUNCE = 0.08
+
+# List orders, cycled with "o", and their titles. See backend.get_pokemon_page.
+LIST_ORDERS = {"id": "By number", "views": "Most viewed", "favorites": "Favorites first"}
+
+# How often the setup screen redraws its progress bars and log.
+PROGRESS_REFRESH_HZ = 10
 
 # --- Helper Widgets ---
 
 class DexEntryInfo(Static):
     """A widget to display the detailed information of a Pokémon."""
-    def update_info(self, data: dict) -> None:
+    def update_info(self, data: dict, favorite: bool = False) -> None:
         if "error" in data:
             self.update(data["error"])
             return
@@ -22,7 +50,7 @@ class DexEntryInfo(Static):
         weight_kg = data.get('weight', 0) / 10.0
 
         info = (
-            f"[bold]{data.get('name', 'Unknown')} (#{data.get('id', 'N/A')})[/bold]\n\n"
+            f"[bold]{data.get('name', 'Unknown')} (#{data.get('id', 'N/A')})[/bold]{' ★' if favorite else ''}\n\n"
             f"Types: {', '.join(data.get('types', []))}\n"
             f"Abilities: {', '.join(data.get('abilities', []))}\n"
             f"Height: {height_m:.1f} m\n"
@@ -39,6 +67,18 @@ class DexEntryInfo(Static):
         self.update(info)
 
 
+class SimilarPokemon(Static):
+    """Lists the Pokémon nearest to the shown one by stats, types and abilities."""
+    def show(self, similar: list[dict]) -> None:
+        if not similar:
+            self.update("")
+            return
+        lines = ["[bold]Similar Pokémon:[/bold]"]
+        for pokemon in similar:
+            lines.append(f"- #{pokemon['id']} {pokemon['name'].capitalize()}")
+        self.update("\n".join(lines))
+
+
 class ArtDisplay(Static):
     """A widget that displays ASCII art of a Pokémon."""
     pass
@@ -51,109 +91,317 @@ class DexScreen(Screen):
     BINDINGS = [
         Binding("q", "quit", "Quit"),
         Binding("slash", "focus_search", "Search"),
+        Binding("a", "toggle_art", "Art"),
+        Binding("f", "toggle_favorite", "Favorite"),
+        Binding("o", "cycle_order", "Order"),
     ]
 
     def compose(self) -> ComposeResult:
         yield Header()
         yield Input(placeholder="Search by name or ID...", id="search")
+        yield Input(placeholder="Filter by stats, e.g. speed>100 type:fire sort:total", id="stats_filter")
         yield Horizontal(
-            DexEntryInfo(id="dex_entry"),
+            Vertical(DexEntryInfo(id="dex_entry"), SimilarPokemon(id="similar"), id="entry_column"),
             ArtDisplay(id="art_display"),
-            DataTable(id="pokemon_table"),
+            PokemonList(id="pokemon_table"),
         )
         yield Footer()
 
     def on_mount(self) -> None:
-        table = self.query_one(DataTable)
-        table.cursor_type = "row"
-        table.add_columns("ID", "Name")
-        self.run_worker(self.load_initial_data, exclusive=True, thread=True)
+        self._art_id = None
+        self._entry = None
+        self.order = "id"
+        self.requests = RequestScheduler(self)
+        # Paint the first page from the snapshot; the loader fetches the rest.
+        self.query_one(PokemonList).show_rows(read_list_snapshot())
+        self.requests.submit("list", self.load_initial_data, self.show_initial_list)
+
+    def on_unmount(self) -> None:
+        self.requests.cancel_all()
 
     def on_input_changed(self, message: Input.Changed) -> None:
-        if not hasattr(self, "all_pokemon") or not self.all_pokemon:
+        self.reload_list(delay=SEARCH_DEBOUNCE)
+
+    def reload_list(self, delay: float = 0.0) -> None:
+        """Reloads the list for the current search, stats filter and order."""
+        query = self.query_one("#search", Input).value
+        stats_filter = self.query_one("#stats_filter", Input)
+        try:
+            stats_query = parse_stats_query(stats_filter.value)
+        except ValueError as e:
+            # Keep showing the last list until the filter reads again.
+            stats_filter.add_class("-invalid")
+            stats_filter.border_subtitle = str(e)
+            self.requests.cancel("list")
             return
-
-        table = self.query_one(DataTable)
-        search_term = message.value.lower()
-
-        table.clear()
-        for pokemon in self.all_pokemon:
-            if search_term in pokemon["name"].lower() or search_term == str(pokemon["id"]):
-                table.add_row(pokemon["id"], pokemon["name"].capitalize())
+        stats_filter.remove_class("-invalid")
+        stats_filter.border_subtitle = None
+        order = self.order
+        self.requests.submit(
+            "list", lambda: self.load_rows(query, stats_query, order), self.show_list, delay=delay
+        )
 
     def on_input_submitted(self, message: Input.Submitted) -> None:
-        table = self.query_one(DataTable)
-        if table.row_count > 0:
-            table.move_cursor(row=0)
+        pokemon_list = self.query_one(PokemonList)
+        if pokemon_list.total > 0:
+            pokemon_list.cursor = 0
             self.action_select_pokemon()
 
-    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+    def on_pokemon_list_selected(self, event: PokemonList.Selected) -> None:
         self.action_select_pokemon()
 
+    def on_pokemon_list_highlighted(self, event: PokemonList.Highlighted) -> None:
+        # Cached entries render straight away while moving through the list;
+        # others load once the cursor has settled.
+        self.show_entry(event.pokemon["id"], delay=HIGHLIGHT_DEBOUNCE)
+
     def action_select_pokemon(self) -> None:
-        table = self.query_one(DataTable)
-        if table.row_count == 0:
+        pokemon = self.query_one(PokemonList).highlighted
+        if pokemon is not None:
+            searched = bool(self.query_one("#search", Input).value.strip())
+            _backend().record_view(pokemon["id"], searched=searched)
+            self.show_entry(pokemon["id"])
+
+    def action_toggle_favorite(self) -> None:
+        pokemon = self.query_one(PokemonList).highlighted
+        if pokemon is None:
             return
-
-        row_key = table.cursor_row
-        row_data = table.get_row_at(row_key)
-        if not row_data:
+        favorite = _backend().toggle_favorite(pokemon["id"])
+        if self._entry is not None and self._entry.get("id") == pokemon["id"]:
+            self.query_one(DexEntryInfo).update_info(self._entry, favorite)
+        self.notify(f"{pokemon['name'].capitalize()} {'added to' if favorite else 'removed from'} favorites.")
+
+    def action_cycle_order(self) -> None:
+        orders = list(LIST_ORDERS)
+        self.order = orders[(orders.index(self.order) + 1) % len(orders)]
+        self.query_one(PokemonList).border_title = LIST_ORDERS[self.order]
+        self.reload_list()
+
+    def show_entry(self, entry_id: int, delay: float = 0.0) -> None:
+        """Shows the entry for `entry_id`, superseding any entry still loading."""
+        self.prefetch_neighbours()
+        cached = _backend().get_cached_dex_entry(entry_id)
+        if cached is not None:
+            self.requests.cancel("entry")
+            self.update_dex_entry(cached)
             return
 
-        entry_id = row_data[0]
-        self.query_one(DexEntryInfo).update("Loading...")
-        
-        art_widget = self.query_one(ArtDisplay)
-        art_widget.update("")
-        art_widget.refresh()
-
-        self.run_worker(lambda: self.fetch_pokemon_data(entry_id), exclusive=True, thread=True)
+        if not delay:
+            # While the cursor is moving the previous entry stays up instead.
+            self.query_one(DexEntryInfo).update("Loading...")
+            art_widget = self.query_one(ArtDisplay)
+            art_widget.update("")
+            art_widget.refresh()
+
+        self.requests.submit("entry", lambda: _backend().get_dex_entry(entry_id), self.update_dex_entry, delay=delay)
+
+    def prefetch_neighbours(self) -> None:
+        """Warms the entry cache for the rows around the cursor, nearest first."""
+        pokemon_list = self.query_one(PokemonList)
+        cursor = pokemon_list.cursor
+        ids = []
+        for offset in range(PREFETCH_RADIUS + 1):
+            for index in {cursor + offset, cursor - offset}:
+                pokemon = pokemon_list.row_at(index)
+                if pokemon is not None:
+                    ids.append(pokemon["id"])
+        _backend().prefetch_dex_entries(ids)
 
     def action_focus_search(self) -> None:
         self.query_one("#search").focus()
 
-    # --- Worker Methods ---
-    def load_initial_data(self) -> None:
-        pokemon_list = get_all_pokemon()
-        self.app.call_from_thread(self.update_pokemon_table, pokemon_list)
-
-    def fetch_pokemon_data(self, pokemon_id: int) -> None:
-        data = get_dex_entry(pokemon_id)
-        self.app.call_from_thread(self.update_dex_entry, data)
+    def action_toggle_art(self) -> None:
+        art_widget = self.query_one(ArtDisplay)
+        art_widget.display = not art_widget.display
+        if art_widget.display:
+            self.show_art(self._art_id)
+
+    # --- Background Work (runs on the request executor) ---
+    def load_initial_data(self) -> tuple:
+        backend = _backend()
+        backend.prepare_database()
+        backend.get_favorites()
+        return self.load_rows("")
+
+    def load_rows(self, query: str, stats_query: StatsQuery | None = None, order: str = "id") -> tuple:
+        """
+        Counts the rows matching `query` (and `stats_query`, if given, whose
+        sort replaces `order`) and loads their first page in `order` (see
+        LIST_ORDERS). Returns `(total, first_page, load_page)`, or
+        `(None, ranked_rows, None)` when nothing matches the name search and
+        the closest names are offered instead.
+        """
+        backend = _backend()
+        if stats_query is not None:
+            selection = backend.query_stats(stats_query, query)
+            return len(selection), selection.page(0, PAGE_SIZE), selection.page
+        total = backend.count_pokemon(query)
+        if total == 0 and query.strip():
+            return None, backend.search_pokemon(query), None
+        load_page = lambda offset, limit: _backend().get_pokemon_page(offset, limit, query, order)
+        return total, load_page(0, PAGE_SIZE), load_page
+
+    def fill_missing_art(self) -> None:
+        """Fetches and renders the art a seeded database lacks (see src/seed.py)."""
+        from textual.worker import get_current_worker
+        from .seed import fill_missing_art
+
+        worker = get_current_worker()
+
+        def filled(pokemon_id: int) -> None:
+            if not worker.is_cancelled:
+                self.app.call_from_thread(self.on_art_filled, pokemon_id)
+
+        _, failed = fill_missing_art(filled, lambda: worker.is_cancelled)
+        if failed and not worker.is_cancelled:
+            self.app.call_from_thread(self.on_art_failed, failed)
 
     # --- UI Update Methods ---
-    def update_pokemon_table(self, pokemon_list: list[dict]) -> None:
-        self.all_pokemon = pokemon_list
-        table = self.query_one(DataTable)
-        for pokemon in self.all_pokemon:
-            table.add_row(pokemon["id"], pokemon["name"].capitalize())
+    def show_initial_list(self, result: tuple) -> None:
+        self.show_list(result)
+        self.run_worker(self.fill_missing_art, group="art_fill", exclusive=True, thread=True)
+
+    def on_art_filled(self, pokemon_id: int) -> None:
+        _backend().forget_art(pokemon_id)
+        if pokemon_id == self._art_id:
+            self.show_art(pokemon_id)
+
+    def on_art_failed(self, failed: int) -> None:
+        self.query_one(ArtDisplay).border_subtitle = f"No art for {failed} Pokémon (sprite fetch or render failed)"
+
+    def show_list(self, result: tuple) -> None:
+        total, rows, load_page = result
+        pokemon_list = self.query_one(PokemonList)
+        if total is None:
+            pokemon_list.show_rows(rows)
+            return
+        pokemon_list.set_source(total, load_page, rows)
 
     def update_dex_entry(self, data: dict) -> None:
-        self.query_one(DexEntryInfo).update_info(data)
-        
+        self._entry = data
+        favorite = "error" not in data and _backend().is_favorite(data.get("id", 0))
+        self.query_one(DexEntryInfo).update_info(data, favorite)
+        self.show_art(None if "error" in data else data.get("id"))
+        self.show_similar(None if "error" in data else data.get("id"))
+
+    def show_similar(self, pokemon_id: int | None) -> None:
+        """Shows the Pokémon most similar to `pokemon_id`, computing them off the UI thread."""
+        panel = self.query_one(SimilarPokemon)
+        if pokemon_id is None:
+            self.requests.cancel("similar")
+            panel.show([])
+            return
+
+        cached = _backend().get_cached_similar(pokemon_id)
+        if cached is not None:
+            self.requests.cancel("similar")
+            panel.show(cached)
+            return
+
+        self.requests.submit("similar", lambda: _backend().get_similar_pokemon(pokemon_id), panel.show)
+
+    def show_art(self, pokemon_id: int | None) -> None:
+        """Shows the art for `pokemon_id`, loading it only while the pane is visible."""
+        self._art_id = pokemon_id
         art_widget = self.query_one(ArtDisplay)
-        art_widget.update(Text(data.get("ascii_art", "")))
+        if pokemon_id is None or not art_widget.display:
+            art_widget.update("")
+            return
+
+        cached = _backend().get_cached_art(pokemon_id)
+        if cached is not None:
+            self.requests.cancel("art")
+            self.update_art((pokemon_id, cached))
+            return
+
+        art_widget.update("")
+        self.requests.submit("art", lambda: (pokemon_id, _backend().get_art(pokemon_id)), self.update_art)
+
+    def update_art(self, result: tuple) -> None:
+        pokemon_id, art = result
+        if pokemon_id != self._art_id:
+            return
+        art_widget = self.query_one(ArtDisplay)
+        art_widget.update(Text(art))
         art_widget.refresh()
 
 
 class SetupScreen(Screen):
-    """A screen to set up the application on the first run."""
+    """
+    A screen to set up the application on the first run.
+
+    The data pipeline reports structured progress events (see
+    src/progress.py), either as JSON lines from a `data_pipeline.py`
+    subprocess or, with `in_process`, straight from a pipeline run on a
+    worker thread. Events are queued as they arrive and drawn in batches at
+    most PROGRESS_REFRESH_HZ times a second: one progress bar and status
+    line per phase, and any log lines written together.
+    """
+
+    def __init__(self, in_process: bool = False) -> None:
+        super().__init__()
+        self.in_process = in_process
+        # Appended to by the worker thread, drained on the UI thread.
+        self._events = deque()
 
     def compose(self) -> ComposeResult:
         yield Header()
+        with Vertical(id="setup_progress"):
+            for phase in PHASES:
+                with Horizontal(classes="setup_phase"):
+                    yield Label(phase.replace("_", " ").capitalize(), classes="phase_name")
+                    yield ProgressBar(total=None, show_eta=False, id=f"progress_{phase}")
+                    yield Label("waiting", id=f"status_{phase}", classes="phase_status")
         yield Log(id="setup_log", auto_scroll=True)
         yield Footer()
 
     def on_mount(self) -> None:
         log = self.query_one(Log)
         log.write_line("Welcome to the Pokédex!")
-        log.write_line("The local database was not found.")
+        if os.path.exists(DB_PATH):
+            log.write_line("Refreshing the local data from PokeAPI.")
+        else:
+            log.write_line("The local database was not found.")
         log.write_line("Starting automatic setup... (This takes a little while, we're not frozen! Don't quit the app)")
         log.write_line("-" * 30)
-        self.run_worker(self.run_setup_process, exclusive=True, thread=True)
+        self.set_interval(1 / PROGRESS_REFRESH_HZ, self.flush_events)
+        if self.in_process:
+            self.run_worker(self.run_setup_in_process, exclusive=True, thread=True)
+        else:
+            self.run_worker(self.run_setup_process, exclusive=True, thread=True)
+
+    def flush_events(self) -> None:
+        """Draws the events queued since the last flush."""
+        latest = {}
+        lines = []
+        while self._events:
+            event = self._events.popleft()
+            if event["event"] == "log":
+                lines.append(event["message"])
+                continue
+            # Only the newest counters of each phase are drawn.
+            latest[event["phase"]] = event
+            if event["event"] == "phase_end":
+                lines.append(format_event(event))
+        for phase, event in latest.items():
+            if phase in PHASES:
+                self.show_phase(phase, event)
+        if lines:
+            self.query_one(Log).write_lines(lines)
+
+    def show_phase(self, phase: str, event: dict) -> None:
+        bar = self.query_one(f"#progress_{phase}", ProgressBar)
+        if event["event"] == "phase_start":
+            bar.update(total=event["total"], progress=0)
+        elif event["event"] == "progress":
+            bar.update(total=event["total"], progress=event["done"])
+        else:
+            bar.update(total=max(event["done"], 1), progress=event["done"])
+        self.query_one(f"#status_{phase}", Label).update(format_status(event))
 
     def on_setup_complete(self, return_code: int) -> None:
-        """Called when the setup process worker is finished."""
+        """Called when the setup worker is finished."""
+        self.flush_events()
         log = self.query_one(Log)
         log.write_line("-" * 30)
         if return_code == 0:
@@ -165,12 +413,11 @@ class SetupScreen(Screen):
         log.write_line("You can now exit the app by pressing 'q'.")
 
     def run_setup_process(self) -> None:
-        """Runs the data pipeline script as a subprocess and streams the output."""
+        """Runs the data pipeline script as a subprocess and queues its events and output."""
         import subprocess
 
-        log = self.query_one(Log)
-        command = ["uv", "run", "data_pipeline.py", "--yes"]
-        
+        command = ["uv", "run", "data_pipeline.py", "--yes", "--progress-json"]
+
         process = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
@@ -182,11 +429,27 @@ class SetupScreen(Screen):
 
         if process.stdout:
             for line in iter(process.stdout.readline, ''):
-                self.app.call_from_thread(log.write, line)
-        
+                line = line.rstrip("\n")
+                self._events.append(parse_event(line) or {"event": "log", "message": line})
+
         process.wait()
         self.app.call_from_thread(self.on_setup_complete, process.returncode)
 
+    def run_setup_in_process(self) -> None:
+        """Runs the data pipeline on this worker thread, queueing its events."""
+        import asyncio
+        from .pipeline import run_pipeline
+
+        # The pipeline's steps log through `progress`, not stdout, which
+        # belongs to the whole process (and the terminal Textual draws on).
+        progress = Progress(self._events.append)
+        try:
+            ok = asyncio.run(run_pipeline(progress))
+        except Exception as e:
+            progress.log(f"Setup failed: {type(e).__name__} - {e}")
+            ok = False
+        self.app.call_from_thread(self.on_setup_complete, 0 if ok else 1)
+
     def on_key(self, event) -> None:
         if event.key == "q":
             self.app.exit()
@@ -0,0 +1,212 @@
+"""
+Search indexes over the Pokémon list.
+
+`SearchIndex` answers the list filter's substring queries (see
+backend.count_pokemon and get_pokemon_page) from a trigram index over
+lowercased names plus an id map. When a query extends the
+previous one (the usual case while typing), only the previous result set is
+re-checked instead of the whole list.
+
+`SearchIndex.rank` returns ranked matches: exact id, exact name, prefix and
+substring hits first, then typo matches within a bounded edit distance,
+found through a precomputed deletion index over the names.
+"""
+from collections import defaultdict
+
+# Rank tiers, best first.
+TIER_ID = 0
+TIER_NAME = 1
+TIER_PREFIX = 2
+TIER_SUBSTRING = 3
+TIER_FUZZY = 4
+
+# Typo tolerance is capped here; the deletion index grows combinatorially.
+MAX_EDIT_DISTANCE = 2
+
+
+def trigrams(text: str) -> set[str]:
+    """Returns the set of 3-character substrings of `text`."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def max_edit_distance(query: str) -> int:
+    """How many typos to tolerate for a query of this length."""
+    if len(query) <= 3:
+        return 0
+    if len(query) <= 5:
+        return 1
+    return MAX_EDIT_DISTANCE
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between `a` and `b`, giving up early once it must
+    exceed `limit`. Returns `limit + 1` in that case.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = previous[j - 1] + (char_a != char_b)
+            cost = min(cost, previous[j] + 1, current[j - 1] + 1)
+            current.append(cost)
+            row_min = min(row_min, cost)
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def deletions(word: str, depth: int) -> set[str]:
+    """All strings reachable from `word` by deleting up to `depth` characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+class DeletionIndex:
+    """
+    A symmetric-deletion index for bounded edit-distance lookups.
+
+    Two words within edit distance `d` always share a string reachable from
+    both by at most `d` deletions, so candidates come from a handful of dict
+    lookups and only those are checked with `edit_distance`.
+    """
+
+    def __init__(self, words, depth: int = MAX_EDIT_DISTANCE):
+        self.depth = depth
+        self._index = defaultdict(set)
+        for word in words:
+            for variant in deletions(word, depth):
+                self._index[variant].add(word)
+
+    def find(self, word: str, limit: int) -> list[tuple[int, str]]:
+        """Returns `(distance, word)` pairs within `limit` of `word`."""
+        limit = min(limit, self.depth)
+        candidates = set()
+        for variant in deletions(word, limit):
+            candidates |= self._index.get(variant, set())
+        found = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                found.append((distance, candidate))
+        return found
+
+
+class SearchIndex:
+    """Substring search over Pokémon names with incremental narrowing."""
+
+    def __init__(self, pokemon_list: list[dict]):
+        self._rows = {p["id"]: p for p in pokemon_list}
+        self._order = [p["id"] for p in pokemon_list]
+        self._position = {pokemon_id: i for i, pokemon_id in enumerate(self._order)}
+        self._names = {p["id"]: p["name"].lower() for p in pokemon_list}
+        self._ids = {str(p["id"]): p["id"] for p in pokemon_list}
+        self._trigrams = defaultdict(set)
+        for pokemon_id, name in self._names.items():
+            for gram in trigrams(name):
+                self._trigrams[gram].add(pokemon_id)
+
+        self._last_query = None
+        self._last_ids = None
+
+        self._by_name = defaultdict(list)
+        for pokemon_id, name in self._names.items():
+            self._by_name[name].append(pokemon_id)
+        self._fuzzy = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def resolve(self, key: str) -> int | None:
+        """The id of the Pokémon whose id or name is exactly `key`, if any."""
+        key = key.lower().strip()
+        if key in self._ids:
+            return self._ids[key]
+        ids = self._by_name.get(key)
+        return ids[0] if ids else None
+
+    def _candidates(self, query: str) -> list[int]:
+        """Ids that may match `query`, in list order."""
+        if self._last_query is not None and self._last_query in query:
+            # Anything matching the longer query matched the shorter one too.
+            return self._last_ids
+        if len(query) < 3:
+            return self._order
+        grams = sorted(trigrams(query), key=lambda g: len(self._trigrams.get(g, ())))
+        hits = set(self._trigrams.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not hits:
+                break
+            hits &= self._trigrams.get(gram, set())
+        return [pokemon_id for pokemon_id in self._order if pokemon_id in hits]
+
+    def search(self, query: str) -> list[dict]:
+        """Returns rows whose name contains `query` or whose id equals it."""
+        query = query.lower().strip()
+        if not query:
+            self._last_query, self._last_ids = None, None
+            return [self._rows[pokemon_id] for pokemon_id in self._order]
+
+        names = self._names
+        ids = [pokemon_id for pokemon_id in self._candidates(query) if query in names[pokemon_id]]
+        self._last_query, self._last_ids = query, ids
+
+        exact_id = self._ids.get(query)
+        if exact_id is not None and exact_id not in ids:
+            ids = sorted(ids + [exact_id], key=self._position.__getitem__)
+        return [self._rows[pokemon_id] for pokemon_id in ids]
+
+    def rank(self, query: str, limit: int = 10, max_distance: int | None = None) -> list[dict]:
+        """
+        Returns up to `limit` rows ranked by match quality. Each row is a copy
+        of the list row with a `score` key (lower is better).
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = max_edit_distance(query)
+
+        scored = {}
+
+        def offer(pokemon_id: int, tier: int, distance: int = 0) -> None:
+            score = (tier, distance, self._position[pokemon_id])
+            if pokemon_id not in scored or score < scored[pokemon_id]:
+                scored[pokemon_id] = score
+
+        exact_id = self._ids.get(query.lstrip("#"))
+        if exact_id is not None:
+            offer(exact_id, TIER_ID)
+
+        names = self._names
+        for pokemon_id in self._candidates(query):
+            name = names[pokemon_id]
+            if query not in name:
+                continue
+            if name == query:
+                offer(pokemon_id, TIER_NAME)
+            elif name.startswith(query):
+                offer(pokemon_id, TIER_PREFIX)
+            else:
+                offer(pokemon_id, TIER_SUBSTRING)
+
+        if max_distance > 0 and len(scored) < limit:
+            if self._fuzzy is None:
+                self._fuzzy = DeletionIndex(self._by_name)
+            for distance, name in self._fuzzy.find(query, max_distance):
+                for pokemon_id in self._by_name[name]:
+                    offer(pokemon_id, TIER_FUZZY, distance)
+
+        best = sorted(scored.items(), key=lambda item: item[1])[:limit]
+        return [
+            {**self._rows[pokemon_id], "score": score[0] * 10 + score[1]}
+            for pokemon_id, score in best
+        ]
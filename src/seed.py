@@ -0,0 +1,118 @@
+"""
+Offline first run: seeding the database from the dex.json snapshot that
+ships with the repo, and filling in art for the Pokémon it brings in.
+
+The snapshot has every Pokémon's entry but no sprites or art, so a seeded
+database is usable straight away and only the art pane starts out empty.
+`fill_missing_art` then fetches one small sprite per Pokémon, renders it
+and stores it the way the pipeline would, in the background, stopping
+quietly when offline. The full PokeAPI refresh (data_pipeline.py, or
+`main.py --refresh`) stays available but is no longer needed to start.
+"""
+import os
+import sqlite3
+
+from .art_store import ART_COLUMNS, render_ascii_art, save_sprite
+from .database import DB_PATH, create_tables, get_source_path, has_pokemon, populate_db_from_json, set_build_id
+
+# Default front sprites, as linked from PokeAPI's `sprites.front_default`.
+SPRITE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{}.png"
+SPRITE_TIMEOUT = 5.0
+
+# How long an art write waits for SQLite's write lock.
+WRITE_TIMEOUT = 5.0
+
+MISSING_ART_QUERY = "SELECT id FROM pokemon WHERE art_key IS NULL ORDER BY id"
+SET_ART_KEY_QUERY = "UPDATE pokemon SET art_key = ? WHERE id = ? AND art_key IS NULL"
+INSERT_ART_QUERY = "INSERT OR IGNORE INTO art (art_key, columns, art) VALUES (?, ?, ?)"
+
+
+def can_seed() -> bool:
+    """Whether the app can start without running the data pipeline first."""
+    return os.path.exists(DB_PATH) or get_source_path() is not None
+
+
+def seed_database() -> bool:
+    """
+    Creates the database and loads it from `get_source_path()` (fetched
+    data, else the bundled snapshot) if it holds no Pokémon yet. Returns
+    whether it loaded anything.
+    """
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    create_tables()
+    source = get_source_path()
+    if has_pokemon() or source is None:
+        return False
+    return populate_db_from_json(source) is not None
+
+
+def missing_art_ids() -> list[int]:
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            return [row[0] for row in conn.execute(MISSING_ART_QUERY)]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return []
+
+
+def fill_missing_art(on_filled=None, should_stop=lambda: False, columns: int = ART_COLUMNS) -> tuple[int, int]:
+    """
+    Fetches, renders and stores art for every Pokémon that has none, lowest
+    id first, calling `on_filled(pokemon_id)` after each. A sprite that is
+    not found, does not render or cannot be saved is skipped and counted as
+    failed. Stops at the first network error (most likely offline; the next
+    start tries again) or when `should_stop()` says so. Blocking; returns
+    how many were filled and how many failed.
+    """
+    import httpx
+
+    ids = missing_art_ids()
+    if not ids:
+        return 0, 0
+
+    filled = failed = 0
+    conn = sqlite3.connect(DB_PATH, timeout=WRITE_TIMEOUT)
+    try:
+        with httpx.Client(timeout=SPRITE_TIMEOUT, follow_redirects=True) as client:
+            for pokemon_id in ids:
+                if should_stop():
+                    break
+                try:
+                    response = client.get(SPRITE_URL.format(pokemon_id))
+                except httpx.HTTPError:
+                    break
+                if response.status_code != 200:
+                    failed += 1
+                    continue
+                try:
+                    art = render_ascii_art(response.content, columns)
+                except Exception:
+                    failed += 1
+                    continue
+                try:
+                    art_key = save_sprite(response.content)
+                except OSError:
+                    failed += 1
+                    continue
+                try:
+                    with conn:
+                        conn.execute(INSERT_ART_QUERY, (art_key, columns, art))
+                        conn.execute(SET_ART_KEY_QUERY, (art_key, pokemon_id))
+                except sqlite3.Error:
+                    break
+                filled += 1
+                if on_filled is not None:
+                    on_filled(pokemon_id)
+        if filled:
+            # Lets a running API server drop the art it cached (see
+            # server.DexServer._get).
+            try:
+                with conn:
+                    set_build_id(conn.cursor())
+            except sqlite3.Error:
+                pass
+    finally:
+        conn.close()
+    return filled, failed
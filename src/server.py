@@ -0,0 +1,273 @@
+"""
+A local, read-only HTTP/JSON API over the backend, for scripts and tools
+that want dex data without opening the database themselves.
+
+    GET /pokemon                    every Pokémon, as `id`/`name` (get_all_pokemon)
+    GET /pokemon/<name or id>       a dex entry (get_dex_entry, exact matches only)
+    GET /pokemon/<name or id>/art   {"id": ..., "ascii_art": ...}
+    GET /search?q=<text>&limit=<n>  ranked matches (search_pokemon)
+
+The server is plain asyncio streams speaking HTTP/1.1 with keep-alive.
+Backend calls run on a thread pool the size of the read connection pool.
+Responses are cached in memory with an ETag, and dropped along with the
+backend's caches when the database build changes (see
+database.BUILD_ID_QUERY); requests with a matching
+If-None-Match get a 304. Bodies over GZIP_MIN_BYTES are sent gzipped to
+clients that accept it, compressed once per cached response.
+
+The server never writes to the dex data: art is served at the stored width
+nearest to the one asked for instead of being rendered on demand. (On
+startup, prepare_database may still migrate the database or seed it from
+the bundled snapshot, as the app does.)
+
+Run it with `uv run main.py --serve [--host HOST] [--port PORT]`.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from . import backend
+from .database import POOL_SIZE
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+MAX_CACHED_RESPONSES = 4096
+# How often the database build id is re-read, in seconds.
+BUILD_CHECK_INTERVAL = 1.0
+
+MAX_HEADER_BYTES = 16 * 1024
+# Idle keep-alive connections are closed after this many seconds.
+KEEPALIVE_TIMEOUT = 15.0
+
+SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+
+
+class CachedResponse:
+    """A response body with its ETag and, for large bodies, a gzipped copy."""
+
+    def __init__(self, status: int, body: bytes, etag: str):
+        self.status = status
+        self.body = body
+        self.etag = etag
+        self.gzipped = gzip.compress(body, GZIP_LEVEL) if len(body) >= GZIP_MIN_BYTES else None
+
+
+class ResponseCache:
+    """An LRU of responses by request target, emptied when the build changes."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.build_id = None
+        self.checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def check_build(self, build_id: str | None) -> bool:
+        """Empties the cache if `build_id` is new. Returns whether it was."""
+        if build_id == self.build_id:
+            return False
+        self._entries.clear()
+        self.build_id = build_id
+        return True
+
+    def get(self, key: str) -> CachedResponse | None:
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def route(path: str, params: dict) -> tuple[int, object]:
+    """Returns `(status, payload)` for a GET of `path`. Blocking; runs on the thread pool."""
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+    if parts == ["pokemon"]:
+        return HTTPStatus.OK, backend.get_all_pokemon()
+    if parts == ["search"]:
+        query = params.get("q", [""])[0]
+        try:
+            limit = min(int(params.get("limit", [SEARCH_LIMIT])[0]), MAX_SEARCH_LIMIT)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "limit must be a number."}
+        if limit < 1:
+            return HTTPStatus.BAD_REQUEST, {"error": "limit must be at least 1."}
+        return HTTPStatus.OK, backend.search_pokemon(query, limit) if query.strip() else []
+    if len(parts) in (2, 3) and parts[0] == "pokemon" and parts[2:] in ([], ["art"]):
+        # No typo fallback here: a URL names one Pokémon, and a near match
+        # would answer it with another one's data.
+        entry = backend.get_dex_entry(parts[1], fuzzy=False)
+        if "error" in entry:
+            status = HTTPStatus.SERVICE_UNAVAILABLE if entry["error"] == backend.DB_ERROR_MESSAGE else HTTPStatus.NOT_FOUND
+            return status, entry
+        if parts[2:] == ["art"]:
+            return HTTPStatus.OK, {"id": entry["id"], "ascii_art": backend.get_art(entry["id"], render=False)}
+        return HTTPStatus.OK, entry
+    return HTTPStatus.NOT_FOUND, {"error": f"No such resource: {path}"}
+
+
+class DexServer:
+    """Serves the API on `host`:`port` until cancelled."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.cache = ResponseCache()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dex-server")
+        self._server = None
+        self.requests = 0
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, backend.prepare_database)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send_error(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, keep_alive=False)
+                    break
+                keep_alive = await self._handle_request(head, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, head: bytes, writer: asyncio.StreamWriter) -> bool:
+        """Answers one request. Returns whether the connection stays open."""
+        self.requests += 1
+        try:
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ")
+        except ValueError:
+            await self._send_error(writer, HTTPStatus.BAD_REQUEST, keep_alive=False)
+            return False
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+        if method not in ("GET", "HEAD"):
+            # Any request body is left unread, so the connection cannot be reused.
+            await self._send_error(writer, HTTPStatus.METHOD_NOT_ALLOWED, False, {"Allow": "GET, HEAD"})
+            return False
+
+        response = await self._get(target)
+        extra = {"ETag": response.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if response.status == HTTPStatus.OK and headers.get("if-none-match") == response.etag:
+            self._write(writer, HTTPStatus.NOT_MODIFIED, b"", keep_alive, extra)
+            return keep_alive
+        body = response.body
+        if response.gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+            body = response.gzipped
+            extra["Content-Encoding"] = "gzip"
+        self._write(writer, response.status, body, keep_alive, extra, head_only=method == "HEAD")
+        return keep_alive
+
+    async def _get(self, target: str) -> CachedResponse:
+        """The response for `target`, from the cache when the build has not changed."""
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        if now - self.cache.checked_at >= BUILD_CHECK_INTERVAL:
+            self.cache.checked_at = now
+            build_id = await loop.run_in_executor(self._executor, backend.get_build_id)
+            if self.cache.check_build(build_id):
+                # The backend's own caches hold the old build's data too.
+                await loop.run_in_executor(self._executor, backend.invalidate_caches)
+
+        response = self.cache.get(target)
+        if response is not None:
+            return response
+        url = urlsplit(target)
+        try:
+            status, payload = await loop.run_in_executor(self._executor, route, url.path, parse_qs(url.query))
+        except Exception as e:
+            print(f"Error serving {target}: {type(e).__name__} - {e}")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": HTTPStatus.INTERNAL_SERVER_ERROR.phrase}
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        etag = f'"{(self.cache.build_id or "none")[:8]}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        response = CachedResponse(status, body, etag)
+        # Server and service errors are not cached, so they clear up once the
+        # database is back.
+        if status < HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.cache.put(target, response)
+        return response
+
+    async def _send_error(self, writer, status: HTTPStatus, keep_alive: bool, extra: dict | None = None) -> None:
+        body = json.dumps({"error": status.phrase}).encode("utf-8")
+        self._write(writer, status, body, keep_alive, extra or {})
+
+    @staticmethod
+    def _write(writer, status: int, body: bytes, keep_alive: bool, extra: dict, head_only: bool = False) -> None:
+        status = HTTPStatus(status)
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in extra.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(body)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Runs the API server until interrupted."""
+    async def run():
+        server = DexServer(host, port)
+        await server.start()
+        print(f"Serving the dex API on http://{server.host}:{server.port} (Ctrl+C to stop)")
+        try:
+            await server.serve_forever()
+        finally:
+            server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.shutdown_backend()
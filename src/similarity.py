@@ -0,0 +1,141 @@
+"""
+"Similar Pokémon": nearest neighbours over base stats, types and abilities.
+
+`SimilarityIndex` precomputes a min-max normalized stat matrix (one row of
+six values per Pokémon) and inverted lists of the rows that have each type
+and ability. A lookup computes the distance from one row to every row in a
+single pass: Euclidean stat distance plus a penalty for the types and
+abilities the two do not share (one minus their Jaccard overlap). Shared
+types and abilities are counted by walking only the inverted lists of the
+queried Pokémon's own types and abilities.
+
+The pass is vectorized over the whole matrix with NumPy (a dependency);
+if it is missing, it runs over `array` buffers in plain loops, about ten
+times slower.
+"""
+import heapq
+import math
+from array import array
+from collections import defaultdict
+
+from .stats_store import NUMPY_AVAILABLE, STAT_COLUMNS, StatsStore
+
+SIMILAR_COUNT = 8
+
+# How much each part adds to the distance; each part is between 0 and 1.
+STAT_WEIGHT = 1.0
+TYPE_WEIGHT = 0.5
+ABILITY_WEIGHT = 0.25
+
+
+class SimilarityIndex:
+    """Nearest-neighbour lookups over the Pokémon in a StatsStore."""
+
+    def __init__(self, store: StatsStore, ability_links):
+        """`ability_links` are (pokemon_id, ability) pairs; abilities can be ids or names."""
+        self.store = store
+        n = len(store)
+        ids = store.columns["id"]
+        self._row_of = {pokemon_id: row for row, pokemon_id in enumerate(ids)}
+
+        # Row-major n x 6, each stat scaled to 0..1 over the whole list.
+        self.vectors = array("d", bytes(8 * n * len(STAT_COLUMNS)))
+        width = len(STAT_COLUMNS)
+        for j, column in enumerate(STAT_COLUMNS):
+            values = store.columns[column]
+            low, high = (min(values), max(values)) if n else (0, 0)
+            scale = 1.0 / (high - low) if high > low else 0.0
+            for row in range(n):
+                self.vectors[row * width + j] = (values[row] - low) * scale
+
+        self._types = self._inverted(
+            (ids[row], bit) for row in range(n) for bit in range(64) if store.types[row] >> bit & 1
+        )
+        self._abilities = self._inverted(ability_links)
+
+        self._np = None
+        if NUMPY_AVAILABLE:
+            import numpy as np
+            self._np = np
+            self._np_vectors = np.frombuffer(self.vectors, dtype=np.float64).reshape(n, width)
+
+    def _inverted(self, links) -> dict:
+        """Rows per key, the keys of each row and how many each row has."""
+        rows_with = defaultdict(lambda: array("i"))
+        keys_of = defaultdict(list)
+        counts = array("i", bytes(4 * len(self.store)))
+        for pokemon_id, key in links:
+            row = self._row_of.get(pokemon_id)
+            if row is None or key in keys_of[row]:
+                continue
+            rows_with[key].append(row)
+            keys_of[row].append(key)
+            counts[row] += 1
+        return {"rows_with": dict(rows_with), "keys_of": dict(keys_of), "counts": counts}
+
+    def _overlap_penalty(self, inverted: dict, row: int):
+        """
+        One minus the Jaccard overlap between `row`'s keys and every row's,
+        as an array over all rows.
+        """
+        n = len(self.store)
+        counts = inverted["counts"]
+        keys = inverted["keys_of"].get(row, [])
+        if self._np is not None:
+            np = self._np
+            shared = np.zeros(n)
+            for key in keys:
+                shared[np.frombuffer(inverted["rows_with"][key], dtype=np.int32)] += 1
+            union = np.frombuffer(counts, dtype=np.int32) + len(keys) - shared
+            return 1.0 - shared / np.maximum(union, 1)
+
+        shared = defaultdict(int)
+        for key in keys:
+            for other in inverted["rows_with"][key]:
+                shared[other] += 1
+        own = len(keys)
+        penalty = [1.0] * n
+        for other, count in shared.items():
+            penalty[other] = 1.0 - count / max(counts[other] + own - count, 1)
+        return penalty
+
+    def similar(self, pokemon_id: int, k: int = SIMILAR_COUNT) -> list[dict]:
+        """
+        The `k` Pokémon closest to `pokemon_id`, nearest first, as dicts with
+        `id`, `name` and `distance`. Empty if the id is unknown.
+        """
+        row = self._row_of.get(pokemon_id)
+        if row is None:
+            return []
+        type_penalty = self._overlap_penalty(self._types, row)
+        ability_penalty = self._overlap_penalty(self._abilities, row)
+        width = len(STAT_COLUMNS)
+        stat_scale = 1.0 / math.sqrt(width)
+
+        if self._np is not None:
+            np = self._np
+            vectors = self._np_vectors
+            stat_distance = np.sqrt(((vectors - vectors[row]) ** 2).sum(axis=1)) * stat_scale
+            distances = (
+                STAT_WEIGHT * stat_distance + TYPE_WEIGHT * type_penalty + ABILITY_WEIGHT * ability_penalty
+            )
+            distances[row] = np.inf
+            k = min(k, len(distances) - 1)
+            if k <= 0:
+                return []
+            nearest = np.argpartition(distances, k - 1)[:k]
+            nearest = nearest[np.argsort(distances[nearest], kind="stable")].tolist()
+        else:
+            vectors = self.vectors
+            own = vectors[row * width:(row + 1) * width]
+            distances = [
+                STAT_WEIGHT * math.dist(own, vectors[other * width:(other + 1) * width]) * stat_scale
+                + TYPE_WEIGHT * type_penalty[other]
+                + ABILITY_WEIGHT * ability_penalty[other]
+                for other in range(len(self.store))
+            ]
+            distances[row] = math.inf
+            nearest = heapq.nsmallest(min(k, len(distances) - 1), range(len(distances)), key=distances.__getitem__)
+
+        ids, names = self.store.columns["id"], self.store.names
+        return [{"id": ids[i], "name": names[i], "distance": float(distances[i])} for i in nearest]
@@ -0,0 +1,29 @@
+"""
+A tiny precomputed snapshot of the first page of the Pokémon list.
+
+The dex screen shows it on its first frame, before the backend and the
+database have been touched; the full list replaces it once loaded. The file
+is rewritten whenever the database is populated or updated.
+"""
+import json
+import os
+
+LIST_SNAPSHOT_PATH = os.path.join("data", "list_snapshot.json")
+LIST_SNAPSHOT_ROWS = 100
+
+
+def read_list_snapshot() -> list[dict]:
+    """Returns the snapshot rows, or an empty list if there is no usable snapshot."""
+    try:
+        with open(LIST_SNAPSHOT_PATH, "r") as f:
+            return [{"id": pokemon_id, "name": name} for pokemon_id, name in json.load(f)]
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def write_list_snapshot(rows) -> None:
+    """Writes `(id, name)` rows as the snapshot."""
+    os.makedirs(os.path.dirname(LIST_SNAPSHOT_PATH), exist_ok=True)
+    with open(LIST_SNAPSHOT_PATH + ".tmp", "w") as f:
+        json.dump([[pokemon_id, name] for pokemon_id, name in rows], f, separators=(",", ":"))
+    os.replace(LIST_SNAPSHOT_PATH + ".tmp", LIST_SNAPSHOT_PATH)
@@ -0,0 +1,246 @@
+"""
+Columnar base stats for filtering and sorting the whole list.
+
+`StatsStore` keeps one array per stat (plus the base stat total and the id)
+and a bitmask of types per Pokémon, loaded once. A `StatsQuery` (parsed from
+the filter bar, e.g. "speed>100 type:fire sort:total") is answered by
+narrowing all rows with each predicate in turn and then picking the
+top rows by the sort column, without building a dict per row.
+
+NumPy (a dependency) turns each predicate into one vectorized comparison.
+If it is missing, the columns are `array` module buffers scanned in plain
+loops, which gives the same results more slowly.
+"""
+import heapq
+import importlib.util
+import operator
+from array import array
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+STAT_COLUMNS = ("hp", "attack", "defense", "special_attack", "special_defense", "speed")
+TOTAL_COLUMN = "total"
+SORT_COLUMNS = ("id", TOTAL_COLUMN) + STAT_COLUMNS
+
+# Names accepted in the filter bar for each column.
+COLUMN_ALIASES = {
+    "id": "id",
+    "hp": "hp",
+    "atk": "attack", "attack": "attack",
+    "def": "defense", "defense": "defense",
+    "spa": "special_attack", "spatk": "special_attack", "special_attack": "special_attack",
+    "spd": "special_defense", "spdef": "special_defense", "special_defense": "special_defense",
+    "spe": "speed", "speed": "speed",
+    "bst": TOTAL_COLUMN, "total": TOTAL_COLUMN,
+}
+
+# Longest first, so ">=" is not read as ">".
+OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+}
+
+# Type bitmasks are 64-bit.
+MAX_TYPES = 64
+
+
+class StatsQuery:
+    """
+    A parsed filter: `predicates` as (column, operator, value), `types` as
+    groups of type names where a row needs one type from every group, and a
+    sort column and direction.
+    """
+
+    def __init__(self, predicates=(), types=(), sort: str = "id", descending: bool = False):
+        self.predicates = list(predicates)
+        self.types = [set(group) for group in types]
+        self.sort = sort
+        self.descending = descending
+
+
+def _column(name: str) -> str:
+    column = COLUMN_ALIASES.get(name.lower().replace("-", "_"))
+    if column is None:
+        raise ValueError(f"Unknown stat '{name}'.")
+    return column
+
+
+def parse_stats_query(text: str) -> StatsQuery | None:
+    """
+    Parses filter bar text into a StatsQuery, or None if it is empty. Terms
+    are separated by spaces:
+
+    - `speed>100`, `bst>=500`, `hp=80`: compare a stat (or `id`, `total`/`bst`)
+    - `type:fire`: has the type; `type:fire,water` has either; repeat to need both
+    - `sort:total`: highest first for stats, lowest first for `id`; a
+      leading `+` or `-` forces ascending or descending
+
+    Raises ValueError, with a message for the user, on anything else.
+    """
+    terms = text.split()
+    if not terms:
+        return None
+    query = StatsQuery()
+    for term in terms:
+        key, _, value = term.partition(":")
+        if value and key.lower() == "type":
+            query.types.append({name.lower() for name in value.split(",") if name})
+            continue
+        if value and key.lower() == "sort":
+            direction = value[0] if value[0] in "+-" else ""
+            query.sort = _column(value.lstrip("+-"))
+            query.descending = direction == "-" or (not direction and query.sort != "id")
+            continue
+        for symbol, compare in OPERATORS.items():
+            name, found, number = term.partition(symbol)
+            if found:
+                if not name or not number.isdigit():
+                    raise ValueError(f"Expected a stat, an operator and a number in '{term}'.")
+                query.predicates.append((_column(name), compare, int(number)))
+                break
+        else:
+            raise ValueError(f"Could not read '{term}'.")
+    return query
+
+
+class Selection:
+    """Rows picked by a query, in order. Pages are built when asked for."""
+
+    def __init__(self, store: "StatsStore", indices):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def page(self, offset: int, limit: int) -> list[dict]:
+        """Rows `offset` to `offset + limit` as `id`/`name` dicts, like backend.get_pokemon_page."""
+        ids, names = self.store.columns["id"], self.store.names
+        return [{"id": ids[i], "name": names[i]} for i in self.indices[offset:offset + limit]]
+
+    def ids(self) -> list[int]:
+        ids = self.store.columns["id"]
+        return [ids[i] for i in self.indices]
+
+
+class StatsStore:
+    """Base stats and types of every Pokémon, one array per column."""
+
+    def __init__(self, rows, type_links, type_names: dict[int, str]):
+        """
+        `rows` are (id, name, hp, attack, defense, special_attack,
+        special_defense, speed) in list order, `type_links` are
+        (pokemon_id, type_id) and `type_names` maps type ids to names.
+        """
+        self.names = []
+        self.columns = {column: array("i") for column in ("id", TOTAL_COLUMN) + STAT_COLUMNS}
+        ids, total = self.columns["id"], self.columns[TOTAL_COLUMN]
+        stats = [self.columns[column] for column in STAT_COLUMNS]
+        for pokemon_id, name, *values in rows:
+            ids.append(pokemon_id)
+            self.names.append(name)
+            values = [value or 0 for value in values]
+            for column, value in zip(stats, values):
+                column.append(value)
+            total.append(sum(values))
+        self.name_keys = [name.lower() for name in self.names]
+
+        if len(type_names) > MAX_TYPES:
+            raise ValueError(f"At most {MAX_TYPES} types are supported.")
+        self.type_bits = {name: 1 << bit for bit, name in enumerate(sorted(type_names.values()))}
+        bit_of = {type_id: self.type_bits[name] for type_id, name in type_names.items()}
+        row_of = {pokemon_id: row for row, pokemon_id in enumerate(ids)}
+        self.types = array("Q", bytes(8 * len(ids)))
+        for pokemon_id, type_id in type_links:
+            row = row_of.get(pokemon_id)
+            if row is not None and type_id in bit_of:
+                self.types[row] |= bit_of[type_id]
+
+        self._np = None
+        if NUMPY_AVAILABLE:
+            import numpy as np
+            self._np = np
+            # Views over the same buffers, not copies.
+            self._np_columns = {column: np.frombuffer(values, dtype=np.int32) for column, values in self.columns.items()}
+            self._np_types = np.frombuffer(self.types, dtype=np.uint64)
+
+    @classmethod
+    def from_entries(cls, entries) -> "StatsStore":
+        """Builds the store from dex entries (as in the record file)."""
+        rows, links, type_ids = [], [], {}
+        for entry in entries:
+            stats = {key.replace("-", "_"): value for key, value in entry.get("stats", {}).items()}
+            rows.append((entry["id"], entry["name"], *(stats.get(column) for column in STAT_COLUMNS)))
+            for type_name in entry.get("types", []):
+                links.append((entry["id"], type_ids.setdefault(type_name, len(type_ids) + 1)))
+        return cls(rows, links, {type_id: name for name, type_id in type_ids.items()})
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def type_mask(self, names) -> int:
+        """The bits of the named types. Unknown names match nothing."""
+        mask = 0
+        for name in names:
+            mask |= self.type_bits.get(name, 0)
+        return mask
+
+    def matches(self, query: StatsQuery):
+        """Indices of the rows that pass every predicate and type group, in list order."""
+        if self._np is not None:
+            np = self._np
+            mask = np.ones(len(self), dtype=bool)
+            for column, compare, value in query.predicates:
+                mask &= compare(self._np_columns[column], value)
+            for group in query.types:
+                mask &= (self._np_types & np.uint64(self.type_mask(group))) != 0
+            return np.flatnonzero(mask)
+
+        indices = range(len(self))
+        # Each predicate only re-checks the rows that passed the one before.
+        for column, compare, value in query.predicates:
+            values = self.columns[column]
+            indices = [i for i in indices if compare(values[i], value)]
+        for group in query.types:
+            bits = self.type_mask(group)
+            indices = [i for i in indices if self.types[i] & bits]
+        return list(indices)
+
+    def select(self, query: StatsQuery, name_filter: str = "", limit: int | None = None) -> Selection:
+        """
+        The rows matching `query` whose name contains `name_filter` (already
+        lowercased) or whose id equals it, sorted by the query's sort column;
+        with `limit`, only the top `limit` rows, picked without a full sort.
+        Ties keep list order.
+        """
+        indices = self.matches(query)
+        if name_filter:
+            ids = self.columns["id"]
+            keep = [name_filter in self.name_keys[i] or str(ids[i]) == name_filter for i in indices]
+            indices = indices[keep] if self._np is not None else [i for i, k in zip(indices, keep) if k]
+
+        if self._np is not None:
+            np = self._np
+            keys = self._np_columns[query.sort][indices]
+            if query.descending:
+                keys = -keys
+            if limit is not None and limit < len(indices):
+                # Everything tied with the limit-th key is a candidate, so the
+                # earliest of the ties is kept rather than whichever the
+                # partition happened to pick.
+                threshold = keys[np.argpartition(keys, limit - 1)[limit - 1]]
+                top = np.flatnonzero(keys <= threshold)
+                order = top[np.lexsort((top, keys[top]))][:limit]
+            else:
+                order = np.argsort(keys, kind="stable")
+            return Selection(self, indices[order].tolist())
+
+        key = self.columns[query.sort].__getitem__
+        if limit is not None and limit < len(indices):
+            pick = heapq.nlargest if query.descending else heapq.nsmallest
+            return Selection(self, pick(limit, indices, key=key))
+        return Selection(self, sorted(indices, key=key, reverse=query.descending))
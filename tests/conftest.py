@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def seeded(tmp_path, monkeypatch):
+    """A working directory whose database is seeded from the bundled snapshot."""
+    from src import backend, seed
+
+    monkeypatch.chdir(tmp_path)
+    seed.seed_database()
+    yield
+    backend.shutdown_backend()
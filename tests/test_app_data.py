@@ -0,0 +1,55 @@
+import os
+import sqlite3
+
+import pytest
+
+from src import backend, database
+from src.app_data import AppDataWriter
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    database.create_tables()
+    yield database.DB_PATH
+    database.close_pool()
+
+
+def app_data(pokemon_id: int) -> tuple[int, int, int] | None:
+    conn = sqlite3.connect(database.DB_PATH)
+    try:
+        return conn.execute(
+            "SELECT view_count, search_count, is_favorite FROM pokemon_app_data WHERE pokemon_id = ?", (pokemon_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def test_a_failed_flush_reports_it_and_keeps_the_changes(db):
+    writer = AppDataWriter(path=os.path.join("missing", "pokedex.db"), interval=60)
+    writer.add_view(25)
+    writer.set_favorite(25, True)
+    assert not writer.flush()
+    assert writer.failed_flushes == 1
+    writer.path = db
+    assert writer.flush()
+    assert app_data(25) == (1, 0, 1)
+    writer.close()
+
+
+def test_close_writes_what_is_pending(db):
+    writer = AppDataWriter(interval=60)
+    writer.add_view(25)
+    writer.add_view(25)
+    writer.add_search(25)
+    writer.close()
+    assert app_data(25) == (2, 1, 0)
+
+
+def test_writes_after_shutdown_start_the_writer_again(db):
+    backend.record_view(25)
+    backend.shutdown_backend()
+    backend.record_view(25, searched=True)
+    backend.shutdown_backend()
+    assert app_data(25) == (2, 1, 0)
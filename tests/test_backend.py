@@ -0,0 +1,37 @@
+import sqlite3
+
+import pytest
+
+from src import backend, database
+
+
+@pytest.mark.parametrize("filter", ["pi", "pika", "char", "25", "1", "zzz"])
+def test_filtered_pages_match_a_name_scan(seeded, filter):
+    conn = sqlite3.connect(database.DB_PATH)
+    expected = [
+        row[0] for row in conn.execute(
+            "SELECT id FROM pokemon WHERE instr(name_key, ?) > 0 OR id = ? ORDER BY id",
+            (filter, int(filter) if filter.isdigit() else None),
+        )
+    ]
+    conn.close()
+    assert backend.count_pokemon(filter) == len(expected)
+    assert [row["id"] for row in backend.get_pokemon_page(0, 2000, filter)] == expected
+    assert [row["id"] for row in backend.get_pokemon_page(1, 2, filter)] == expected[1:3]
+
+
+def test_name_lookups_hit_the_entry_cache(seeded):
+    entry = backend.get_dex_entry("Pikachu")
+    assert entry["id"] == 25
+    assert backend.get_dex_entry("pikachu") is entry
+    assert backend.get_dex_entry("25") is entry
+    assert backend.get_cached_dex_entry(25) is entry
+
+
+def test_the_list_is_not_capped_at_the_national_dex(seeded):
+    conn = sqlite3.connect(database.DB_PATH)
+    with conn:
+        conn.execute("INSERT INTO pokemon (id, name, name_key) VALUES (10001, 'Deoxys-Attack', 'deoxys-attack')")
+    conn.close()
+    assert backend.get_all_pokemon()[-1]["id"] == 10001
+    assert [row["id"] for row in backend.get_pokemon_page(0, 10, "deoxys-att")] == [10001]
@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.fetch_engine import AdaptiveLimiter, make_http_client
+from src.http_cache import CachedClient, ResponseCache
+
+URL = "https://pokeapi.co/api/v2/pokemon/25/"
+
+
+def fetch(handler, cache_dir, urls, **options):
+    """Fetches `urls` in turn through a CachedClient on a mock transport."""
+    async def run():
+        async with make_http_client(httpx.MockTransport(handler)) as http_client:
+            client = CachedClient(http_client, ResponseCache(str(cache_dir)), **options)
+            return client, [await client.get_bytes(url, "pokemon") for url in urls]
+
+    return asyncio.run(run())
+
+
+def test_stale_entries_are_revalidated_with_their_etag(tmp_path):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b'{"name": "pikachu"}', headers={"ETag": '"v1"'})
+
+    client, bodies = fetch(handler, tmp_path, [URL, URL], fresh_for=0)
+
+    assert seen == [None, '"v1"']
+    assert bodies == [b'{"name": "pikachu"}'] * 2
+    assert (client.fetched, client.revalidated, client.hits) == (1, 1, 0)
+
+
+def test_fresh_entries_skip_the_network(tmp_path):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url)
+        return httpx.Response(200, content=b"{}", headers={"ETag": '"v1"'})
+
+    client, _ = fetch(handler, tmp_path, [URL, URL])
+    assert len(calls) == 1 and client.hits == 1
+
+
+def test_429_halves_the_limit_and_is_retried(tmp_path):
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, content=b"{}"),
+    ])
+    limiter = AdaptiveLimiter(initial=16)
+
+    client, bodies = fetch(lambda request: next(responses), tmp_path, [URL], limiter=limiter, backoff=0)
+
+    assert bodies == [b"{}"]
+    # Both 429s land within one latency target, so the limit halves once.
+    assert limiter.decreases == 1
+    assert 8 <= limiter.limit < 9
+    assert client.stats.throttled["pokemon"] == 2
+
+
+def test_limit_grows_additively_and_stays_in_bounds():
+    limiter = AdaptiveLimiter(initial=4, minimum=2, maximum=5, latency_target=0.0)
+    limiter.record(0.0)
+    assert limiter.limit == 4.25
+    for _ in range(100):
+        limiter.record(0.0)
+    assert limiter.limit == 5
+
+    limiter.record(1.0, throttled=True)
+    assert limiter.limit == 2.5
+    limiter.record(1.0, throttled=True)
+    assert limiter.limit == 2
+
+
+def test_retry_after_pauses_new_requests():
+    limiter = AdaptiveLimiter()
+    limiter.record(0.01, throttled=True, retry_after=30)
+    assert limiter._paused_until > limiter._last_decrease + 29
+
+
+
+def unavailable(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(503)
+
+
+def unreachable(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("offline", request=request)
+
+
+@pytest.mark.parametrize("handler, error", [(unavailable, httpx.HTTPStatusError), (unreachable, httpx.ConnectError)])
+def test_the_last_retry_surfaces_its_error(tmp_path, handler, error):
+    calls = []
+
+    def counting(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url)
+        return handler(request)
+
+    with pytest.raises(error):
+        fetch(counting, tmp_path, [URL], retries=2, backoff=0)
+    assert len(calls) == 3
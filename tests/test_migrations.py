@@ -0,0 +1,50 @@
+import sqlite3
+
+import pytest
+
+from src import backend, database
+from src.art_store import text_art_key
+
+# The pokemon table as the first release created it, with art stored inline.
+V0_POKEMON_TABLE = """
+CREATE TABLE pokemon (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    height INTEGER,
+    weight INTEGER,
+    flavor_text TEXT,
+    ascii_art TEXT
+)
+"""
+
+
+@pytest.fixture
+def v0_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    conn = sqlite3.connect(database.DB_PATH)
+    conn.execute(V0_POKEMON_TABLE)
+    conn.executemany(
+        "INSERT INTO pokemon (id, name, height, weight, flavor_text, ascii_art) VALUES (?, ?, ?, ?, ?, ?)",
+        [(25, "pikachu", 4, 60, "Electric.", "(=^.^=)"), (26, "raichu", 8, 300, "", None)],
+    )
+    conn.commit()
+    conn.close()
+    yield
+    backend._art_cache.clear()
+    database.close_pool()
+
+
+def test_inline_art_moves_to_the_art_table(v0_database):
+    database.create_tables()
+
+    conn = sqlite3.connect(database.DB_PATH)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(pokemon)")}
+    art_keys = dict(conn.execute("SELECT id, art_key FROM pokemon"))
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+
+    assert "ascii_art" not in columns
+    assert art_keys == {25: text_art_key("(=^.^=)"), 26: None}
+    assert version == database.SCHEMA_VERSION
+    assert backend.get_art(25) == "(=^.^=)"
@@ -0,0 +1,42 @@
+import json
+import os
+
+import pytest
+
+from src import database
+from src.manage_db import INDEXED_LOOKUPS, explain_query_plan, full_scans
+
+FIXTURE_SIZE = 50
+
+
+@pytest.fixture(scope="module")
+def fixture_db(tmp_path_factory):
+    """A small database built from the first records of the bundled dex.json."""
+    workdir = tmp_path_factory.mktemp("plans")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        os.makedirs("data")
+        with open(database.BUNDLED_JSON_PATH, encoding="utf-8") as f:
+            records = json.load(f)[:FIXTURE_SIZE]
+        with open(database.JSON_PATH, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        database.create_tables()
+        database.populate_db_from_json()
+        conn = database.get_db_connection()
+        yield conn
+        conn.close()
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.mark.parametrize("label", list(INDEXED_LOOKUPS))
+def test_hot_query_uses_an_index(fixture_db, label):
+    query, params = INDEXED_LOOKUPS[label]
+    plan = explain_query_plan(fixture_db, query, params)
+    assert not full_scans(plan), "\n".join(plan)
+
+
+def test_full_scans_are_detected():
+    assert full_scans(["SCAN pokemon"]) == ["SCAN pokemon"]
+    assert not full_scans(["SCAN a USING INDEX idx_app_data_views", "SEARCH p USING INTEGER PRIMARY KEY (rowid=?)"])
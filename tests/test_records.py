@@ -0,0 +1,66 @@
+import gzip
+import json
+
+import pytest
+
+from src import records
+from src.records import iter_records
+
+RECORDS = [
+    {"id": 1, "name": "bulbasaur", "flavor_text": "A strange seed, planted at birth."},
+    {"id": 2, "name": "ivysaur", "flavor_text": "Brackets ] and commas , inside strings."},
+    {"id": 3, "name": "venusaur", "flavor_text": 'It said "bloom", then \\"grew\\" ] again.'},
+    {"id": 25, "name": "pikachu", "stats": {"speed": 90}, "moves": [{"move": "thunder-shock", "level": 1}]},
+]
+
+
+def write_array(path, records_, compress=False, indent=None):
+    text = json.dumps(records_, indent=indent)
+    if compress:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 64 * 1024])
+def test_records_split_across_chunks(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(records, "READ_CHUNK_SIZE", chunk_size)
+    path = write_array(tmp_path / "dex.json", RECORDS, indent=2)
+    assert list(iter_records(path)) == RECORDS
+
+
+def test_strings_with_brackets_commas_and_escaped_quotes(tmp_path, monkeypatch):
+    monkeypatch.setattr(records, "READ_CHUNK_SIZE", 5)
+    path = write_array(tmp_path / "dex.json", RECORDS[1:3])
+    parsed = list(iter_records(path))
+    assert parsed[0]["flavor_text"] == "Brackets ] and commas , inside strings."
+    assert parsed[1]["flavor_text"] == 'It said "bloom", then \\"grew\\" ] again.'
+
+
+def test_gzipped_array(tmp_path, monkeypatch):
+    monkeypatch.setattr(records, "READ_CHUNK_SIZE", 16)
+    path = write_array(tmp_path / "dex.json.gz", RECORDS, compress=True)
+    assert list(iter_records(path)) == RECORDS
+
+
+def test_numbers_split_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(records, "READ_CHUNK_SIZE", 3)
+    path = tmp_path / "dex.json"
+    path.write_text("[123456, 78, true, -1.5e3]", encoding="utf-8")
+    assert list(iter_records(str(path))) == [123456, 78, True, -1500.0]
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ \n ]  "])
+def test_empty_array(tmp_path, text):
+    path = tmp_path / "dex.json"
+    path.write_text(text, encoding="utf-8")
+    assert list(iter_records(str(path))) == []
+
+
+def test_unterminated_array_is_an_error(tmp_path):
+    path = tmp_path / "dex.json"
+    path.write_text(json.dumps(RECORDS)[:-1], encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_records(str(path)))
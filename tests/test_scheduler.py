@@ -0,0 +1,53 @@
+import asyncio
+
+from textual.app import App
+
+from src.scheduler import RequestScheduler
+
+
+class SchedulerApp(App):
+    def on_mount(self) -> None:
+        self.requests = RequestScheduler(self)
+        self.results = []
+
+
+def run_requests(submit) -> SchedulerApp:
+    """Runs `submit(app)` in a headless app and waits for its callbacks."""
+    async def run():
+        app = SchedulerApp()
+        async with app.run_test() as pilot:
+            submit(app)
+            for _ in range(50):
+                await pilot.pause(0.02)
+                if app.results or app._notifications:
+                    break
+        return app
+
+    return asyncio.run(run())
+
+
+def fail():
+    raise ValueError("no database")
+
+
+def test_results_are_delivered():
+    app = run_requests(lambda app: app.requests.submit("list", lambda: 42, app.results.append))
+    assert app.results == [42]
+
+
+def test_errors_go_to_the_failed_callback():
+    def submit(app):
+        app.requests.submit("list", fail, app.results.append, failed=lambda e: app.results.append(("failed", e)))
+
+    app = run_requests(submit)
+    assert len(app.results) == 1
+    kind, error = app.results[0]
+    assert kind == "failed" and isinstance(error, ValueError)
+
+
+def test_errors_are_notified_by_default():
+    app = run_requests(lambda app: app.requests.submit("list", fail, app.results.append))
+    assert app.results == []
+    [notification] = list(app._notifications)
+    assert notification.message == "ValueError: no database"
+    assert notification.severity == "error"
@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+
+import httpx
+import pytest
+
+from src import database, seed
+from src.pipeline import run_pipeline
+from src.progress import Progress
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """An empty working directory, so data/ starts out missing."""
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    database.close_pool()
+
+
+def flavor_text(pokemon_id: int) -> str:
+    conn = database.get_db_connection()
+    try:
+        return conn.execute("SELECT flavor_text FROM pokemon WHERE id = ?", (pokemon_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_first_run_seeds_from_the_bundled_snapshot(workdir):
+    assert seed.can_seed()
+    assert seed.seed_database()
+    assert database.has_pokemon()
+    assert not seed.seed_database()
+    assert len(seed.missing_art_ids()) == 1025
+
+
+def test_refresh_updates_a_seeded_database(workdir):
+    seed.seed_database()
+    with open(database.BUNDLED_JSON_PATH, encoding="utf-8") as f:
+        records = json.load(f)
+    records[24]["flavor_text"] = "Refreshed."
+    with open(os.path.join("data", "dex.json"), "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+    assert asyncio.run(run_pipeline(Progress(lambda event: None), fetch=False))
+    assert flavor_text(25) == "Refreshed."
+
+
+def test_the_pipeline_loads_its_own_output_and_logs_through_progress(workdir, capsys):
+    seed.seed_database()
+    with open(database.BUNDLED_JSON_PATH, encoding="utf-8") as f:
+        records = json.load(f)
+    records[24]["flavor_text"] = "Stale."
+    with open(database.NDJSON_PATH, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+    records[24]["flavor_text"] = "Compressed."
+    with gzip.open(database.NDJSON_PATH + ".gz", "wt", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+    capsys.readouterr()
+
+    events = []
+    assert asyncio.run(run_pipeline(Progress(events.append), fetch=False, output_path=database.NDJSON_PATH + ".gz"))
+    assert flavor_text(25) == "Compressed."
+    assert capsys.readouterr().out == ""
+    assert any(event["event"] == "log" and event["message"].startswith("Update complete") for event in events)
+
+
+def test_a_failed_load_rolls_back(workdir, monkeypatch):
+    os.makedirs("data")
+    database.create_tables()
+
+    def fail(conn, pokemon_ids=None):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(database, "rebuild_entry_view", fail)
+    assert database.populate_db_from_json() is None
+    assert not database.has_pokemon()
+
+
+def test_errors_after_the_commit_do_not_roll_back(workdir, monkeypatch):
+    os.makedirs("data")
+    database.create_tables()
+
+    def fail(conn, log=print):
+        raise RuntimeError("snapshot failed")
+
+    monkeypatch.setattr(database, "refresh_list_snapshot", fail)
+    with pytest.raises(RuntimeError, match="snapshot failed"):
+        database.populate_db_from_json()
+    assert database.has_pokemon()
+
+
+def test_update_falls_back_to_the_bundled_snapshot(workdir):
+    seed.seed_database()
+    summary = database.update_db_from_json()
+    assert summary == {"inserted": 0, "updated": 0, "unchanged": 1025, "removed": 0}
+
+
+def test_updates_that_change_records_bump_the_data_generation(workdir):
+    seed.seed_database()
+    generation = database.data_generation()
+    database.update_db_from_json()
+    assert database.data_generation() == generation
+
+    with open(database.BUNDLED_JSON_PATH, encoding="utf-8") as f:
+        records = json.load(f)
+    records[0]["flavor_text"] = "Changed."
+    with open(os.path.join("data", "dex.json"), "w", encoding="utf-8") as f:
+        json.dump(records, f)
+    database.update_db_from_json()
+    assert database.data_generation() == generation + 1
+
+
+def test_updates_remove_missing_records_and_unused_art(workdir):
+    seed.seed_database()
+    with open(database.BUNDLED_JSON_PATH, encoding="utf-8") as f:
+        records = json.load(f)
+    records[0]["ascii_art"] = "old art"
+    with open(os.path.join("data", "dex.json"), "w", encoding="utf-8") as f:
+        json.dump(records[:-1], f)
+    summary = database.update_db_from_json()
+    assert (summary["updated"], summary["removed"]) == (1, 1)
+
+    records[0]["ascii_art"] = "new art"
+    with open(os.path.join("data", "dex.json"), "w", encoding="utf-8") as f:
+        json.dump(records[:-1], f)
+    database.update_db_from_json()
+
+    conn = database.get_db_connection()
+    try:
+        assert [row[0] for row in conn.execute("SELECT art FROM art")] == ["new art"]
+        for table in ("pokemon", "stats", "entry_view", "pokemon_types"):
+            column = "id" if table == "pokemon" else "pokemon_id"
+            assert conn.execute(f"SELECT count(*) FROM {table} WHERE {column} = 1025").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_sprites_that_fail_are_counted_and_skipped(workdir, monkeypatch):
+    seed.seed_database()
+    sprites = {1: None, 2: b"unrenderable", 3: b"unsaveable", 4: b"sprite"}
+
+    def handler(request):
+        pokemon_id = int(request.url.path.rsplit("/", 1)[1].removesuffix(".png"))
+        body = sprites[pokemon_id]
+        return httpx.Response(404) if body is None else httpx.Response(200, content=body)
+
+    def render(image_bytes, columns):
+        if image_bytes == b"unrenderable":
+            raise ValueError("not an image")
+        return "art"
+
+    def save(image_bytes):
+        if image_bytes == b"unsaveable":
+            raise OSError("disk full")
+        return "sprite-key"
+
+    client = httpx.Client
+    monkeypatch.setattr(httpx, "Client", lambda **kwargs: client(transport=httpx.MockTransport(handler), **kwargs))
+    monkeypatch.setattr(seed, "render_ascii_art", render)
+    monkeypatch.setattr(seed, "save_sprite", save)
+    filled_ids = []
+    result = seed.fill_missing_art(filled_ids.append, lambda: len(filled_ids) == 1)
+    assert result == (1, 3)
+    assert filled_ids == [4]
+    assert seed.missing_art_ids()[:3] == [1, 2, 3]
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import sqlite3
+
+from src import backend, database, server
+from src.server import DexServer
+
+
+async def get(port: int, path: str) -> tuple[int, object]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ")[1]), json.loads(body)
+
+
+def serve_requests(paths: list[str]) -> list[tuple[int, object]]:
+    async def run():
+        server = DexServer(port=0)
+        await server.start()
+        try:
+            return [await get(server.port, path) for path in paths]
+        finally:
+            server.close()
+
+    return asyncio.run(run())
+
+
+def test_search_limit_must_be_positive(seeded):
+    responses = serve_requests(["/search?q=pi&limit=-3", "/search?q=pi&limit=0", "/search?q=pi&limit=2"])
+    assert [status for status, _ in responses] == [400, 400, 200]
+    assert len(responses[2][1]) == 2
+
+
+def test_unexpected_errors_get_a_500_that_is_not_cached(seeded, monkeypatch):
+    search = backend.search_pokemon
+
+    def failing_search(query, limit):
+        monkeypatch.setattr(backend, "search_pokemon", search)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(backend, "search_pokemon", failing_search)
+    (status, payload), (retry_status, _) = serve_requests(["/search?q=pika", "/search?q=pika"])
+    assert status == 500 and payload == {"error": "Internal Server Error"}
+    assert retry_status == 200
+
+
+def test_a_new_build_replaces_cached_entries(seeded, monkeypatch):
+    monkeypatch.setattr(server, "BUILD_CHECK_INTERVAL", 0.0)
+
+    def rename_pikachu():
+        # Another process updating the database, as manage_db.py would.
+        conn = sqlite3.connect(database.DB_PATH)
+        with conn:
+            conn.execute("UPDATE entry_view SET payload = json_set(payload, '$.name', 'Sparky') WHERE pokemon_id = 25")
+            database.set_build_id(conn.cursor())
+        conn.close()
+
+    async def run():
+        dex_server = DexServer(port=0)
+        await dex_server.start()
+        try:
+            before = await get(dex_server.port, "/pokemon/25")
+            await asyncio.get_running_loop().run_in_executor(None, rename_pikachu)
+            after = await get(dex_server.port, "/pokemon/25")
+            return before, after
+        finally:
+            dex_server.close()
+
+    (_, before), (_, after) = asyncio.run(run())
+    assert before["name"] == "Pikachu"
+    assert after["name"] == "Sparky"
+
+
+def test_entries_and_art_need_an_exact_name_or_id(seeded):
+    responses = serve_requests(["/pokemon/pikachu/art", "/pokemon/pikachuu/art", "/pokemon/pikachuu", "/pokemon/25"])
+    assert [status for status, _ in responses] == [200, 404, 404, 200]
+    assert responses[0][1]["id"] == responses[3][1]["id"] == 25
@@ -0,0 +1,47 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from textual.widgets import Label, Log
+
+from src.dex_tui import DexTUI
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stands in for `data_pipeline.py --progress-json`: one phase, start to end.
+PIPELINE_SCRIPT = """
+from src.progress import Progress, json_sink
+progress = Progress(json_sink)
+progress.start("pokemon", 2)
+progress.update("pokemon", done=2)
+progress.finish("pokemon")
+print("plain output")
+"""
+
+
+def test_setup_screen_reads_subprocess_events(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    popen = subprocess.Popen
+
+    def fake_popen(command, **kwargs):
+        assert "--progress-json" in command
+        return popen([sys.executable, "-c", PIPELINE_SCRIPT], cwd=ROOT, **kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", fake_popen)
+
+    async def run():
+        app = DexTUI(refresh=True)
+        async with app.run_test() as pilot:
+            log = app.screen.query_one(Log)
+            for _ in range(100):
+                await pilot.pause(0.05)
+                if any("Setup complete" in line for line in log.lines):
+                    break
+            status = str(app.screen.query_one("#status_pokemon", Label).render())
+            return status, list(log.lines)
+
+    status, lines = asyncio.run(run())
+    assert status.startswith("2 done in")
+    assert "plain output" in lines
+    assert any("Setup complete" in line for line in lines)
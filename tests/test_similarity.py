@@ -0,0 +1,64 @@
+import json
+import math
+import os
+
+import pytest
+
+from src import backend, database
+from src.similarity import SimilarityIndex
+from src.stats_store import STAT_COLUMNS, StatsStore
+
+TYPES = {1: "fire", 2: "water"}
+
+
+def make_index(rows, type_links, ability_links) -> SimilarityIndex:
+    return SimilarityIndex(StatsStore(rows, type_links, TYPES), ability_links)
+
+
+def both_paths(index: SimilarityIndex, pokemon_id: int, k: int) -> list[list[dict]]:
+    """The results of the NumPy path (if installed) and the array path."""
+    results = [index.similar(pokemon_id, k)]
+    if index._np is not None:
+        index._np = None
+        results.append(index.similar(pokemon_id, k))
+    return results
+
+
+def test_a_pokemon_is_not_its_own_neighbour():
+    # Every row is identical, so all distances tie at zero.
+    rows = [(pokemon_id, f"mon{pokemon_id}", *([80] * len(STAT_COLUMNS))) for pokemon_id in range(1, 6)]
+    index = make_index(rows, [(i, 1) for i in range(1, 6)], [(i, "blaze") for i in range(1, 6)])
+    for similar in both_paths(index, 3, k=10):
+        assert sorted(row["id"] for row in similar) == [1, 2, 4, 5]
+
+
+def test_constant_stat_columns_give_finite_distances():
+    rows = [
+        (pokemon_id, f"mon{pokemon_id}", 100, 10 * pokemon_id, 50, 50, 50, 50)
+        for pokemon_id in range(1, 8)
+    ]
+    index = make_index(rows, [(i, 1) for i in range(1, 8)], [])
+    assert not any(math.isnan(value) for value in index.vectors)
+    for similar in both_paths(index, 4, k=6):
+        assert len(similar) == 6
+        assert all(math.isfinite(row["distance"]) for row in similar)
+        assert [row["id"] for row in similar][:2] in ([3, 5], [5, 3])
+
+
+def test_cached_neighbours_are_dropped_when_the_data_changes(seeded):
+    before = backend.get_similar_pokemon(25)
+    assert backend.get_cached_similar(25) == before
+    assert 1025 not in [row["id"] for row in before]
+
+    # Give the last Pokémon Pikachu's stats, types and abilities.
+    with open(database.BUNDLED_JSON_PATH, encoding="utf-8") as f:
+        records = json.load(f)
+    pikachu = records[24]
+    records[-1].update(stats=pikachu["stats"], types=pikachu["types"], abilities=pikachu["abilities"])
+    with open(os.path.join("data", "dex.json"), "w", encoding="utf-8") as f:
+        json.dump(records, f)
+    database.update_db_from_json()
+
+    assert backend.get_cached_similar(25) is None
+    after = backend.get_similar_pokemon(25)
+    assert after[0]["id"] == 1025 and after[0]["distance"] == pytest.approx(0.0)
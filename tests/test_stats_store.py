@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from src.stats_store import STAT_COLUMNS, StatsStore, parse_stats_query
+
+TYPES = {1: "fire", 2: "water", 3: "flying"}
+
+
+def make_store() -> StatsStore:
+    """Many rows with few distinct stat values, so sorts are full of ties."""
+    rng = random.Random(0)
+    rows = [
+        (pokemon_id, f"mon{pokemon_id}", *(rng.choice((50, 80, 100, 120)) for _ in STAT_COLUMNS))
+        for pokemon_id in range(1, 301)
+    ]
+    links = [(pokemon_id, rng.choice(list(TYPES))) for pokemon_id in range(1, 301)]
+    return StatsStore(rows, links, TYPES)
+
+
+@pytest.mark.parametrize("text", ["sort:total", "speed>=80 sort:-hp", "type:fire sort:attack", "sort:-speed"])
+@pytest.mark.parametrize("limit", [1, 5, 17, None])
+def test_ties_keep_list_order(text, limit):
+    store = make_store()
+    query = parse_stats_query(text)
+    selected = store.select(query, "", limit).ids()
+
+    rows = sorted(store.matches(query), key=lambda i: (-1 if query.descending else 1) * store.columns[query.sort][i])
+    expected = [store.columns["id"][i] for i in rows][:limit]
+    assert selected == expected
+
+    if store._np is not None:
+        store._np = None
+        assert store.select(query, "", limit).ids() == expected